@@ -1,158 +1,99 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_json
+from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import hashlib
+import json
 import os
 import sys
+import threading
+import time
 
 # Add the current directory to the path to import reclaim_sdk
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from reclaim_sdk.client import ReclaimClient
-from reclaim_sdk.resources.task import Task, TaskStatus
-from reclaim_sdk.resources.event import Event
+from reclaim_sdk.resources.task import Task, TaskPriority, TaskStatus
+from reclaim_sdk.middleware import CompressionMiddleware, ETagMiddleware, ServerTimingMiddleware, etag_matches
+from reclaim_sdk import ratelimit
+from reclaim_sdk.formatting import format_duration_text, format_progress_text
+from reclaim_sdk.index import TaskIndex
+from reclaim_sdk.query import TaskQuery
+from reclaim_sdk.snapshot import Snapshot, SnapshotStore, model_digest
+from reclaim_sdk.timing import phase
+from reclaim_sdk.tracing import OpenTelemetryTracer, set_tracer
 
-def format_duration_text(duration_hours: Optional[float]) -> Optional[str]:
-    """Convert duration from hours to human-readable text format"""
-    if duration_hours is None:
+def get_next_event_for_task(task_id: int, client: ReclaimClient) -> Optional[dict]:
+    """Get the next scheduled event for a task, or None if it cannot be fetched"""
+    try:
+        with phase("enrich"):
+            return fetch_next_event(task_id, client)
+    except Exception:
         return None
+
+def fetch_next_event(task_id: int, client: ReclaimClient) -> Optional[dict]:
+    """Get the next scheduled event for a task, raising on upstream errors"""
+    # Imported here so cold starts that never enrich tasks skip the Event model
+    from reclaim_sdk.resources.event import Event
+
+    # Get future events for this task, one copy of those mirrored onto
+    # several connected calendars (the first, as the sort below would pick)
+    future_events = Event.list_future_events(client=client, task_ids=[task_id], dedupe=True)
     
-    if duration_hours == 0:
-        return "0 min"
-    
-    # Convert to minutes
-    total_minutes = int(duration_hours * 60)
-    
-    # Handle different time ranges
-    if total_minutes < 60:
-        return f"{total_minutes} min"
-    elif total_minutes == 60:
-        return "1h"
-    elif total_minutes < 1440:  # Less than 24 hours
-        hours = total_minutes // 60
-        minutes = total_minutes % 60
-        if minutes == 0:
-            return f"{hours}h"
-        else:
-            return f"{hours}h {minutes}min"
-    else:  # 24 hours or more
-        days = total_minutes // 1440
-        remaining_minutes = total_minutes % 1440
-        hours = remaining_minutes // 60
-        minutes = remaining_minutes % 60
-        
-        if hours == 0 and minutes == 0:
-            return f"{days}d"
-        elif minutes == 0:
-            return f"{days}d {hours}h"
-        else:
-            return f"{days}d {hours}h {minutes}min"
-
-def format_progress_text(time_chunks_spent: Optional[int], time_chunks_remaining: Optional[int]) -> Optional[str]:
-    """Format progress as clean display without brackets and duplication"""
-    if time_chunks_spent is None or time_chunks_remaining is None:
+    if not future_events:
         return None
     
-    if time_chunks_spent == 0 and time_chunks_remaining == 0:
+    # Sort by start time and get the earliest
+    future_events.sort(key=lambda e: e.event_start if e.event_start else datetime.max.replace(tzinfo=datetime.now().tzinfo))
+    next_event = future_events[0]
+    
+    if not next_event.event_start:
         return None
     
-    total_chunks = time_chunks_spent + time_chunks_remaining
+    # Calculate time until start
+    now = datetime.now(next_event.event_start.tzinfo)
+    time_until = next_event.event_start - now
     
-    if time_chunks_spent == 0:
-        # Nothing done yet - show sessions only if > 1
-        total_hours = time_chunks_remaining / 4
-        if total_chunks > 1:
-            return f"{format_duration_text(total_hours)} ⏳ ({total_chunks} Sessions)"
-        else:
-            return f"{format_duration_text(total_hours)} ⏳"
-    elif time_chunks_remaining == 0:
-        # All done - always show sessions
-        total_hours = time_chunks_spent / 4
-        return f"✅ ({total_chunks} Sessions)"
+    # Format time until start
+    if time_until.days > 0:
+        time_until_text = f"in {time_until.days} Tagen"
+    elif time_until.total_seconds() > 3600:
+        hours = int(time_until.total_seconds() // 3600)
+        time_until_text = f"in {hours}h"
+    elif time_until.total_seconds() > 60:
+        minutes = int(time_until.total_seconds() // 60)
+        time_until_text = f"in {minutes}min"
     else:
-        # Partially done - show progress with time breakdown
-        spent_hours = time_chunks_spent / 4
-        remaining_hours = time_chunks_remaining / 4
-        total_hours = total_chunks / 4
-        
-        # Calculate percentage
-        percentage = int((spent_hours / total_hours) * 100)
-        
-        return f"{format_duration_text(remaining_hours)} ⏳ {percentage}% ({format_duration_text(spent_hours)}/{format_duration_text(total_hours)})"
-
-def format_snooze_days(snooze_until: Optional[datetime]) -> Optional[str]:
-    """Format snooze information with days postponed"""
-    if snooze_until is None:
-        return None
+        time_until_text = "jetzt"
     
-    from datetime import datetime, timezone
-    now = datetime.now(timezone.utc)
+    # Check if event is today and add "HEUTE" indicator
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
     
-    # Calculate days difference
-    days_diff = (snooze_until - now).days
+    # Convert event start to UTC for comparison
+    event_start_utc = next_event.event_start.astimezone(timezone.utc)
     
-    if days_diff > 0:
-        return f"Aufgeschoben bis {snooze_until.strftime('%d. %B')} (+{days_diff} Tage)"
-    elif days_diff < 0:
-        return f"Aufgeschoben bis {snooze_until.strftime('%d. %B')} ({abs(days_diff)} Tage überfällig)"
-    else:
-        return f"Aufgeschoben bis {snooze_until.strftime('%d. %B')} (heute)"
-
-def get_next_event_for_task(task_id: int, client: ReclaimClient) -> Optional[dict]:
-    """Get the next scheduled event for a task"""
-    try:
-        # Get future events for this task
-        future_events = Event.list_future_events(client=client, task_ids=[task_id])
-        
-        if not future_events:
-            return None
-        
-        # Sort by start time and get the earliest
-        future_events.sort(key=lambda e: e.event_start if e.event_start else datetime.max.replace(tzinfo=datetime.now().tzinfo))
-        next_event = future_events[0]
-        
-        if not next_event.event_start:
-            return None
-        
-        # Calculate time until start
-        now = datetime.now(next_event.event_start.tzinfo)
-        time_until = next_event.event_start - now
-        
-        # Format time until start
-        if time_until.days > 0:
-            time_until_text = f"in {time_until.days} Tagen"
-        elif time_until.total_seconds() > 3600:
-            hours = int(time_until.total_seconds() // 3600)
-            time_until_text = f"in {hours}h"
-        elif time_until.total_seconds() > 60:
-            minutes = int(time_until.total_seconds() // 60)
-            time_until_text = f"in {minutes}min"
-        else:
-            time_until_text = "jetzt"
-        
-        # Check if event is today and add "HEUTE" indicator
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        
-        # Convert event start to UTC for comparison
-        event_start_utc = next_event.event_start.astimezone(timezone.utc)
-        
-        if today_start <= event_start_utc < today_end:
-            time_until_text = f"HEUTE {time_until_text}"
-        
-        return {
-            "event_id": next_event.event_id,
-            "title": next_event.title,
-            "start": next_event.event_start.isoformat(),
-            "end": next_event.event_end.isoformat() if next_event.event_end else None,
-            "duration_hours": next_event.get_duration_hours(),
-            "time_until": time_until_text,
-            "lock_state": next_event.lock_state,
-            "defended": next_event.defended
-        }
-    except Exception:
-        return None
+    if today_start <= event_start_utc < today_end:
+        time_until_text = f"HEUTE {time_until_text}"
+    
+    return {
+        "event_id": next_event.event_id,
+        "title": next_event.title,
+        "start": next_event.event_start.isoformat(),
+        "end": next_event.event_end.isoformat() if next_event.event_end else None,
+        "duration_hours": next_event.get_duration_hours(),
+        "time_until": time_until_text,
+        "lock_state": next_event.lock_state,
+        "defended": next_event.defended
+    }
 
 def format_due_date_info(due: Optional[datetime], snooze_until: Optional[datetime]) -> str:
     """Format due date information with snooze details"""
@@ -190,9 +131,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Snapshot-Age", "X-Snapshot-Stale", "X-Total-Count", "X-Next-Cursor", "Server-Timing"],
+)
+
+# Conditional GETs and response compression (brotli if installed, else gzip)
+app.add_middleware(ETagMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
 )
 
+# Server-Timing header with upstream, hydrate, filter, enrich and render
+# times; SERVER_TIMING_LOG=1 also logs them as one JSON line per request
+app.add_middleware(
+    ServerTimingMiddleware,
+    log=os.environ.get("SERVER_TIMING_LOG", "").lower() in ("1", "true", "yes")
+)
+
+# RECLAIM_TRACING=otel sends SDK spans (requests, resource calls, planner
+# actions) to OpenTelemetry; needs opentelemetry-api and a configured SDK
+if os.environ.get("RECLAIM_TRACING", "").lower() in ("otel", "opentelemetry"):
+    set_tracer(OpenTelemetryTracer())
+
 class TaskResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     id: str
     title: str
     notes: Optional[str] = None
@@ -208,6 +171,290 @@ class TaskResponse(BaseModel):
     progress_text: Optional[str] = None
     next_event: Optional[dict] = None
 
+def build_task_response(task: Task, next_event: Optional[dict] = None) -> TaskResponse:
+    """Convert an SDK task into the API response model.
+
+    The task was already validated when it was loaded, so the response is
+    constructed without a second validation pass.
+    """
+    return TaskResponse.model_construct(
+        id=str(task.id),
+        title=task.title,
+        notes=task.notes,
+        priority=str(task.priority) if task.priority else None,
+        status=str(task.status) if task.status else None,
+        at_risk=task.at_risk,
+        due=task.due,
+        duration=task.duration,
+        duration_text=format_duration_text(task.duration),
+        snooze_until=task.snooze_until,
+        time_chunks_spent=task.time_chunks_spent,
+        time_chunks_remaining=task.time_chunks_remaining,
+        progress_text=format_progress_text(task.time_chunks_spent, task.time_chunks_remaining),
+        next_event=next_event
+    )
+
+# httpx transport for upstream calls; benchmarks/load_test.py points it at a
+# reclaim_sdk.testing.FakeReclaim
+upstream_transport = None
+
+def get_configured_client() -> ReclaimClient:
+    """Configure the shared client with the token from the environment"""
+    token = os.environ.get("RECLAIM_TOKEN")
+    if not token:
+        raise HTTPException(
+            status_code=500,
+            detail="RECLAIM_TOKEN environment variable is not set"
+        )
+    # configure() keeps the module-level session while the token is unchanged,
+    # so warm instances reuse its connection pool across requests
+    if upstream_transport is not None:
+        return ReclaimClient.configure(token=token, transport=upstream_transport)
+    return ReclaimClient.configure(token=token)
+
+# Seconds concurrent requests share one Task.list() result
+TASK_SNAPSHOT_MAX_AGE = float(os.environ.get("TASK_SNAPSHOT_MAX_AGE", "10"))
+
+task_snapshot: SnapshotStore[List[Task]] = SnapshotStore(
+    lambda: Task.list(client=get_configured_client()),
+    max_age=TASK_SNAPSHOT_MAX_AGE,
+    digest=model_digest
+)
+
+# Extra seconds a computed result may be served stale while it is refreshed
+# in the background (0 disables stale-while-revalidate)
+API_STALE_WHILE_REVALIDATE = float(os.environ.get("API_STALE_WHILE_REVALIDATE", "0"))
+
+# Seconds an ETag derived from an unchanged task snapshot stays valid, so that
+# time-relative fields such as "in 3h" or overdue status are eventually refreshed
+ETAG_TIME_BUCKET = float(os.environ.get("ETAG_TIME_BUCKET", "60"))
+
+class ViewResult:
+    """An endpoint payload with the digest of the task snapshot it was built from.
+
+    ``body`` holds the payload serialized once, straight from the response
+    models, so requests served from the cache skip FastAPI's encode pass.
+    """
+
+    __slots__ = ("view", "payload", "digest", "body")
+
+    def __init__(self, view: str, payload, digest: str, body: Optional[bytes] = None):
+        self.view = view
+        self.payload = payload
+        self.digest = digest
+        self.body = body
+
+    @property
+    def etag(self) -> str:
+        return snapshot_etag(self.view, self.digest)
+
+def snapshot_etag(view: str, digest: str) -> str:
+    bucket = int(time.time() // ETAG_TIME_BUCKET)
+    return f'W/"{view}-{digest[:24]}-{bucket}"'
+
+class ViewResultStore(SnapshotStore):
+    """Single-flight result cache around an endpoint payload builder.
+
+    With ``serialize`` set, the payload is encoded to JSON bytes as part of
+    the (threadpool) build instead of on every response.
+    """
+
+    def __init__(self, view: str, builder, serialize=to_json):
+        super().__init__(
+            self._build,
+            max_age=TASK_SNAPSHOT_MAX_AGE,
+            stale_while_revalidate=API_STALE_WHILE_REVALIDATE
+        )
+        self.view = view
+        self.builder = builder
+        self.serialize = serialize
+
+    def _build(self) -> ViewResult:
+        snapshot = task_snapshot.get()
+        # Filtering and enrichment inside the builder report their own phases
+        with phase("render"):
+            payload = self.builder(snapshot)
+            body = self.serialize(payload) if self.serialize is not None else None
+        return ViewResult(self.view, payload, snapshot.digest, body)
+
+_task_index: Optional[tuple] = None
+_task_index_lock = threading.Lock()
+
+def task_index(snapshot: Snapshot) -> TaskIndex:
+    """The TaskIndex of ``snapshot``, shared by the views built from it.
+
+    An index is reused for up to TASK_SNAPSHOT_MAX_AGE seconds, the same
+    bound a built view is reused for, so overdue cut-offs move with it.
+    """
+    global _task_index
+    with _task_index_lock:
+        if _task_index is not None:
+            indexed, index, built_at = _task_index
+            if indexed is snapshot and time.monotonic() - built_at <= TASK_SNAPSHOT_MAX_AGE:
+                return index
+        with phase("filter"):
+            index = TaskIndex(snapshot.value)
+        _task_index = (snapshot, index, time.monotonic())
+        return index
+
+async def current_task_snapshot() -> Optional[Snapshot]:
+    """The task snapshot conditional requests are validated against.
+
+    In stale-while-revalidate mode this never blocks on an upstream fetch.
+    """
+    if API_STALE_WHILE_REVALIDATE:
+        snapshot = task_snapshot.peek()
+        if snapshot is not None and snapshot.age <= TASK_SNAPSHOT_MAX_AGE + API_STALE_WHILE_REVALIDATE:
+            return snapshot
+        return None
+    return await run_in_threadpool(task_snapshot.get)
+
+def not_modified(etag: str, snapshot: Snapshot) -> Response:
+    response = Response(status_code=304, headers={"ETag": etag})
+    set_snapshot_headers(response, snapshot, task_snapshot)
+    return response
+
+async def serve_result(store: ViewResultStore, request: Request) -> Response:
+    """Serve the cached payload of ``store``, computing it off the event loop if needed.
+
+    A matching ``If-None-Match`` is answered with 304 from the task snapshot
+    alone, before any filtering or next-event enrichment runs.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        current = await current_task_snapshot()
+        if current is not None:
+            etag = snapshot_etag(store.view, current.digest)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, current)
+
+    snapshot = await run_in_threadpool(store.get)
+    response = Response(
+        content=snapshot.value.body,
+        media_type="application/json",
+        headers={"ETag": snapshot.value.etag}
+    )
+    set_snapshot_headers(response, snapshot, store)
+    return response
+
+async def serve_rendered(store: ViewResultStore, request: Request) -> Response:
+    """Serve a cached RenderedPayload from ``store`` with its ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        current = await current_task_snapshot()
+        if current is not None:
+            rendered = render_cache.peek(render_cache_key(store.view, current.digest))
+            if rendered is not None and etag_matches(if_none_match, rendered.etag):
+                return not_modified(rendered.etag, current)
+
+    snapshot = await run_in_threadpool(store.get)
+    response = snapshot.value.payload.to_response()
+    set_snapshot_headers(response, snapshot, store)
+    return response
+
+def set_snapshot_headers(response: Response, snapshot: Snapshot, store: SnapshotStore) -> None:
+    """Expose how old the task data behind a response is"""
+    response.headers["X-Snapshot-Age"] = f"{snapshot.age:.3f}"
+    if store.is_stale(snapshot):
+        response.headers["X-Snapshot-Stale"] = "true"
+
+# Seconds between upstream polls while at least one stream client is connected
+STREAM_POLL_INTERVAL = float(os.environ.get("TASK_STREAM_POLL_INTERVAL", "15"))
+STREAM_KEEPALIVE_INTERVAL = 15.0
+STREAM_QUEUE_SIZE = 32
+
+class TaskChangeBroadcaster:
+    """Polls Reclaim once for all stream subscribers and fans out task changes.
+
+    The poller only runs while at least one client is connected, so the number
+    of upstream calls depends on the poll interval, not on the number of clients.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._subscribers: set = set()
+        self._state: Optional[Dict[str, dict]] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._state is not None:
+            queue.put_nowait(("snapshot", self._snapshot_payload()))
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+            # Without subscribers the state goes stale, start over on next connect
+            self._state = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                current = await run_in_threadpool(self._poll)
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                self._publish("error", {"detail": detail})
+            else:
+                self._apply(current)
+            await asyncio.sleep(self.poll_interval)
+
+    @staticmethod
+    def _poll() -> Dict[str, dict]:
+        # Stream polls yield to interactive requests when rate limited
+        with ratelimit.priority(ratelimit.Priority.BACKGROUND):
+            client = get_configured_client()
+            tasks = task_snapshot.get().value
+            state = {}
+            for task in tasks:
+                next_event = get_next_event_for_task(task.id, client) if task.id else None
+                state[str(task.id)] = build_task_response(task, next_event).model_dump(mode="json")
+        return state
+
+    @staticmethod
+    def _change_key(task: dict) -> dict:
+        # "time_until" is relative to now and would flag every task on every poll
+        next_event = task.get("next_event")
+        if next_event:
+            task = {**task, "next_event": {k: v for k, v in next_event.items() if k != "time_until"}}
+        return task
+
+    def _apply(self, current: Dict[str, dict]) -> None:
+        previous = self._state
+        self._state = current
+        if previous is None:
+            self._publish("snapshot", self._snapshot_payload())
+            return
+
+        changed = [
+            task for task_id, task in current.items()
+            if task_id not in previous or self._change_key(previous[task_id]) != self._change_key(task)
+        ]
+        removed = [task_id for task_id in previous if task_id not in current]
+        if changed or removed:
+            self._publish("changed", {"tasks": changed, "removed": removed})
+
+    def _snapshot_payload(self) -> dict:
+        return {"tasks": list(self._state.values())}
+
+    def _publish(self, event: str, payload: dict) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((event, payload))
+            except asyncio.QueueFull:
+                # Slow consumer: replace its backlog with a full resync
+                while not queue.empty():
+                    queue.get_nowait()
+                if self._state is not None:
+                    queue.put_nowait(("snapshot", self._snapshot_payload()))
+
+task_broadcaster = TaskChangeBroadcaster(STREAM_POLL_INTERVAL)
+
 @app.get("/")
 async def root():
     return {
@@ -234,8 +481,27 @@ async def root():
             "all_tasks": {
                 "path": "/tasks",
                 "method": "GET",
-                "description": "Alle Tasks aus Reclaim.ai abrufen",
+                "description": "Alle Tasks aus Reclaim.ai abrufen, optional gefiltert, sortiert und seitenweise",
                 "response": "Array von Task-Objekten",
+                "query_parameters": {
+                    "status": "Kommagetrennte Status, z.B. NEW,SCHEDULED",
+                    "priority": "Kommagetrennte Prioritäten, z.B. P1,P2",
+                    "due_after": "Fällig ab (ISO 8601, inklusive)",
+                    "due_before": "Fällig vor (ISO 8601, exklusive)",
+                    "at_risk": "true oder false",
+                    "sort": "Kommagetrennte Sortierschlüssel (due, priority, status, title, duration, snooze_until), '-' für absteigend, z.B. priority,-due; danach immer nach ID",
+                    "limit": f"Maximale Anzahl Tasks pro Seite (1-{TASK_QUERY_MAX_LIMIT})",
+                    "cursor": "Wert aus dem X-Next-Cursor Header der vorherigen Seite"
+                },
+                "pagination_headers": {
+                    "X-Total-Count": "Anzahl aller Tasks, die den Filtern entsprechen",
+                    "X-Next-Cursor": "Cursor für die nächste Seite, fehlt auf der letzten Seite"
+                },
+                "enrichment": {
+                    "include": "include=next_event fragt den nächsten Kalendereintrag je Task ab (sonst ist next_event null); mit Filtern nur für die zurückgegebenen Tasks",
+                    "format": "format=ndjson liefert sofort alle Tasks als {\"type\": \"task\"} Zeilen, danach je Task eine {\"type\": \"next_event\"} Zeile sobald sie vorliegt und zum Schluss {\"type\": \"end\"}",
+                    "ENRICHMENT_CONCURRENCY": "Gleichzeitige Next-Event-Abfragen im NDJSON-Modus (Standard: 8)"
+                },
                 "example_response": {
                     "id": "9453408",
                     "title": "Task Titel",
@@ -352,6 +618,20 @@ async def root():
                     "total_tasks": 40,
                     "generated_at": "2025-01-15T10:00:00Z"
                 }
+            },
+            "tasks_stream": {
+                "path": "/tasks/stream",
+                "method": "GET",
+                "description": "Server-Sent Events mit Task- und Next-Event-Änderungen; alle Clients teilen sich eine Abfrage bei Reclaim.ai",
+                "response": "text/event-stream",
+                "events": {
+                    "snapshot": "Alle Tasks beim Verbinden: {\"tasks\": [...]}",
+                    "changed": "Geänderte und entfernte Tasks: {\"tasks\": [...], \"removed\": [\"id\"]}",
+                    "error": "Fehler bei der Abfrage: {\"detail\": \"...\"}"
+                },
+                "configuration": {
+                    "TASK_STREAM_POLL_INTERVAL": "Sekunden zwischen zwei Abfragen (Standard: 15)"
+                }
             }
         },
         "task_properties": {
@@ -375,6 +655,14 @@ async def root():
             "get_risk_tasks": "curl https://your-vercel-url.vercel.app/tasks/at-risk",
             "health_check": "curl https://your-vercel-url.vercel.app/health"
         },
+        "response_headers": {
+            "X-Snapshot-Age": "Alter der Task-Daten in Sekunden; Anfragen innerhalb von TASK_SNAPSHOT_MAX_AGE (Standard: 10) teilen sich eine Abfrage bei Reclaim.ai",
+            "ETag": "Starker ETag über den Antwortinhalt von /tasks/summary und /tasks/daily; unveränderte Tasks liefern den zwischengespeicherten Text (RENDER_CACHE_TTL Sekunden, Standard: 300)",
+            "ETag (alle Task-Endpunkte)": "Schwacher ETag aus dem Task-Snapshot (gültig für ETAG_TIME_BUCKET Sekunden, Standard: 60); If-None-Match liefert 304 ohne Next-Event-Abfragen",
+            "Content-Encoding": "br (falls brotli installiert) oder gzip ab COMPRESSION_MIN_SIZE Bytes (Standard: 1024)",
+            "X-Snapshot-Stale": "true, wenn ein älteres Ergebnis ausgeliefert wird, während im Hintergrund aktualisiert wird (API_STALE_WHILE_REVALIDATE Sekunden, Standard: 0 = aus)",
+            "Server-Timing": "Zeit je Phase in ms: throttle (Rate-Limit), upstream (Reclaim.ai), hydrate (pydantic), filter, enrich (Next-Events), render, total; SERVER_TIMING_LOG=1 schreibt sie zusätzlich als JSON-Log"
+        },
         "error_handling": {
             "401": "Authentication failed - Token ungültig",
             "500": "Internal server error - API oder Reclaim.ai Fehler"
@@ -383,547 +671,813 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now()}
+    health = {"status": "healthy", "timestamp": datetime.now()}
+    rate_limiter = getattr(ReclaimClient._instance, "rate_limiter", None)
+    if rate_limiter is not None:
+        health["rate_limit"] = rate_limiter.stats()
+    circuit_breakers = getattr(ReclaimClient._instance, "circuit_breakers", None)
+    if circuit_breakers is not None:
+        health["circuits"] = circuit_breakers.states()
+    return health
 
-@app.get("/tasks")
-async def get_tasks():
-    """Get all tasks"""
-    try:
+def build_tasks(snapshot: Snapshot, include_next_event: bool = False):
+    """Compute the /tasks payload from the shared task snapshot"""
+    if not include_next_event:
+        return [build_task_response(task) for task in snapshot.value]
+
+    client = get_configured_client()
+    
+    tasks = snapshot.value
+    
+    # Convert to response format
+    task_responses = []
+    for task in tasks:
+        # Get next event for this task
+        next_event = get_next_event_for_task(task.id, client) if task.id else None
         
-        # Configure client with token from environment
-        token = os.environ.get("RECLAIM_TOKEN")
-        if not token:
+        task_responses.append(build_task_response(task, next_event))
+    
+    return task_responses
+
+tasks_results = ViewResultStore("tasks", build_tasks)
+tasks_with_next_event_results = ViewResultStore(
+    "tasks-next-event",
+    lambda snapshot: build_tasks(snapshot, include_next_event=True)
+)
+
+# Per-task enrichments /tasks adds on request via ?include=
+TASK_INCLUDES = ("next_event",)
+
+def _parse_includes(value: Optional[str]) -> set:
+    includes = set(filter(None, (part.strip() for part in (value or "").split(","))))
+    unknown = includes.difference(TASK_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid include '{sorted(unknown)[0]}', expected one of: {', '.join(TASK_INCLUDES)}"
+        )
+    return includes
+
+# Keys accepted by /tasks?sort=, mapped to the task attribute they order by
+# and the parser restoring a value of that attribute from a cursor
+TASK_SORT_KEYS = {
+    "due": ("due", datetime.fromisoformat),
+    "priority": ("priority", TaskPriority),
+    "status": ("status", TaskStatus),
+    "title": ("title", str),
+    "duration": ("duration", float),
+    "snooze_until": ("snooze_until", datetime.fromisoformat),
+}
+TASK_QUERY_MAX_LIMIT = 500
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def _parse_enum_list(value: Optional[str], enum, name: str) -> Optional[set]:
+    if not value:
+        return None
+    members = set()
+    for part in value.split(","):
+        # Accept both "P1" and the "TaskPriority.P1" form the API returns
+        part = part.strip().upper().rpartition(".")[2]
+        try:
+            members.add(enum(part))
+        except ValueError:
+            allowed = ", ".join(member.value for member in enum)
             raise HTTPException(
-                status_code=500,
-                detail="RECLAIM_TOKEN environment variable is not set"
+                status_code=400,
+                detail=f"Invalid {name} '{part}', expected one of: {allowed}"
             )
-        client = ReclaimClient.configure(token=token)
-        
-        # Get all tasks
-        tasks = Task.list()
-        
-        # Convert to response format
-        task_responses = []
-        for task in tasks:
-            # Get next event for this task
-            next_event = get_next_event_for_task(task.id, client) if task.id else None
-            
-            task_responses.append(TaskResponse(
-                id=str(task.id),
-                title=task.title,
-                notes=task.notes,
-                priority=str(task.priority) if task.priority else None,
-                status=str(task.status) if task.status else None,
-                at_risk=task.at_risk,
-                due=task.due,
-                duration=task.duration,
-                duration_text=format_duration_text(task.duration),
-                snooze_until=task.snooze_until,
-                time_chunks_spent=task.time_chunks_spent,
-                time_chunks_remaining=task.time_chunks_remaining,
-                progress_text=format_progress_text(task.time_chunks_spent, task.time_chunks_remaining),
-                next_event=next_event
-            ))
-        
-        return task_responses
-        
+    return members
+
+class TaskListQuery:
+    """Filters, ordering and keyset pagination for /tasks.
+
+    Tasks are always ordered by the requested sort keys and then by id, which
+    makes the order total: a cursor stores the sort values of the last task
+    of a page, and the next page starts strictly after them. Pages stay
+    consistent while tasks are added or removed between requests.
+    """
+
+    def __init__(
+        self,
+        statuses: Optional[set] = None,
+        priorities: Optional[set] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        at_risk: Optional[bool] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_next_event: bool = False,
+    ):
+        self.statuses = statuses
+        self.priorities = priorities
+        self.due_after = _as_utc(due_after)
+        self.due_before = _as_utc(due_before)
+        self.at_risk = at_risk
+        self.sort_param = sort or ""
+        self.sort = self._parse_sort(self.sort_param)
+        self.limit = limit
+        self.after = self._decode_cursor(cursor) if cursor else None
+        self.include_next_event = include_next_event
+
+    @property
+    def view(self) -> str:
+        """ETag view name, distinct for every combination of parameters"""
+        params = [
+            sorted(s.value for s in self.statuses or ()),
+            sorted(p.value for p in self.priorities or ()),
+            self.due_after.isoformat() if self.due_after else None,
+            self.due_before.isoformat() if self.due_before else None,
+            self.at_risk,
+            self.sort_param,
+            self.limit,
+            self.after,
+            self.include_next_event,
+        ]
+        return "tasks-" + hashlib.sha256(to_json(params)).hexdigest()[:12]
+
+    @staticmethod
+    def _parse_sort(value: str) -> List[tuple]:
+        sort = []
+        for part in filter(None, (part.strip() for part in value.split(","))):
+            descending = part.startswith("-")
+            key = part.lstrip("+-")
+            if key not in TASK_SORT_KEYS:
+                allowed = ", ".join(TASK_SORT_KEYS)
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid sort key '{key}', expected one of: {allowed}"
+                )
+            sort.append((key, descending))
+        return sort
+
+    def task_query(self, tasks) -> TaskQuery:
+        """The filters and order of this request as a TaskQuery over ``tasks``"""
+        query = TaskQuery(tasks)
+        if self.statuses is not None:
+            query = query.status(*self.statuses)
+        if self.priorities is not None:
+            query = query.priority(*self.priorities)
+        if self.at_risk is not None:
+            query = query.at_risk(self.at_risk)
+        if self.due_after is not None:
+            query = query.due_after(self.due_after)
+        if self.due_before is not None:
+            query = query.due_before(self.due_before)
+        order = [
+            f"-{TASK_SORT_KEYS[key][0]}" if descending else TASK_SORT_KEYS[key][0]
+            for key, descending in self.sort
+        ]
+        return query.order_by(*order, "id")
+
+    def sort_values(self, task: Task) -> list:
+        return [getattr(task, TASK_SORT_KEYS[key][0]) for key, _ in self.sort] + [task.id]
+
+    def encode_cursor(self, task: Task) -> str:
+        raw = to_json({"sort": self.sort_param, "after": self.sort_values(task)})
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, cursor: str) -> list:
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            after = raw["after"]
+            if raw["sort"] != self.sort_param or len(after) != len(self.sort) + 1:
+                raise ValueError("cursor belongs to a different sort order")
+            parsers = [TASK_SORT_KEYS[key][1] for key, _ in self.sort] + [int]
+            return [
+                parser(value) if value is not None else None
+                for parser, value in zip(parsers, after)
+            ]
+        except (ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def apply(self, tasks) -> tuple:
+        """Return the requested page, the cursor of the next one and the match count.
+
+        ``tasks`` is a list or a TaskIndex. Only ``limit + 1`` tasks are
+        selected, so a page costs a heap of that size rather than a sort of
+        every match; the extra task tells whether there is a next page.
+        """
+        query = self.task_query(tasks)
+        total = query.count()
+        if self.after is not None:
+            query = query.after(self.after)
+        if self.limit is None:
+            return query.all(), None, total
+        page = query.limit(self.limit + 1).all()
+        if len(page) <= self.limit:
+            return page, None, total
+        page = page[:self.limit]
+        return page, self.encode_cursor(page[-1]), total
+
+def build_task_query(query: TaskListQuery, snapshot: Snapshot) -> tuple:
+    """Filter and paginate the snapshot, then enrich only the returned page"""
+    page, next_cursor, total = query.apply(task_index(snapshot))
+    with phase("render"):
+        if not query.include_next_event:
+            return to_json([build_task_response(task) for task in page]), next_cursor, total
+        client = get_configured_client()
+        task_responses = [
+            build_task_response(task, get_next_event_for_task(task.id, client) if task.id else None)
+            for task in page
+        ]
+        return to_json(task_responses), next_cursor, total
+
+# Filtered /tasks pages kept built, least recently requested dropped first
+TASK_QUERY_CACHE_SIZE = int(os.environ.get("TASK_QUERY_CACHE_SIZE", "64"))
+
+_task_query_results: "OrderedDict[str, ViewResultStore]" = OrderedDict()
+_task_query_results_lock = threading.Lock()
+
+def task_query_results(query: TaskListQuery) -> ViewResultStore:
+    """The result store of ``query``, shared by requests with the same parameters.
+
+    Stores are keyed by ``query.view``, the normalized filters, sort, limit,
+    cursor and includes, so a page (and its next-event lookups) is built
+    once per task snapshot like the unfiltered views.
+    """
+    with _task_query_results_lock:
+        store = _task_query_results.get(query.view)
+        if store is None:
+            store = ViewResultStore(
+                query.view,
+                lambda snapshot: build_task_query(query, snapshot),
+                serialize=None
+            )
+            _task_query_results[query.view] = store
+        _task_query_results.move_to_end(query.view)
+        while len(_task_query_results) > TASK_QUERY_CACHE_SIZE:
+            _task_query_results.popitem(last=False)
+        return store
+
+async def serve_task_query(query: TaskListQuery, request: Request) -> Response:
+    """Serve a filtered /tasks page; conditional requests skip all enrichment"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        current = await current_task_snapshot()
+        if current is not None:
+            etag = snapshot_etag(query.view, current.digest)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, current)
+
+    store = task_query_results(query)
+    snapshot = await run_in_threadpool(store.get)
+    body, next_cursor, total = snapshot.value.payload
+    response = Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "ETag": snapshot.value.etag,
+            "X-Total-Count": str(total)
+        }
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_snapshot_headers(response, snapshot, store)
+    return response
+
+# Next-event lookups running at once for one NDJSON stream
+ENRICHMENT_CONCURRENCY = int(os.environ.get("ENRICHMENT_CONCURRENCY", "8"))
+
+enrichment_executor = ThreadPoolExecutor(
+    max_workers=ENRICHMENT_CONCURRENCY,
+    thread_name_prefix="next-event"
+)
+
+def ndjson_record(record: dict) -> bytes:
+    return to_json(record) + b"\n"
+
+async def _enrich(task_id: int, client: ReclaimClient) -> dict:
+    loop = asyncio.get_running_loop()
+    try:
+        next_event = await loop.run_in_executor(enrichment_executor, fetch_next_event, task_id, client)
+    except Exception as e:
+        return {"type": "next_event", "id": str(task_id), "next_event": None, "error": str(e)}
+    return {"type": "next_event", "id": str(task_id), "next_event": next_event}
+
+async def stream_tasks_ndjson(query: Optional[TaskListQuery], include_next_event: bool) -> StreamingResponse:
+    """Send all tasks right away, then one record per next-event lookup as it completes.
+
+    Time to first byte only depends on the task snapshot; slow event queries
+    delay their own record, not the task list. Lookup failures are reported
+    as ``error`` on the record instead of being dropped.
+    """
+    snapshot = await run_in_threadpool(task_snapshot.get)
+    client = get_configured_client() if include_next_event else None
+    headers = {}
+    if query is not None:
+        tasks, next_cursor, total = query.apply(task_index(snapshot))
+        headers["X-Total-Count"] = str(total)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+    else:
+        tasks = snapshot.value
+
+    async def records():
+        yield b"".join(
+            ndjson_record({"type": "task", "task": build_task_response(task)})
+            for task in tasks
+        )
+        enriched = 0
+        if include_next_event:
+            lookups = [asyncio.ensure_future(_enrich(task.id, client)) for task in tasks if task.id]
+            try:
+                for lookup in asyncio.as_completed(lookups):
+                    record = await lookup
+                    enriched += "error" not in record
+                    yield ndjson_record(record)
+            finally:
+                # Lookups that have not started yet are dropped when the client goes away
+                for lookup in lookups:
+                    lookup.cancel()
+        yield ndjson_record({"type": "end", "count": len(tasks), "enriched": enriched})
+
+    response = StreamingResponse(records(), media_type="application/x-ndjson", headers=headers)
+    set_snapshot_headers(response, snapshot, task_snapshot)
+    return response
+
+@app.get("/tasks")
+async def get_tasks(
+    request: Request,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    at_risk: Optional[bool] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=TASK_QUERY_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    format: str = "json",
+):
+    """Get all tasks, optionally filtered, sorted, paginated and enriched"""
+    include_next_event = "next_event" in _parse_includes(include)
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"Invalid format '{format}', expected json or ndjson")
+    query = None
+    if any(param is not None for param in (status, priority, due_after, due_before, at_risk, sort, limit, cursor)):
+        query = TaskListQuery(
+            statuses=_parse_enum_list(status, TaskStatus, "status"),
+            priorities=_parse_enum_list(priority, TaskPriority, "priority"),
+            due_after=due_after,
+            due_before=due_before,
+            at_risk=at_risk,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            include_next_event=include_next_event
+        )
+    try:
+        if format == "ndjson":
+            return await stream_tasks_ndjson(query, include_next_event)
+        if query is None:
+            store = tasks_with_next_event_results if include_next_event else tasks_results
+            return await serve_result(store, request)
+        return await serve_task_query(query, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_tasks_at_risk(snapshot: Snapshot):
+    """Compute the /tasks/at-risk payload from the shared task snapshot"""
+    get_configured_client()
+    
+    # Tasks that are at risk AND not archived AND not cancelled
+    at_risk_tasks = task_index(snapshot).at_risk
+    
+    # Convert to response format
+    task_responses = []
+    for task in at_risk_tasks:
+        task_responses.append(build_task_response(task))
+    
+    return {
+        "count": len(task_responses),
+        "tasks": task_responses,
+        "filter_info": {
+            "excluded_archived": True,
+            "excluded_cancelled": True,
+            "description": "Archivierte und stornierte Tasks werden aus Risiko-Berechnung ausgeschlossen"
+        }
+    }
+
+tasks_at_risk_results = ViewResultStore("at-risk", build_tasks_at_risk)
+
 @app.get("/tasks/at-risk")
-async def get_tasks_at_risk():
+async def get_tasks_at_risk(request: Request):
     """Get only tasks that are at risk, excluding archived tasks"""
     try:
-        
-        # Configure client with token from environment
-        token = os.environ.get("RECLAIM_TOKEN")
-        if not token:
-            raise HTTPException(
-                status_code=500,
-                detail="RECLAIM_TOKEN environment variable is not set"
-            )
-        client = ReclaimClient.configure(token=token)
-        
-        # Get all tasks
-        tasks = Task.list()
-        
-        # Filter tasks that are at risk AND not archived AND not cancelled
-        at_risk_tasks = [
-            task for task in tasks 
-            if (task.at_risk and 
-                str(task.status) != "TaskStatus.ARCHIVED" and
-                str(task.status) != "TaskStatus.CANCELLED")
-        ]
-        
-        # Convert to response format
-        task_responses = []
-        for task in at_risk_tasks:
-            task_responses.append(TaskResponse(
-                id=str(task.id),
-                title=task.title,
-                notes=task.notes,
-                priority=str(task.priority) if task.priority else None,
-                status=str(task.status) if task.status else None,
-                at_risk=task.at_risk,
-                due=task.due,
-                duration=task.duration,
-                duration_text=format_duration_text(task.duration),
-                snooze_until=task.snooze_until,
-                time_chunks_spent=task.time_chunks_spent,
-                time_chunks_remaining=task.time_chunks_remaining,
-                progress_text=format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)
-            ))
-        
-        return {
-            "count": len(task_responses),
-            "tasks": task_responses,
-            "filter_info": {
-                "excluded_archived": True,
-                "excluded_cancelled": True,
-                "description": "Archivierte und stornierte Tasks werden aus Risiko-Berechnung ausgeschlossen"
-            }
-        }
-        
+        return await serve_result(tasks_at_risk_results, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_overdue_tasks(snapshot: Snapshot):
+    """Compute the /tasks/overdue payload from the shared task snapshot"""
+    get_configured_client()
+    
+    # Tasks that are overdue AND not archived AND not cancelled
+    overdue_tasks = task_index(snapshot).overdue
+    
+    # Convert to response format
+    task_responses = []
+    for task in overdue_tasks:
+        task_responses.append(build_task_response(task))
+    
+    return {
+        "count": len(task_responses),
+        "tasks": task_responses,
+        "filter_info": {
+            "excluded_archived": True,
+            "excluded_cancelled": True,
+            "description": "Overdue Tasks (Fälligkeitsdatum in der Vergangenheit)"
+        }
+    }
+
+overdue_tasks_results = ViewResultStore("overdue", build_overdue_tasks)
+
 @app.get("/tasks/overdue")
-async def get_overdue_tasks():
+async def get_overdue_tasks(request: Request):
     """Get only tasks that are overdue (due date in the past)"""
     try:
-        from datetime import datetime, timezone
-        
-        # Configure client with token from environment
-        token = os.environ.get("RECLAIM_TOKEN")
-        if not token:
-            raise HTTPException(
-                status_code=500,
-                detail="RECLAIM_TOKEN environment variable is not set"
-            )
-        client = ReclaimClient.configure(token=token)
-        
-        # Get all tasks
-        tasks = Task.list()
-        
-        # Get current time in UTC
-        now = datetime.now(timezone.utc)
-        
-        # Filter tasks that are overdue AND not archived AND not cancelled
-        overdue_tasks = [
-            task for task in tasks 
-            if (task.due and task.due < now and 
-                str(task.status) != "TaskStatus.ARCHIVED" and
-                str(task.status) != "TaskStatus.CANCELLED")
-        ]
-        
-        # Convert to response format
-        task_responses = []
-        for task in overdue_tasks:
-            task_responses.append(TaskResponse(
-                id=str(task.id),
-                title=task.title,
-                notes=task.notes,
-                priority=str(task.priority) if task.priority else None,
-                status=str(task.status) if task.status else None,
-                at_risk=task.at_risk,
-                due=task.due,
-                duration=task.duration,
-                duration_text=format_duration_text(task.duration),
-                snooze_until=task.snooze_until,
-                time_chunks_spent=task.time_chunks_spent,
-                time_chunks_remaining=task.time_chunks_remaining,
-                progress_text=format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)
-            ))
-        
-        return {
-            "count": len(task_responses),
-            "tasks": task_responses,
-            "filter_info": {
-                "excluded_archived": True,
-                "excluded_cancelled": True,
-                "description": "Overdue Tasks (Fälligkeitsdatum in der Vergangenheit)"
-            }
-        }
-        
+        return await serve_result(overdue_tasks_results, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Seconds a rendered body is reused while the task snapshot is unchanged; this
+# bounds how stale relative texts like "in 3h" or newly overdue tasks can get
+RENDER_CACHE_TTL = float(os.environ.get("RENDER_CACHE_TTL", "300"))
+RENDER_CACHE_SIZE = 32
+
+class RenderedPayload:
+    """A JSON body serialized once, with a strong ETag over its bytes"""
+
+    __slots__ = ("body", "etag", "rendered_at")
+
+    def __init__(self, payload: dict):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.rendered_at = time.monotonic()
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, media_type="application/json", headers={"ETag": self.etag})
+
+class RenderCache:
+    """Bounded LRU of rendered payloads keyed by a content hash of their input"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, RenderedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, key: tuple) -> Optional[RenderedPayload]:
+        """Return the cached payload for ``key`` if it has not expired"""
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None and time.monotonic() - rendered.rendered_at <= self.ttl:
+                self._entries.move_to_end(key)
+                return rendered
+            return None
+
+    def get_or_render(self, key: tuple, render) -> RenderedPayload:
+        rendered = self.peek(key)
+        if rendered is not None:
+            return rendered
+
+        rendered = RenderedPayload(render())
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+render_cache = RenderCache(RENDER_CACHE_TTL, RENDER_CACHE_SIZE)
+
+def priority_short(task: Task) -> str:
+    return task.priority.value if task.priority else "None"
+
+# Templates for the /tasks/summary and /tasks/daily bodies. Items are rendered
+# with str.format and joined once instead of growing strings in loops.
+SUMMARY_TEXT = (
+    "📅 {date}\n\n"
+    "📅 Überfällige Tasks ({overdue_count}):\n{overdue_items}\n"
+    "⚠️ Tasks mit Risiko ({at_risk_count}):\n{at_risk_items}"
+    "\nGesamt: {total_count} Aufgaben benötigen Aufmerksamkeit\n\n"
+    "🔗 Direkte Links:\n"
+    "• https://app.reclaim.ai/planner - Kalender\n"
+    "• https://app.reclaim.ai/priorities - Prioritäten"
+).format
+SUMMARY_TEXT_ITEM = "• {title} ({priority}) - {due_info} - {detail}{event_info}\n".format
+SUMMARY_HTML = (
+    "<h2>📅 {date}</h2>\n\n"
+    "<h3>📅 Überfällige Tasks ({overdue_count}):</h3>\n<ul>\n{overdue_items}</ul>\n\n"
+    "<h3>⚠️ Tasks mit Risiko ({at_risk_count}):</h3>\n<ul>\n{at_risk_items}</ul>\n\n"
+    "<p><strong>Gesamt: {total_count} Aufgaben benötigen Aufmerksamkeit</strong></p>\n\n"
+    "<h3>🔗 Direkte Links:</h3>\n<ul>\n"
+    '<li><a href="https://app.reclaim.ai/planner">Kalender</a></li>\n'
+    '<li><a href="https://app.reclaim.ai/priorities">Prioritäten</a></li>\n'
+    "</ul>"
+).format
+SUMMARY_HTML_ITEM = (
+    '<li><strong><a href="https://app.reclaim.ai/tasks/{id}">{title}</a></strong>'
+    " ({priority}) - {due_info} - {duration_text}{progress_html}{event_html}</li>\n"
+).format
+
+DAILY_TEXT = (
+    "📅 Tagesübersicht - {date}\n\n"
+    "⏰ Geschätzte Arbeitszeit: {total_time_text}\n"
+    "📊 Aufgaben: {total_tasks} (Überfällig: {overdue_count}, Risiko: {at_risk_count})\n\n"
+    "{sections}"
+    "🎯 HEUTE FOKUS:\n"
+    "1. {critical_count} kritische Tasks zuerst\n"
+    "2. {high_priority_count} hohe Priorität\n"
+    "3. {medium_focus_count} mittlere Priorität\n\n"
+    "🔗 Schnellzugriff:\n"
+    "• https://app.reclaim.ai/planner - Kalender\n"
+    "• https://app.reclaim.ai/priorities - Prioritäten\n"
+).format
+DAILY_SECTION = "{heading} ({count}):\n{items}{more}\n".format
+DAILY_ITEM = "• {title} - {due_info} - {duration_text}{progress_info}\n".format
+DAILY_MEDIUM_LIMIT = 5
+
+def summary_row(task: Task, client: ReclaimClient) -> dict:
+    """Format the fields of one task shared by the text and HTML summary"""
+    progress = format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)
+    next_event = get_next_event_for_task(task.id, client) if task.id else None
+    duration_text = format_duration_text(task.duration) or "Keine Dauer"
+    return {
+        "id": task.id,
+        "title": task.title,
+        "priority": priority_short(task),
+        "due_info": format_due_date_info(task.due, task.snooze_until),
+        "duration_text": duration_text,
+        "detail": progress or duration_text,
+        "progress_html": f" <strong>{progress}</strong>" if progress else "",
+        "event_info": f" | 📅 {next_event['time_until']}" if next_event else "",
+        "event_html": f" | <em>📅 {next_event['time_until']}</em>" if next_event else "",
+    }
+
+def render_summary(index: TaskIndex, client: ReclaimClient) -> dict:
+    # By priority (P1, P2, P3, P4); at-risk lists all at-risk tasks, overdue ones included
+    active = TaskQuery(index).active()
+    overdue_tasks = active.due_before(index.now).order_by("priority").all()
+    at_risk_tasks = active.at_risk().order_by("priority").all()
+
+    # Tasks in both sections are formatted and enriched once
+    rows = {}
+    for task in overdue_tasks + at_risk_tasks:
+        if id(task) not in rows:
+            rows[id(task)] = summary_row(task, client)
+    overdue_rows = [rows[id(task)] for task in overdue_tasks]
+    at_risk_rows = [rows[id(task)] for task in at_risk_tasks]
+
+    counts = {
+        "date": datetime.now().strftime("%d. %B %Y"),
+        "overdue_count": len(overdue_tasks),
+        "at_risk_count": len(at_risk_tasks),
+        "total_count": len(overdue_tasks) + len(at_risk_tasks),
+    }
+    return {
+        "text": SUMMARY_TEXT(
+            overdue_items="".join(SUMMARY_TEXT_ITEM(**row) for row in overdue_rows),
+            at_risk_items="".join(SUMMARY_TEXT_ITEM(**row) for row in at_risk_rows),
+            **counts
+        ),
+        "html": SUMMARY_HTML(
+            overdue_items="".join(SUMMARY_HTML_ITEM(**row) for row in overdue_rows),
+            at_risk_items="".join(SUMMARY_HTML_ITEM(**row) for row in at_risk_rows),
+            **counts
+        ),
+        "overdue_count": counts["overdue_count"],
+        "at_risk_count": counts["at_risk_count"],
+        "total_count": counts["total_count"],
+        "generated_at": datetime.now().isoformat()
+    }
+
+def daily_item(task: Task) -> str:
+    progress = format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)
+    return DAILY_ITEM(
+        title=task.title,
+        due_info=format_due_date_info(task.due, task.snooze_until),
+        duration_text=format_duration_text(task.duration) or "Keine Dauer",
+        progress_info=f" {progress}" if progress else ""
+    )
+
+def daily_section(heading: str, tasks: List[Task], count: Optional[int] = None) -> str:
+    """Render ``tasks``, which may be the first few of ``count`` tasks"""
+    if count is None:
+        count = len(tasks)
+    if not count:
+        return ""
+    more = f"... und {count - len(tasks)} weitere\n" if count > len(tasks) else ""
+    return DAILY_SECTION(
+        heading=heading,
+        count=count,
+        items="".join(daily_item(task) for task in tasks),
+        more=more
+    )
+
+def render_daily(index: TaskIndex) -> dict:
+    active = TaskQuery(index).active()
+    overdue = active.due_before(index.now)
+    # At risk but not overdue
+    at_risk = active.at_risk().due_after(index.now)
+    overdue_tasks = overdue.all()
+    at_risk_tasks = at_risk.all()
+
+    total_time = sum(task.duration for task in overdue_tasks + at_risk_tasks if task.duration)
+
+    # Group by urgency, by priority and due date within each group
+    critical_tasks = overdue.priority(TaskPriority.P1).order_by("due").all()  # Overdue P1
+    high_priority_tasks = (  # Overdue P2 or At-risk P1
+        overdue.priority(TaskPriority.P2, TaskPriority.P3, TaskPriority.P4, None).order_by("priority", "due").all()
+        + at_risk.priority(TaskPriority.P1).order_by("due").all()
+    )
+    medium_priority = at_risk.priority(TaskPriority.P2).order_by("due")  # At-risk P2
+    medium_priority_count = medium_priority.count()
+    low_priority_count = at_risk.priority(TaskPriority.P3, TaskPriority.P4, None).count()  # At-risk P3/P4
+
+    sections = (
+        daily_section("🚨 KRITISCH - Sofort erledigen", critical_tasks)
+        + daily_section("🔥 HOHE PRIORITÄT - Heute erledigen", high_priority_tasks)
+        + daily_section(
+            "⚡ MITTLERE PRIORITÄT - Diese Woche",
+            medium_priority.limit(DAILY_MEDIUM_LIMIT).all(),
+            medium_priority_count
+        )
+    )
+    total_tasks = len(overdue_tasks) + len(at_risk_tasks)
+
+    return {
+        "text": DAILY_TEXT(
+            date=datetime.now().strftime("%d. %B %Y"),
+            total_time_text=format_duration_text(total_time),
+            total_tasks=total_tasks,
+            overdue_count=len(overdue_tasks),
+            at_risk_count=len(at_risk_tasks),
+            sections=sections,
+            critical_count=len(critical_tasks),
+            high_priority_count=len(high_priority_tasks),
+            medium_focus_count=min(3, medium_priority_count)
+        ),
+        "critical_count": len(critical_tasks),
+        "high_priority_count": len(high_priority_tasks),
+        "medium_priority_count": medium_priority_count,
+        "low_priority_count": low_priority_count,
+        "total_time_hours": total_time,
+        "total_tasks": total_tasks,
+        "generated_at": datetime.now().isoformat()
+    }
+
+def render_cache_key(view: str, digest: str) -> tuple:
+    # The date is part of the key because overdue status and headings depend on it
+    return (view, digest, datetime.now().date())
+
+def build_tasks_summary(snapshot: Snapshot) -> RenderedPayload:
+    """Compute the /tasks/summary payload from the shared task snapshot"""
+    client = get_configured_client()
+    return render_cache.get_or_render(
+        render_cache_key("summary", snapshot.digest),
+        lambda: render_summary(task_index(snapshot), client)
+    )
+
+tasks_summary_results = ViewResultStore("summary", build_tasks_summary, serialize=None)
+
 @app.get("/tasks/summary")
-async def get_tasks_summary():
+async def get_tasks_summary(request: Request):
     """Get a summary of overdue and at-risk tasks as readable email text"""
     try:
-        from datetime import datetime, timezone
-        
-        # Configure client with token from environment
-        token = os.environ.get("RECLAIM_TOKEN")
-        if not token:
-            raise HTTPException(
-                status_code=500,
-                detail="RECLAIM_TOKEN environment variable is not set"
-            )
-        client = ReclaimClient.configure(token=token)
-        
-        # Get all tasks
-        tasks = Task.list()
-        
-        # Get current time in UTC
-        now = datetime.now(timezone.utc)
-        
-        # Filter overdue tasks (not archived, not cancelled)
-        overdue_tasks = [
-            task for task in tasks 
-            if (task.due and task.due < now and 
-                str(task.status) != "TaskStatus.ARCHIVED" and
-                str(task.status) != "TaskStatus.CANCELLED")
-        ]
-        
-        # Filter at-risk tasks (not archived, not cancelled)
-        at_risk_tasks = [
-            task for task in tasks 
-            if (task.at_risk and 
-                str(task.status) != "TaskStatus.ARCHIVED" and
-                str(task.status) != "TaskStatus.CANCELLED")
-        ]
-        
-        # Sort by priority (P1, P2, P3, P4)
-        def priority_sort_key(task):
-            priority_order = {"TaskPriority.P1": 1, "TaskPriority.P2": 2, "TaskPriority.P3": 3, "TaskPriority.P4": 4}
-            return priority_order.get(str(task.priority), 5)
-        
-        overdue_tasks.sort(key=priority_sort_key)
-        at_risk_tasks.sort(key=priority_sort_key)
-        
-        # Generate email text
-        current_date = datetime.now().strftime("%d. %B %Y")
-        
-        email_text = f"📅 {current_date}\n\n"
-        
-        # Overdue section
-        email_text += f"📅 Überfällige Tasks ({len(overdue_tasks)}):\n"
-        for task in overdue_tasks:
-            due_date_info = format_due_date_info(task.due, task.snooze_until)
-            duration_text = format_duration_text(task.duration) or "Keine Dauer"
-            priority_short = str(task.priority).replace("TaskPriority.P1", "P1").replace("TaskPriority.P2", "P2").replace("TaskPriority.P3", "P3").replace("TaskPriority.P4", "P4")
-            progress_info = format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)
-            
-            # Get next event info
-            next_event = get_next_event_for_task(task.id, client) if task.id else None
-            event_info = f" | 📅 {next_event['time_until']}" if next_event else ""
-            
-            if progress_info:
-                email_text += f"• {task.title} ({priority_short}) - {due_date_info} - {progress_info}{event_info}\n"
-            else:
-                email_text += f"• {task.title} ({priority_short}) - {due_date_info} - {duration_text}{event_info}\n"
-        
-        email_text += "\n"
-        
-        # At-risk section (show all at-risk tasks, but overdue ones are already shown above)
-        email_text += f"⚠️ Tasks mit Risiko ({len(at_risk_tasks)}):\n"
-        for task in at_risk_tasks:
-            due_date_info = format_due_date_info(task.due, task.snooze_until)
-            duration_text = format_duration_text(task.duration) or "Keine Dauer"
-            priority_short = str(task.priority).replace("TaskPriority.P1", "P1").replace("TaskPriority.P2", "P2").replace("TaskPriority.P3", "P3").replace("TaskPriority.P4", "P4")
-            progress_info = format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)
-            
-            # Get next event info
-            next_event = get_next_event_for_task(task.id, client) if task.id else None
-            event_info = f" | 📅 {next_event['time_until']}" if next_event else ""
-            
-            if progress_info:
-                email_text += f"• {task.title} ({priority_short}) - {due_date_info} - {progress_info}{event_info}\n"
-            else:
-                email_text += f"• {task.title} ({priority_short}) - {due_date_info} - {duration_text}{event_info}\n"
-        
-        email_text += f"\nGesamt: {len(overdue_tasks) + len(at_risk_tasks)} Aufgaben benötigen Aufmerksamkeit\n\n"
-        email_text += "🔗 Direkte Links:\n"
-        email_text += "• https://app.reclaim.ai/planner - Kalender\n"
-        email_text += "• https://app.reclaim.ai/priorities - Prioritäten"
-        
-        # Generate HTML version
-        html_text = f"<h2>📅 {current_date}</h2>\n\n"
-        
-        # Overdue section
-        html_text += f"<h3>📅 Überfällige Tasks ({len(overdue_tasks)}):</h3>\n<ul>\n"
-        for task in overdue_tasks:
-            due_date_info = format_due_date_info(task.due, task.snooze_until)
-            duration_text = format_duration_text(task.duration) or "Keine Dauer"
-            priority_short = str(task.priority).replace("TaskPriority.P1", "P1").replace("TaskPriority.P2", "P2").replace("TaskPriority.P3", "P3").replace("TaskPriority.P4", "P4")
-            progress_info = f" <strong>{format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}</strong>" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
-            
-            # Get next event info for HTML
-            next_event = get_next_event_for_task(task.id, client) if task.id else None
-            event_info = f" | <em>📅 {next_event['time_until']}</em>" if next_event else ""
-            
-            html_text += f"<li><strong><a href=\"https://app.reclaim.ai/tasks/{task.id}\">{task.title}</a></strong> ({priority_short}) - {due_date_info} - {duration_text}{progress_info}{event_info}</li>\n"
-        html_text += "</ul>\n\n"
-        
-        # At-risk section (show all at-risk tasks, but overdue ones are already shown above)
-        html_text += f"<h3>⚠️ Tasks mit Risiko ({len(at_risk_tasks)}):</h3>\n<ul>\n"
-        for task in at_risk_tasks:
-            due_date_info = format_due_date_info(task.due, task.snooze_until)
-            duration_text = format_duration_text(task.duration) or "Keine Dauer"
-            priority_short = str(task.priority).replace("TaskPriority.P1", "P1").replace("TaskPriority.P2", "P2").replace("TaskPriority.P3", "P3").replace("TaskPriority.P4", "P4")
-            progress_info = f" <strong>{format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}</strong>" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
-            
-            # Get next event info for HTML
-            next_event = get_next_event_for_task(task.id, client) if task.id else None
-            event_info = f" | <em>📅 {next_event['time_until']}</em>" if next_event else ""
-            
-            html_text += f"<li><strong><a href=\"https://app.reclaim.ai/tasks/{task.id}\">{task.title}</a></strong> ({priority_short}) - {due_date_info} - {duration_text}{progress_info}{event_info}</li>\n"
-        html_text += "</ul>\n\n"
-        
-        html_text += f"<p><strong>Gesamt: {len(overdue_tasks) + len(at_risk_tasks)} Aufgaben benötigen Aufmerksamkeit</strong></p>\n\n"
-        html_text += "<h3>🔗 Direkte Links:</h3>\n<ul>\n"
-        html_text += '<li><a href="https://app.reclaim.ai/planner">Kalender</a></li>\n'
-        html_text += '<li><a href="https://app.reclaim.ai/priorities">Prioritäten</a></li>\n'
-        html_text += "</ul>"
-        
-        return {
-            "text": email_text,
-            "html": html_text,
-            "overdue_count": len(overdue_tasks),
-            "at_risk_count": len(at_risk_tasks),
-            "total_count": len(overdue_tasks) + len(at_risk_tasks),
-            "generated_at": datetime.now().isoformat()
-        }
-        
+        return await serve_rendered(tasks_summary_results, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_daily_tasks(snapshot: Snapshot) -> RenderedPayload:
+    """Compute the /tasks/daily payload from the shared task snapshot"""
+    get_configured_client()
+    return render_cache.get_or_render(
+        render_cache_key("daily", snapshot.digest),
+        lambda: render_daily(task_index(snapshot))
+    )
+
+daily_tasks_results = ViewResultStore("daily", build_daily_tasks, serialize=None)
+
 @app.get("/tasks/daily")
-async def get_daily_tasks():
+async def get_daily_tasks(request: Request):
     """Get a daily-focused view of tasks with time estimates and urgency indicators"""
     try:
-        from datetime import datetime, timezone
-        
-        # Configure client with token from environment
-        token = os.environ.get("RECLAIM_TOKEN")
-        if not token:
-            raise HTTPException(
-                status_code=500,
-                detail="RECLAIM_TOKEN environment variable is not set"
-            )
-        client = ReclaimClient.configure(token=token)
-        
-        # Get all tasks
-        tasks = Task.list()
-        
-        # Filter tasks (same as summary but with additional logic)
-        overdue_tasks = []
-        at_risk_tasks = []
-        
-        for task in tasks:
-            # Skip archived and cancelled tasks
-            if task.status in [TaskStatus.ARCHIVED, TaskStatus.CANCELLED]:
-                continue
-                
-            # Check if overdue (due date is in the past)
-            if task.due and task.due < datetime.now(timezone.utc):
-                overdue_tasks.append(task)
-            # Check if at risk (but not overdue)
-            elif task.at_risk and task.due and task.due >= datetime.now(timezone.utc):
-                at_risk_tasks.append(task)
-        
-        # Sort by priority and due date
-        def sort_key(task):
-            priority_order = {"TaskPriority.P1": 1, "TaskPriority.P2": 2, "TaskPriority.P3": 3, "TaskPriority.P4": 4}
-            return (priority_order.get(str(task.priority), 5), task.due or datetime.max.replace(tzinfo=timezone.utc))
-        
-        overdue_tasks.sort(key=sort_key)
-        at_risk_tasks.sort(key=sort_key)
-        
-        # Calculate total time needed
-        total_time = 0
-        for task in overdue_tasks + at_risk_tasks:
-            if task.duration:
-                total_time += task.duration
-        
-        # Group by urgency
-        critical_tasks = []  # Overdue P1
-        high_priority_tasks = []  # Overdue P2 or At-risk P1
-        medium_priority_tasks = []  # At-risk P2
-        low_priority_tasks = []  # At-risk P3/P4
-        
-        for task in overdue_tasks:
-            if str(task.priority) == "TaskPriority.P1":
-                critical_tasks.append(task)
-            else:
-                high_priority_tasks.append(task)
-        
-        for task in at_risk_tasks:
-            if str(task.priority) == "TaskPriority.P1":
-                high_priority_tasks.append(task)
-            elif str(task.priority) == "TaskPriority.P2":
-                medium_priority_tasks.append(task)
-            else:
-                low_priority_tasks.append(task)
-        
-        # Generate daily summary
-        current_date = datetime.now().strftime("%d. %B %Y")
-        
-        daily_text = f"📅 Tagesübersicht - {current_date}\n\n"
-        
-        # Time estimate
-        daily_text += f"⏰ Geschätzte Arbeitszeit: {format_duration_text(total_time)}\n"
-        daily_text += f"📊 Aufgaben: {len(overdue_tasks + at_risk_tasks)} (Überfällig: {len(overdue_tasks)}, Risiko: {len(at_risk_tasks)})\n\n"
-        
-        # Critical tasks (most urgent)
-        if critical_tasks:
-            daily_text += f"🚨 KRITISCH - Sofort erledigen ({len(critical_tasks)}):\n"
-            for task in critical_tasks:
-                due_date_info = format_due_date_info(task.due, task.snooze_until)
-                duration_text = format_duration_text(task.duration) or "Keine Dauer"
-                progress_info = f" {format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
-                daily_text += f"• {task.title} - {due_date_info} - {duration_text}{progress_info}\n"
-            daily_text += "\n"
-        
-        # High priority tasks
-        if high_priority_tasks:
-            daily_text += f"🔥 HOHE PRIORITÄT - Heute erledigen ({len(high_priority_tasks)}):\n"
-            for task in high_priority_tasks:
-                due_date_info = format_due_date_info(task.due, task.snooze_until)
-                duration_text = format_duration_text(task.duration) or "Keine Dauer"
-                progress_info = f" {format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
-                daily_text += f"• {task.title} - {due_date_info} - {duration_text}{progress_info}\n"
-            daily_text += "\n"
-        
-        # Medium priority tasks
-        if medium_priority_tasks:
-            daily_text += f"⚡ MITTLERE PRIORITÄT - Diese Woche ({len(medium_priority_tasks)}):\n"
-            for task in medium_priority_tasks[:5]:  # Limit to 5 for daily view
-                due_date_info = format_due_date_info(task.due, task.snooze_until)
-                duration_text = format_duration_text(task.duration) or "Keine Dauer"
-                progress_info = f" {format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
-                daily_text += f"• {task.title} - {due_date_info} - {duration_text}{progress_info}\n"
-            if len(medium_priority_tasks) > 5:
-                daily_text += f"... und {len(medium_priority_tasks) - 5} weitere\n"
-            daily_text += "\n"
-        
-        # Quick actions
-        daily_text += "🎯 HEUTE FOKUS:\n"
-        daily_text += f"1. {len(critical_tasks)} kritische Tasks zuerst\n"
-        daily_text += f"2. {len(high_priority_tasks)} hohe Priorität\n"
-        daily_text += f"3. {min(3, len(medium_priority_tasks))} mittlere Priorität\n\n"
-        
-        # Links
-        daily_text += "🔗 Schnellzugriff:\n"
-        daily_text += "• https://app.reclaim.ai/planner - Kalender\n"
-        daily_text += "• https://app.reclaim.ai/priorities - Prioritäten\n"
-        
-        return {
-            "text": daily_text,
-            "critical_count": len(critical_tasks),
-            "high_priority_count": len(high_priority_tasks),
-            "medium_priority_count": len(medium_priority_tasks),
-            "low_priority_count": len(low_priority_tasks),
-            "total_time_hours": total_time,
-            "total_tasks": len(overdue_tasks + at_risk_tasks),
-            "generated_at": datetime.now().isoformat()
-        }
-        
+        return await serve_rendered(daily_tasks_results, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting daily tasks: {str(e)}")
 
+UPCOMING_LIMIT = 20
+
+def build_upcoming_tasks(snapshot: Snapshot):
+    """Compute the /tasks/upcoming payload from the shared task snapshot"""
+    get_configured_client()
+    
+    # Upcoming tasks (not overdue, not archived, not cancelled, with due date),
+    # earliest first, limited to the next UPCOMING_LIMIT for overview
+    index = task_index(snapshot)
+    upcoming_tasks = index.upcoming[:UPCOMING_LIMIT]
+    # The day buckets are runs of index.upcoming, so their share of the
+    # overview is a clamp rather than another pass
+    today_count = min(len(index.today), UPCOMING_LIMIT)
+    tomorrow_count = min(len(index.today) + len(index.tomorrow), UPCOMING_LIMIT) - today_count
+    this_week_count = min(len(index.this_week), UPCOMING_LIMIT)
+    
+    # Generate upcoming summary
+    current_date = datetime.now().strftime("%d. %B %Y")
+    
+    upcoming_text = f"📅 Nächste geplante Tasks - {current_date}\n\n"
+    
+    if not upcoming_tasks:
+        upcoming_text += "✅ Keine anstehenden Tasks geplant!\n\n"
+    else:
+        upcoming_text += f"📊 Nächste {len(upcoming_tasks)} Tasks:\n\n"
+        
+        # Days until due come precomputed with the index
+        for i, (task, days_until) in enumerate(zip(upcoming_tasks, index.days_until), 1):
+            if days_until == 0:
+                due_info = "HEUTE"
+            elif days_until == 1:
+                due_info = "MORGEN"
+            elif days_until < 7:
+                due_info = f"in {days_until} Tagen"
+            else:
+                due_info = f"in {days_until} Tagen"
+            
+            due_date = task.due.strftime("%d. %B")
+            duration_text = format_duration_text(task.duration) or "Keine Dauer"
+            priority_short = str(task.priority).replace("TaskPriority.P1", "P1").replace("TaskPriority.P2", "P2").replace("TaskPriority.P3", "P3").replace("TaskPriority.P4", "P4")
+            progress_info = f" [{format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}]" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
+            
+            upcoming_text += f"{i:2d}. {task.title} ({priority_short}) - {due_date} ({due_info}) - {duration_text}{progress_info}\n"
+    
+    # Add quick stats
+    if upcoming_tasks:
+        upcoming_text += f"\n📈 Übersicht:\n"
+        upcoming_text += f"• Heute: {today_count} Tasks\n"
+        upcoming_text += f"• Morgen: {tomorrow_count} Tasks\n"
+        upcoming_text += f"• Diese Woche: {this_week_count} Tasks\n"
+    
+    # Links
+    upcoming_text += "\n🔗 Schnellzugriff:\n"
+    upcoming_text += "• https://app.reclaim.ai/planner - Kalender\n"
+    upcoming_text += "• https://app.reclaim.ai/priorities - Prioritäten\n"
+    
+    return {
+        "text": upcoming_text,
+        "total_upcoming": len(upcoming_tasks),
+        "today_count": today_count,
+        "tomorrow_count": tomorrow_count,
+        "this_week_count": this_week_count,
+        "next_task_due": upcoming_tasks[0].due.isoformat() if upcoming_tasks else None,
+        "generated_at": datetime.now().isoformat()
+    }
+
+upcoming_tasks_results = ViewResultStore("upcoming", build_upcoming_tasks)
+
 @app.get("/tasks/upcoming")
-async def get_upcoming_tasks():
+async def get_upcoming_tasks(request: Request):
     """Get upcoming tasks sorted by due date"""
     try:
-        from datetime import datetime, timezone
-        
-        # Configure client with token from environment
-        token = os.environ.get("RECLAIM_TOKEN")
-        if not token:
-            raise HTTPException(
-                status_code=500,
-                detail="RECLAIM_TOKEN environment variable is not set"
-            )
-        client = ReclaimClient.configure(token=token)
-        
-        # Get all tasks
-        tasks = Task.list()
-        
-        # Filter upcoming tasks (not overdue, not archived, not cancelled, with due date)
-        upcoming_tasks = []
-        now = datetime.now(timezone.utc)
-        
-        for task in tasks:
-            # Skip archived and cancelled tasks
-            if task.status in [TaskStatus.ARCHIVED, TaskStatus.CANCELLED]:
-                continue
-                
-            # Skip overdue tasks
-            if task.due and task.due < now:
-                continue
-                
-            # Include tasks with due date in the future
-            if task.due and task.due >= now:
-                upcoming_tasks.append(task)
-        
-        # Sort by due date (earliest first)
-        upcoming_tasks.sort(key=lambda x: x.due or datetime.max.replace(tzinfo=timezone.utc))
-        
-        # Limit to next 20 tasks for overview
-        upcoming_tasks = upcoming_tasks[:20]
-        
-        # Generate upcoming summary
-        current_date = datetime.now().strftime("%d. %B %Y")
-        
-        upcoming_text = f"📅 Nächste geplante Tasks - {current_date}\n\n"
-        
-        if not upcoming_tasks:
-            upcoming_text += "✅ Keine anstehenden Tasks geplant!\n\n"
-        else:
-            upcoming_text += f"📊 Nächste {len(upcoming_tasks)} Tasks:\n\n"
-            
-            for i, task in enumerate(upcoming_tasks, 1):
-                # Calculate days until due
-                days_until = (task.due - now).days
-                
-                if days_until == 0:
-                    due_info = "HEUTE"
-                elif days_until == 1:
-                    due_info = "MORGEN"
-                elif days_until < 7:
-                    due_info = f"in {days_until} Tagen"
-                else:
-                    due_info = f"in {days_until} Tagen"
-                
-                due_date = task.due.strftime("%d. %B")
-                duration_text = format_duration_text(task.duration) or "Keine Dauer"
-                priority_short = str(task.priority).replace("TaskPriority.P1", "P1").replace("TaskPriority.P2", "P2").replace("TaskPriority.P3", "P3").replace("TaskPriority.P4", "P4")
-                progress_info = f" [{format_progress_text(task.time_chunks_spent, task.time_chunks_remaining)}]" if format_progress_text(task.time_chunks_spent, task.time_chunks_remaining) else ""
-                
-                upcoming_text += f"{i:2d}. {task.title} ({priority_short}) - {due_date} ({due_info}) - {duration_text}{progress_info}\n"
-        
-        # Add quick stats
-        if upcoming_tasks:
-            today_tasks = [t for t in upcoming_tasks if (t.due - now).days == 0]
-            tomorrow_tasks = [t for t in upcoming_tasks if (t.due - now).days == 1]
-            this_week_tasks = [t for t in upcoming_tasks if (t.due - now).days <= 7]
-            
-            upcoming_text += f"\n📈 Übersicht:\n"
-            upcoming_text += f"• Heute: {len(today_tasks)} Tasks\n"
-            upcoming_text += f"• Morgen: {len(tomorrow_tasks)} Tasks\n"
-            upcoming_text += f"• Diese Woche: {len(this_week_tasks)} Tasks\n"
-        
-        # Links
-        upcoming_text += "\n🔗 Schnellzugriff:\n"
-        upcoming_text += "• https://app.reclaim.ai/planner - Kalender\n"
-        upcoming_text += "• https://app.reclaim.ai/priorities - Prioritäten\n"
-        
-        return {
-            "text": upcoming_text,
-            "total_upcoming": len(upcoming_tasks),
-            "today_count": len([t for t in upcoming_tasks if (t.due - now).days == 0]),
-            "tomorrow_count": len([t for t in upcoming_tasks if (t.due - now).days == 1]),
-            "this_week_count": len([t for t in upcoming_tasks if (t.due - now).days <= 7]),
-            "next_task_due": upcoming_tasks[0].due.isoformat() if upcoming_tasks else None,
-            "generated_at": datetime.now().isoformat()
-        }
-        
+        return await serve_result(upcoming_tasks_results, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting upcoming tasks: {str(e)}")
 
+@app.get("/tasks/stream")
+async def stream_tasks(request: Request):
+    """Stream task and next-event changes as Server-Sent Events"""
+    if not os.environ.get("RECLAIM_TOKEN"):
+        raise HTTPException(
+            status_code=500,
+            detail="RECLAIM_TOKEN environment variable is not set"
+        )
+
+    queue = await task_broadcaster.subscribe()
+
+    async def event_stream():
+        try:
+            yield f"retry: {int(STREAM_POLL_INTERVAL * 1000)}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event, payload = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        finally:
+            task_broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # For local development only
 if __name__ == "__main__":
     import uvicorn
@@ -16,6 +16,8 @@ from reclaim_sdk.exceptions import (
     AuthenticationError,
     RecordNotFound
 )
+from reclaim_sdk.middleware import CompressionMiddleware, ETagMiddleware
+from reclaim_sdk.formatting import format_duration_text, format_progress_text
 
 app = FastAPI(
     title="Reclaim Tasks API",
@@ -30,8 +32,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# ETag/304 for unchanged responses and compression above 1 KB
+app.add_middleware(ETagMiddleware)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
 # Pydantic models for API responses
 class TaskResponse(BaseModel):
     id: str
@@ -40,12 +47,14 @@ class TaskResponse(BaseModel):
     due: Optional[datetime] = None
     priority: Optional[str] = None
     duration: Optional[float] = None
+    duration_text: Optional[str] = None
     max_work_duration: Optional[float] = None
     min_work_duration: Optional[float] = None
     event_color: Optional[str] = None
     up_next: Optional[bool] = None
     status: Optional[str] = None
     time_scheme_id: Optional[str] = None
+    progress_text: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -109,12 +118,14 @@ async def get_all_tasks(client: ReclaimClient = Depends(get_reclaim_client)):
                 due=task.due,
                 priority=str(task.priority) if task.priority else None,
                 duration=task.duration,
+                duration_text=format_duration_text(task.duration),
                 max_work_duration=task.max_work_duration,
                 min_work_duration=task.min_work_duration,
                 event_color=str(task.event_color) if task.event_color else None,
                 up_next=task.on_deck,
                 status=str(task.status) if task.status else None,
                 time_scheme_id=task.time_scheme_id,
+                progress_text=format_progress_text(task.time_chunks_spent, task.time_chunks_remaining),
                 created_at=task.created,
                 updated_at=task.updated
             )
@@ -162,12 +173,14 @@ async def get_task_by_id(
             due=task.due,
             priority=str(task.priority) if task.priority else None,
             duration=task.duration,
+            duration_text=format_duration_text(task.duration),
             max_work_duration=task.max_work_duration,
             min_work_duration=task.min_work_duration,
             event_color=str(task.event_color) if task.event_color else None,
             up_next=task.on_deck,
             status=str(task.status) if task.status else None,
             time_scheme_id=task.time_scheme_id,
+            progress_text=format_progress_text(task.time_chunks_spent, task.time_chunks_remaining),
             created_at=task.created,
             updated_at=task.updated
         )
@@ -0,0 +1,176 @@
+"""
+Micro-benchmark of the duration, progress and snooze formatters.
+
+Compares the formatters api.py used to define inline with the table and
+LRU backed ones in reclaim_sdk.formatting, after checking that both
+produce the same texts over the whole input range.
+
+Usage:
+    python benchmarks/formatting.py
+    python benchmarks/formatting.py --calls 200000 --runs 7
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reclaim_sdk import formatting
+
+
+def legacy_duration_text(duration_hours):
+    if duration_hours is None:
+        return None
+    if duration_hours == 0:
+        return "0 min"
+    total_minutes = int(duration_hours * 60)
+    if total_minutes < 60:
+        return f"{total_minutes} min"
+    elif total_minutes == 60:
+        return "1h"
+    elif total_minutes < 1440:
+        hours = total_minutes // 60
+        minutes = total_minutes % 60
+        if minutes == 0:
+            return f"{hours}h"
+        else:
+            return f"{hours}h {minutes}min"
+    else:
+        days = total_minutes // 1440
+        remaining_minutes = total_minutes % 1440
+        hours = remaining_minutes // 60
+        minutes = remaining_minutes % 60
+        if hours == 0 and minutes == 0:
+            return f"{days}d"
+        elif minutes == 0:
+            return f"{days}d {hours}h"
+        else:
+            return f"{days}d {hours}h {minutes}min"
+
+
+def legacy_progress_text(time_chunks_spent, time_chunks_remaining):
+    if time_chunks_spent is None or time_chunks_remaining is None:
+        return None
+    if time_chunks_spent == 0 and time_chunks_remaining == 0:
+        return None
+    total_chunks = time_chunks_spent + time_chunks_remaining
+    if time_chunks_spent == 0:
+        total_hours = time_chunks_remaining / 4
+        if total_chunks > 1:
+            return f"{legacy_duration_text(total_hours)} ⏳ ({total_chunks} Sessions)"
+        else:
+            return f"{legacy_duration_text(total_hours)} ⏳"
+    elif time_chunks_remaining == 0:
+        return f"✅ ({total_chunks} Sessions)"
+    else:
+        spent_hours = time_chunks_spent / 4
+        remaining_hours = time_chunks_remaining / 4
+        total_hours = total_chunks / 4
+        percentage = int((spent_hours / total_hours) * 100)
+        return f"{legacy_duration_text(remaining_hours)} ⏳ {percentage}% ({legacy_duration_text(spent_hours)}/{legacy_duration_text(total_hours)})"
+
+
+def legacy_snooze_days(snooze_until):
+    if snooze_until is None:
+        return None
+    now = datetime.now(timezone.utc)
+    days_diff = (snooze_until - now).days
+    if days_diff > 0:
+        return f"Aufgeschoben bis {snooze_until.strftime('%d. %B')} (+{days_diff} Tage)"
+    elif days_diff < 0:
+        return f"Aufgeschoben bis {snooze_until.strftime('%d. %B')} ({abs(days_diff)} Tage überfällig)"
+    else:
+        return f"Aufgeschoben bis {snooze_until.strftime('%d. %B')} (heute)"
+
+
+def check_equal() -> list:
+    mismatches = []
+    for minutes in range(-60, 3 * 1440 + 1):
+        hours = minutes / 60
+        if legacy_duration_text(hours) != formatting.format_duration_text(hours):
+            mismatches.append(("duration", hours))
+    for spent in range(0, 60):
+        for remaining in range(0, 60):
+            if legacy_progress_text(spent, remaining) != formatting.format_progress_text(spent, remaining):
+                mismatches.append(("progress", spent, remaining))
+    now = datetime.now(timezone.utc)
+    for hours in range(-24 * 10, 24 * 10, 7):
+        snooze = now + timedelta(hours=hours, minutes=30)
+        if legacy_snooze_days(snooze) != formatting.format_snooze_days(snooze):
+            mismatches.append(("snooze", snooze))
+    return mismatches
+
+
+def make_inputs(calls: int, seed: int):
+    """Inputs shaped like real tasks: chunk multiples, mostly small"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    durations = [rng.choice([rng.randint(0, 32), rng.randint(0, 400)]) / 4 for _ in range(calls)]
+    progress = [
+        (rng.randint(0, 24), rng.randint(0, rng.choice([8, 24, 80]))) for _ in range(calls)
+    ]
+    snoozes = [now + timedelta(days=rng.randint(-5, 14), hours=rng.randint(0, 23)) for _ in range(calls)]
+    return durations, progress, snoozes
+
+
+def timed(fn, args, runs: int, star: bool = False, reset=None) -> float:
+    """Median nanoseconds per call"""
+    timings = []
+    for _ in range(runs):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        if star:
+            for arg in args:
+                fn(*arg)
+        else:
+            for arg in args:
+                fn(arg)
+        timings.append((time.perf_counter() - start) / len(args) * 1e9)
+    return statistics.median(timings)
+
+
+def clear_caches() -> None:
+    formatting._duration_text.cache_clear()
+    formatting._progress_text.cache_clear()
+    formatting._snooze_text.cache_clear()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mismatches = check_equal()
+    if mismatches:
+        print(f"{len(mismatches)} texts differ, e.g. {mismatches[:5]}", file=sys.stderr)
+        return 1
+
+    durations, progress, snoozes = make_inputs(args.calls, args.seed)
+    rows = [
+        ("duration", legacy_duration_text, formatting.format_duration_text, durations, False),
+        ("progress", legacy_progress_text, formatting.format_progress_text, progress, True),
+        ("snooze", legacy_snooze_days, formatting.format_snooze_days, snoozes, False),
+    ]
+    print(f"{args.calls} calls per formatter, median of {args.runs} runs (ns/call)")
+    print(f"  {'formatter':<10} {'legacy':>8} {'cold':>8} {'warm':>8} {'speedup':>8}")
+    for name, legacy, current, inputs, star in rows:
+        legacy_ns = timed(legacy, inputs, args.runs, star)
+        cold_ns = timed(current, inputs, args.runs, star, reset=clear_caches)
+        warm_ns = timed(current, inputs, args.runs, star)
+        print(
+            f"  {name:<10} {legacy_ns:>8.0f} {cold_ns:>8.0f} {warm_ns:>8.0f} "
+            f"{legacy_ns / warm_ns:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Finds where validating events in worker processes beats validating them in-process.
+
+Generates event payloads shaped like /api/events responses (assist and
+mergeDetails objects included), then times, per size:
+
+- ``inline``: ``Event.from_api_data`` for every item, as without a pool
+- ``models``: ``reclaim_sdk.hydrate.hydrate`` in a warm process pool
+- ``columns``: ``hydrate_columns`` for a few fields in the same pool
+
+and prints the smallest size at which each pool variant is faster. The
+crossover depends on the number of cores; with one core it never comes.
+
+Usage:
+    python benchmarks/hydration.py
+    python benchmarks/hydration.py --processes 4 --sizes 5000 20000 80000
+"""
+
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("RECLAIM_TOKEN", "benchmark")
+
+from reclaim_sdk import hydrate as hydration
+from reclaim_sdk.resources.event import Event
+from reclaim_sdk.testing import FakeReclaim
+
+COLUMNS = ["event_start", "event_end", "task_id", "title"]
+
+
+def make_events(count: int, seed: int) -> list:
+    fake = FakeReclaim(tasks=200, events=count, seed=seed)
+    for i, event in enumerate(fake.events):
+        if i % 4 == 0:
+            event["mergeDetails"] = {"key": f"merge{i // 8}", "type": "MERGED", "sourceCalendarId": "cal"}
+    return fake.events
+
+
+def timed(fn, items: list, runs: int) -> float:
+    """Median seconds per call, each run on a fresh copy of the payload"""
+    timings = []
+    for _ in range(runs):
+        payload = copy.deepcopy(items)
+        start = time.perf_counter()
+        fn(payload)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000, 100000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    processes = max(2, args.processes)
+    # Always use the pool here, whatever the configured threshold
+    hydration.PROCESS_THRESHOLD = 0
+    events = make_events(max(args.sizes), args.seed)
+
+    # Start the workers (and their imports) before timing anything
+    start = time.perf_counter()
+    hydration.hydrate(Event, copy.deepcopy(events[:processes * 10]), processes=processes)
+    print(f"{os.cpu_count()} CPUs, pool of {processes} processes started in {time.perf_counter() - start:.2f}s")
+    print(f"  {'events':>8} {'inline':>9} {'models':>9} {'columns':>9}")
+
+    crossover = {"models": None, "columns": None}
+    for size in args.sizes:
+        items = events[:size]
+        inline = timed(lambda payload: [Event.from_api_data(item) for item in payload], items, args.runs)
+        models = timed(lambda payload: hydration.hydrate(Event, payload, processes=processes), items, args.runs)
+        columns = timed(
+            lambda payload: hydration.hydrate_columns(Event, payload, COLUMNS, processes=processes),
+            items,
+            args.runs,
+        )
+        print(f"  {size:>8} {inline * 1000:>7.0f}ms {models * 1000:>7.0f}ms {columns * 1000:>7.0f}ms")
+        for name, seconds in (("models", models), ("columns", columns)):
+            if crossover[name] is None and seconds < inline:
+                crossover[name] = size
+
+    for name, size in crossover.items():
+        verdict = f"faster from {size} events" if size else "not faster at any measured size"
+        print(f"{name}: {verdict}")
+    hydration.shutdown_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Measures cold-start import time of the API and the SDK.
+
+Each target is imported in a fresh interpreter several times and the median
+wall time is compared against a budget. The script exits with status 1 when a
+target is over budget, so it can guard deploys in CI.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 7 --api-budget-ms 800 --profile
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def measure(module: str, runs: int) -> float:
+    """Median milliseconds to import ``module`` in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # api.py configures nothing at import, but keep a token around for safety
+    env.setdefault("RECLAIM_TOKEN", "benchmark")
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(module=module)],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(result.stdout.strip()))
+    return statistics.median(timings)
+
+
+def profile(module: str, top: int) -> None:
+    """Print the slowest modules (cumulative) reported by ``-X importtime``"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.setdefault("RECLAIM_TOKEN", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, fields = line.partition(":")
+        _, cumulative, name = (part.strip() for part in fields.split("|"))
+        rows.append((int(cumulative), name))
+    rows.sort(reverse=True)
+    for cumulative, name in rows[:top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--api-budget-ms",
+        type=float,
+        default=float(os.environ.get("API_IMPORT_BUDGET_MS", 1000)),
+    )
+    parser.add_argument(
+        "--sdk-budget-ms",
+        type=float,
+        default=float(os.environ.get("SDK_IMPORT_BUDGET_MS", 500)),
+    )
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    targets = [
+        ("reclaim_sdk.resources.task", args.sdk_budget_ms),
+        ("api", args.api_budget_ms),
+    ]
+    over_budget = False
+    for module, budget in targets:
+        median = measure(module, args.runs)
+        status = "ok" if median <= budget else "OVER BUDGET"
+        print(f"{module:30s} {median:8.1f} ms  (budget {budget:.0f} ms)  {status}")
+        if args.profile:
+            profile(module, args.top)
+        over_budget = over_budget or median > budget
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Load-tests the api.py endpoints against an in-process fake Reclaim API.
+
+The SDK talks to a reclaim_sdk.testing.FakeReclaim through its httpx
+transport and the app is driven through httpx's ASGI transport, so no
+network or Reclaim account is involved. Reports p50/p95/p99 latency per
+endpoint and how many upstream calls the run cost.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --tasks 10000 --events 200000 --latency 0.05 \\
+        --concurrency 64 --requests 2000
+    python benchmarks/load_test.py --error-rate 0.05 --snapshot-max-age 0 --json
+
+With --cassette the upstream responses come from a file recorded from the
+live API (reclaim_sdk.testing.Cassette) instead of generated data, so runs
+use real payload shapes and sizes. Record it once with a real token:
+    RECLAIM_TOKEN=... python benchmarks/load_test.py --cassette cassettes/api.json --record --requests 20
+    python benchmarks/load_test.py --cassette cassettes/api.json --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from reclaim_sdk.testing import Cassette, FakeReclaim
+
+DEFAULT_ENDPOINTS = [
+    "/tasks",
+    "/tasks?status=SCHEDULED&sort=due&limit=50",
+    "/tasks?include=next_event&limit=20",
+    "/tasks/at-risk",
+    "/tasks/overdue",
+    "/tasks/upcoming",
+    "/tasks/summary",
+    "/tasks/daily",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+async def run(app, endpoints: List[str], total: int, concurrency: int):
+    timings: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(endpoints[i % len(endpoints)])
+
+    async def worker(client: httpx.AsyncClient):
+        while not queue.empty():
+            endpoint = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(endpoint)
+            timings[endpoint].append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors[endpoint] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return timings, errors, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Extra random upstream latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls failing with 503")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--endpoint", action="append", dest="endpoints", help="Endpoint to request, repeatable")
+    parser.add_argument("--cassette", help="Replay upstream responses from this cassette file instead of a fake")
+    parser.add_argument("--record", action="store_true", help="Record the cassette from the live API first")
+    parser.add_argument("--snapshot-max-age", type=float, help="Overrides TASK_SNAPSHOT_MAX_AGE")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # api.py reads its settings at import time
+    os.environ.setdefault("RECLAIM_TOKEN", "load-test")
+    if args.snapshot_max_age is not None:
+        os.environ["TASK_SNAPSHOT_MAX_AGE"] = str(args.snapshot_max_age)
+    import api
+
+    if args.cassette:
+        # Event lookups ask for date ranges relative to today
+        upstream = Cassette(
+            args.cassette,
+            mode="record" if args.record else "replay",
+            latency=args.latency,
+            jitter=args.jitter,
+            ignore_params=("start", "end"),
+            seed=args.seed,
+        )
+    else:
+        upstream = FakeReclaim(
+            tasks=args.tasks,
+            events=args.events,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+    api.upstream_transport = upstream.transport
+
+    endpoints = args.endpoints or DEFAULT_ENDPOINTS
+    timings, errors, elapsed = asyncio.run(
+        run(api.app, endpoints, args.requests, args.concurrency)
+    )
+
+    if args.cassette and args.record:
+        upstream.save()
+
+    report = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(args.requests / elapsed, 1),
+        "endpoints": {},
+        "upstream_calls": dict(sorted(upstream.calls.items())),
+        "upstream_total": upstream.total_calls,
+    }
+    for endpoint in endpoints:
+        values = sorted(timings[endpoint])
+        report["endpoints"][endpoint] = {
+            "count": len(values),
+            "errors": errors[endpoint],
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+            "max_ms": round(values[-1], 1) if values else 0.0,
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    source = f"cassette {args.cassette}" if args.cassette else f"{args.tasks} tasks / {args.events} events"
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"{source}, upstream latency "
+        f"{args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms, error rate {args.error_rate:.0%}"
+    )
+    print(f"  {elapsed:.2f}s, {report['requests_per_second']} req/s\n")
+    print(f"  {'endpoint':<45} {'count':>6} {'errors':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"  {endpoint:<45} {stats['count']:>6} {stats['errors']:>6} "
+            f"{stats['p50_ms']:>6.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms"
+        )
+    print(f"\n  upstream calls: {report['upstream_total']}")
+    for route, count in report["upstream_calls"].items():
+        print(f"    {route:<43} {count:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Compares the old and current way api.py turns tasks into a JSON body.
+
+The old path validated a TaskResponse per task and let FastAPI run
+jsonable_encoder and json.dumps over the list. The current path constructs
+the responses without validation and serializes them once with
+pydantic-core.
+
+Usage:
+    python benchmarks/serialize_tasks.py
+    python benchmarks/serialize_tasks.py --tasks 5000 --runs 5 --profile
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("RECLAIM_TOKEN", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+
+from api import (
+    TaskResponse,
+    build_task_response,
+    format_duration_text,
+    format_progress_text,
+)
+from reclaim_sdk.resources.task import Task
+
+
+def make_tasks(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            notes="Some notes" if i % 2 else None,
+            priority=["P1", "P2", "P3", "P4"][i % 4],
+            status=["NEW", "SCHEDULED", "IN_PROGRESS"][i % 3],
+            atRisk=bool(i % 3),
+            due=(now + timedelta(days=i % 14 - 7)).isoformat(),
+            snoozeUntil=(now + timedelta(days=1)).isoformat() if i % 5 == 0 else None,
+            timeChunksRequired=i % 12,
+            timeChunksSpent=i % 4,
+            timeChunksRemaining=i % 8,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def legacy_body(tasks) -> bytes:
+    """Validated models, then FastAPI's encoder and JSONResponse rendering"""
+    responses = [
+        TaskResponse(
+            id=str(task.id),
+            title=task.title,
+            notes=task.notes,
+            priority=str(task.priority) if task.priority else None,
+            status=str(task.status) if task.status else None,
+            at_risk=task.at_risk,
+            due=task.due,
+            duration=task.duration,
+            duration_text=format_duration_text(task.duration),
+            snooze_until=task.snooze_until,
+            time_chunks_spent=task.time_chunks_spent,
+            time_chunks_remaining=task.time_chunks_remaining,
+            progress_text=format_progress_text(
+                task.time_chunks_spent, task.time_chunks_remaining
+            ),
+            next_event=None,
+        )
+        for task in tasks
+    ]
+    return json.dumps(
+        jsonable_encoder(responses),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def current_body(tasks) -> bytes:
+    """Unvalidated construction and a single pydantic-core serialization"""
+    return to_json([build_task_response(task) for task in tasks])
+
+
+def timed(fn, tasks, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(tasks)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    if json.loads(legacy_body(tasks)) != json.loads(current_body(tasks)):
+        print("Serialized bodies differ", file=sys.stderr)
+        return 1
+
+    legacy = timed(legacy_body, tasks, args.runs)
+    current = timed(current_body, tasks, args.runs)
+    print(f"{args.tasks} tasks, median of {args.runs} runs")
+    print(f"  legacy  (validate + jsonable_encoder): {legacy:8.1f} ms")
+    print(f"  current (model_construct + to_json):   {current:8.1f} ms")
+    print(f"  speedup: {legacy / current:.1f}x")
+
+    if args.profile:
+        for name, fn in (("legacy", legacy_body), ("current", current_body)):
+            print(f"\n{name} profile:")
+            profiler = cProfile.Profile()
+            profiler.runcall(fn, tasks)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(12)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
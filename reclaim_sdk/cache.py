@@ -0,0 +1,197 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Locks held while a missing entry is fetched, striped by key
+_LOCK_STRIPES = 64
+_thread_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+
+def _stripe(key: str) -> int:
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:4], "big") % _LOCK_STRIPES
+
+
+class CacheEntry:
+    """Cached response bytes and the wall-clock time they were stored"""
+
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: bytes, stored_at: Optional[float] = None):
+        self.value = value
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class CacheBackend(ABC):
+    """
+    Storage for raw response bodies keyed by request.
+
+    Backends store bytes rather than parsed objects, so callers always get a
+    fresh copy and backends can share entries across processes.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, stored_at: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Serialize fetches of ``key`` so concurrent misses load it only once"""
+        with _thread_locks[_stripe(key)]:
+            yield
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe, bounded in-process LRU cache"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: bytes, stored_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = CacheEntry(value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache shared by every process on a host through one SQLite file.
+
+    Several API workers pointed at the same path see each other's entries,
+    so one worker's fetch warms all of them, and entries survive restarts.
+    The database runs in WAL mode with reads served from a memory map, and
+    ``lock()`` takes a file lock, so a key missing in all workers is fetched
+    by only one of them. Beyond ``max_entries`` the oldest entries are
+    dropped.
+
+    Use ``SQLiteCache.shared(path)`` to reuse one instance per path.
+    """
+
+    _instances: Dict[str, "SQLiteCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self, path: str, max_entries: int = 1024, mmap_size: int = 64 * 1024 * 1024
+    ):
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._lock_dir = self.path + ".locks"
+        os.makedirs(self._lock_dir, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+
+    @classmethod
+    def shared(cls, path: str) -> "SQLiteCache":
+        """The process-wide instance for ``path``"""
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not cross threads or survive a fork
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._connection().execute(
+            "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        return CacheEntry(row[0], row[1]) if row is not None else None
+
+    def set(self, key: str, value: bytes, stored_at: Optional[float] = None) -> None:
+        entry = CacheEntry(value, stored_at)
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (key, value, stored_at) VALUES (?, ?, ?)",
+            (key, sqlite3.Binary(entry.value), entry.stored_at),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % 64 == 0
+        if prune:
+            connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        if fcntl is None:
+            with super().lock(key):
+                yield
+            return
+        # flock locks belong to the open file, so they exclude other threads
+        # of this process as well as other processes
+        with open(os.path.join(self._lock_dir, f"{_stripe(key)}.lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,148 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from reclaim_sdk.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Group an API path by the service behind it, e.g. ``/api/tasks/1`` -> ``tasks``"""
+    parts = [part for part in endpoint.split("?", 1)[0].split("/") if part]
+    if parts and parts[0] == "api":
+        parts = parts[1:]
+    return parts[0] if parts else ""
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an endpoint family keeps failing.
+
+    The breaker opens after ``failure_threshold`` consecutive failures. Calls
+    slower than ``slow_call_threshold`` seconds count as failures too. While
+    open, calls are rejected with ``CircuitOpenError`` without reaching the
+    API. After ``recovery_timeout`` seconds up to ``half_open_max_calls``
+    probe calls are let through: a successful probe closes the breaker and a
+    failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        slow_call_threshold: Optional[float] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.slow_call_threshold = slow_call_threshold
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Reserve a call, raising ``CircuitOpenError`` if it must not be made"""
+        with self._lock:
+            if self.state == OPEN:
+                retry_after = self._opened_at + self.recovery_timeout - time.monotonic()
+                if retry_after > 0:
+                    raise CircuitOpenError(self.name, retry_after)
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, self.recovery_timeout)
+                self._probes += 1
+
+    def record_success(self, duration: float) -> None:
+        if self.slow_call_threshold is not None and duration > self.slow_call_threshold:
+            self.record_failure()
+            return
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"state": self.state, "failures": self.failures}
+
+
+class CircuitBreakers:
+    """One ``CircuitBreaker`` per endpoint family, created on first use"""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        family = endpoint_family(endpoint)
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    family, CircuitBreaker(family, **self.settings)
+                )
+        return breaker
+
+    def states(self) -> Dict[str, Dict[str, object]]:
+        return {name: breaker.as_dict() for name, breaker in self._breakers.items()}
+
+
+class StaleReport:
+    """Endpoints answered from the last good response inside ``served_stale()``"""
+
+    def __init__(self):
+        self.endpoints: List[str] = []
+        self.max_age = 0.0
+
+    def add(self, endpoint: str, age: float) -> None:
+        self.endpoints.append(endpoint)
+        self.max_age = max(self.max_age, age)
+
+    def __bool__(self) -> bool:
+        return bool(self.endpoints)
+
+
+_stale_report: ContextVar[Optional[StaleReport]] = ContextVar(
+    "reclaim_stale_report", default=None
+)
+
+
+@contextmanager
+def served_stale() -> Iterator[StaleReport]:
+    """Collect which responses inside the block were served from the fallback.
+
+    Example:
+        with served_stale() as stale:
+            tasks = Task.list()
+        if stale:
+            print(f"Showing data up to {stale.max_age:.0f}s old")
+    """
+    report = StaleReport()
+    token = _stale_report.set(report)
+    try:
+        yield report
+    finally:
+        _stale_report.reset(token)
+
+
+def report_stale(endpoint: str, age: float) -> None:
+    report = _stale_report.get()
+    if report is not None:
+        report.add(endpoint, age)
@@ -1,33 +1,146 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import os
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from datetime import datetime, timezone
 import httpx
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+from reclaim_sdk.cache import CacheBackend, MemoryCache, SQLiteCache
+from reclaim_sdk.circuit import CircuitBreakers, report_stale
+from reclaim_sdk.coalesce import PlannerCoalescer
 from reclaim_sdk.exceptions import (
+    CassetteMiss,
     ReclaimAPIError,
     RecordNotFound,
     InvalidRecord,
     AuthenticationError,
 )
+from reclaim_sdk.ratelimit import Priority, RateLimiter
+from reclaim_sdk.timing import phase
+from reclaim_sdk.tracing import Span, span
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _env_cache() -> Optional[CacheBackend]:
+    path = os.environ.get("RECLAIM_CACHE_PATH")
+    return SQLiteCache.shared(path) if path else None
+
+
+def _env_transport() -> Optional[httpx.BaseTransport]:
+    path = os.environ.get("RECLAIM_CASSETTE")
+    if not path:
+        return None
+    from reclaim_sdk.testing import Cassette
+
+    return Cassette.shared(path, latency=_env_float("RECLAIM_CASSETTE_LATENCY") or 0.0).transport
 
 
 class ReclaimClientConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid", arbitrary_types_allowed=True)
+
     token: str = Field(..., description="Reclaim API token")
     base_url: str = Field(
         "https://api.app.reclaim.ai", description="Reclaim API base URL"
     )
+    rate_limit: Optional[float] = Field(
+        default_factory=lambda: _env_float("RECLAIM_RATE_LIMIT"),
+        description="Maximum requests per second, shared by all threads (None disables it)",
+    )
+    rate_limit_burst: Optional[int] = Field(
+        None, description="Requests that may be sent at once after idling"
+    )
+    circuit_breaker: bool = Field(
+        True, description="Fail fast per endpoint family while the API keeps failing"
+    )
+    circuit_failure_threshold: int = Field(
+        5, description="Consecutive failures that open a circuit"
+    )
+    circuit_recovery_timeout: float = Field(
+        30.0, description="Seconds an open circuit waits before probing again"
+    )
+    circuit_half_open_max_calls: int = Field(
+        1, description="Probe calls let through while half-open"
+    )
+    circuit_slow_call_threshold: Optional[float] = Field(
+        None, description="Seconds after which a successful call counts as a failure"
+    )
+    stale_fallback: bool = Field(
+        default_factory=lambda: _env_flag("RECLAIM_STALE_FALLBACK"),
+        description="Serve the last good response to GETs the API cannot answer",
+    )
+    stale_max_age: float = Field(
+        3600.0, description="Seconds a last good response may be served for"
+    )
+    last_good_cache: Optional[CacheBackend] = Field(
+        None,
+        description="Where last good GET responses are kept (default: response_cache, else in memory)",
+    )
+    response_cache: Optional[CacheBackend] = Field(
+        default_factory=_env_cache,
+        description="Cache for GET responses, e.g. a SQLiteCache shared by several workers",
+    )
+    response_cache_ttl: float = Field(
+        default_factory=lambda: _env_float("RECLAIM_CACHE_TTL") or 10.0,
+        description="Seconds a cached GET response is served without asking the API",
+    )
+    transport: Optional[httpx.BaseTransport] = Field(
+        default_factory=_env_transport,
+        description="httpx transport for all requests, e.g. reclaim_sdk.testing.FakeReclaim().transport "
+        "(default: a Cassette for the RECLAIM_CASSETTE file, if set)",
+    )
+    planner_coalesce_window: Optional[float] = Field(
+        default_factory=lambda: _env_float("RECLAIM_PLANNER_COALESCE_WINDOW"),
+        description="Seconds log-work and add-time calls for a task are collected into one request (None disables it)",
+    )
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Client that ReclaimClient() returns inside ``client.use()`` and ``client.map()``
+_current_client: ContextVar[Optional["ReclaimClient"]] = ContextVar("reclaim_current_client", default=None)
 
 
 class ReclaimClient:
+    # The default client, returned by ReclaimClient(), and its settings
     _instance: Optional["ReclaimClient"] = None
     _config: Optional[ReclaimClientConfig] = None
+    # One client per account and base URL; configure() with other settings
+    # replaces it with a new one instead of changing a client in use
+    _clients: Dict[Tuple[str, str], "ReclaimClient"] = {}
+    _lock = threading.RLock()
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
-        return cls._instance
+        current = _current_client.get()
+        if current is not None:
+            return current
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls._create(cls._config)
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def _create(cls, config: Optional[ReclaimClientConfig]) -> "ReclaimClient":
+        client = object.__new__(cls)
+        client._config = config
+        client._initialize()
+        return client
 
     def _initialize(self) -> None:
         if self._config is None:
@@ -38,22 +151,288 @@ class ReclaimClient:
                 )
             self._config = ReclaimClientConfig(token=token)
 
+        config = self._config
         self.session = httpx.Client(
-            base_url=self._config.base_url,
-            headers={"Authorization": f"Bearer {self._config.token}"},
+            base_url=config.base_url,
+            headers={"Authorization": f"Bearer {config.token}"},
+            transport=config.transport,
+        )
+        self.rate_limiter = (
+            RateLimiter(config.rate_limit, config.rate_limit_burst)
+            if config.rate_limit
+            else None
+        )
+        self.circuit_breakers = (
+            CircuitBreakers(
+                failure_threshold=config.circuit_failure_threshold,
+                recovery_timeout=config.circuit_recovery_timeout,
+                half_open_max_calls=config.circuit_half_open_max_calls,
+                slow_call_threshold=config.circuit_slow_call_threshold,
+            )
+            if config.circuit_breaker
+            else None
+        )
+        self.response_cache = config.response_cache
+        self.last_good = (
+            (config.last_good_cache or config.response_cache or MemoryCache())
+            if config.stale_fallback
+            else None
         )
+        self.planner_coalescer = (
+            PlannerCoalescer(self, config.planner_coalesce_window)
+            if config.planner_coalesce_window
+            else None
+        )
+        # Cache keys are scoped to the account, so a cache file shared by
+        # clients with different tokens never mixes their data
+        self._cache_scope = hashlib.sha256(
+            f"{config.base_url}\n{config.token}".encode("utf-8")
+        ).hexdigest()[:16]
 
     @classmethod
-    def configure(cls, token: str, base_url: Optional[str] = None) -> "ReclaimClient":
-        """Configure the ReclaimClient with the given token and optional base URL."""
-        config = ReclaimClientConfig(token=token)
-        cls._config = config
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        cls._instance._initialize()
-        return cls._instance
-
-    def request(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+    def configure(
+        cls, token: str, base_url: Optional[str] = None, **options: Any
+    ) -> "ReclaimClient":
+        """Configure the ReclaimClient with the given token and optional base URL.
+
+        Calling it again with the same settings keeps the existing session, so
+        long-lived processes (and warm serverless instances) reuse one
+        connection pool instead of opening a new one per call. Other settings
+        or another token get a new client, which becomes the default returned
+        by ``ReclaimClient()``; clients returned earlier keep working with
+        their own settings, so threads using different tokens can each hold
+        on to theirs (see also ``use()`` and ``map()``).
+
+        ``options`` are further ``ReclaimClientConfig`` fields, for example:
+
+        - ``rate_limit``: requests per second across all threads of the
+          process (default: ``RECLAIM_RATE_LIMIT`` env var, unset means no
+          limit). Waiting requests are served by priority lane, see
+          ``reclaim_sdk.ratelimit.priority``.
+        - ``circuit_*``: settings of the per endpoint family (tasks, events,
+          planner, ...) circuit breakers, see ``reclaim_sdk.circuit``.
+        - ``stale_fallback``: answer GETs from the last good response while
+          a circuit is open or the API fails (default:
+          ``RECLAIM_STALE_FALLBACK`` env var). ``served_stale()`` from
+          ``reclaim_sdk.circuit`` tells when that happened.
+        - ``response_cache``: serve GETs from a cache for
+          ``response_cache_ttl`` seconds. ``SQLiteCache`` shares it between
+          processes (default: ``RECLAIM_CACHE_PATH`` env var). Any other
+          request invalidates the cached responses.
+        - ``planner_coalesce_window``: seconds during which ``log_work`` and
+          ``add_time`` calls for the same task are merged into one request
+          (default: ``RECLAIM_PLANNER_COALESCE_WINDOW`` env var), see
+          ``reclaim_sdk.coalesce``.
+        - ``transport``: httpx transport for all requests (default: with
+          ``RECLAIM_CASSETTE`` set, a ``reclaim_sdk.testing.Cassette`` that
+          records to or replays that file).
+        """
+        config = ReclaimClientConfig(token=token, **options)
+        if base_url:
+            config.base_url = base_url
+        key = (config.base_url, config.token)
+        replaced = None
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None or client._config != config or client.session.is_closed:
+                replaced = client
+                client = cls._create(config)
+                cls._clients[key] = client
+            cls._instance = client
+            cls._config = config
+        # Calls still collected by the replaced client go out first
+        coalescer = replaced.planner_coalescer if replaced is not None else None
+        if coalescer is not None and not replaced.session.is_closed:
+            coalescer.flush()
+        return client
+
+    @contextmanager
+    def use(self) -> Iterator["ReclaimClient"]:
+        """Make ``ReclaimClient()`` return this client inside the block, in this thread or task only"""
+        token = _current_client.set(self)
+        try:
+            yield self
+        finally:
+            _current_client.reset(token)
+
+    def _call(self, fn: Callable[[T], R], item: T) -> R:
+        _current_client.set(self)
+        return fn(item)
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: int = 8,
+        return_exceptions: bool = True,
+    ) -> List[Union[R, Exception]]:
+        """Call ``fn`` for every item on up to ``max_workers`` threads.
+
+        Results are returned in the order of ``items``. An item whose call
+        raised gets the exception in its place; with
+        ``return_exceptions=False`` the first failure (in item order) is
+        raised instead and items that have not started yet are skipped.
+
+        Each call runs in a copy of the caller's context in which
+        ``ReclaimClient()`` is this client, so resource methods used by
+        ``fn`` pick it up without passing it around, and the caller's
+        rate-limit lane, timings and tracing spans carry over:
+
+            tasks = client.map(Task.get, task_ids, max_workers=4)
+            failed = [t for t in tasks if isinstance(t, Exception)]
+        """
+        items = list(items)
+        if not items:
+            return []
+        context = copy_context()
+        results: List[Union[R, Exception]] = []
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(items))), thread_name_prefix="reclaim-map"
+        ) as executor:
+            futures = [
+                executor.submit(context.copy().run, self._call, fn, item) for item in items
+            ]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    results.append(e)
+        return results
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        priority: Optional[Priority] = None,
+        raw: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Send a request and return the decoded JSON response, or with ``raw``
+        the response body as bytes, for callers that validate it themselves.
+        """
+        with span(
+            "reclaim.request",
+            method=method.upper(),
+            endpoint=endpoint,
+            params=len(kwargs.get("params") or ()),
+        ) as current:
+            data = self._cached_request(method, endpoint, priority, current, raw, **kwargs)
+            if isinstance(data, list):
+                current.set_attribute("items", len(data))
+            return data
+
+    def _cached_request(
+        self,
+        method: str,
+        endpoint: str,
+        priority: Optional[Priority],
+        current: Span,
+        raw: bool,
+        **kwargs: Any,
+    ) -> Any:
+        cache_key = None
+        if method.upper() == "GET" and (
+            self.response_cache is not None or self.last_good is not None
+        ):
+            cache_key = self._cache_key(endpoint, kwargs.get("params"))
+        if cache_key is None or self.response_cache is None:
+            return self._request(method, endpoint, cache_key, priority, raw, **kwargs)
+
+        cached = self._cached_response(cache_key, raw)
+        if cached is not None:
+            current.set_attribute("cache", "hit")
+            return cached
+        # Concurrent misses in this and other processes wait for one fetch
+        with self.response_cache.lock(cache_key):
+            cached = self._cached_response(cache_key, raw)
+            if cached is not None:
+                current.set_attribute("cache", "hit")
+                return cached
+            return self._request(method, endpoint, cache_key, priority, raw, **kwargs)
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        cache_key: Optional[str],
+        priority: Optional[Priority],
+        raw: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        fallback_key = cache_key if self.last_good is not None else None
+
+        breaker = None
+        if self.circuit_breakers is not None:
+            breaker = self.circuit_breakers.for_endpoint(endpoint)
+            try:
+                breaker.before_call()
+            except ReclaimAPIError as e:
+                return self._fallback(fallback_key, endpoint, e, raw)
+
+        try:
+            if self.rate_limiter is not None:
+                with phase("throttle"):
+                    self.rate_limiter.acquire(priority)
+
+            started = time.monotonic()
+            requested_at = time.time()
+            with phase("upstream"):
+                data, response = self._send(method, endpoint, raw, **kwargs)
+        except ReclaimAPIError as e:
+            self._invalidate_after(method)
+            if not self._is_upstream_failure(e):
+                if breaker is not None:
+                    breaker.record_success(time.monotonic() - started)
+                raise
+            if breaker is not None:
+                breaker.record_failure()
+            return self._fallback(fallback_key, endpoint, e, raw)
+        except Exception:
+            # Anything else (e.g. a bug in a custom transport) still has
+            # to settle the call, or a half-open probe slot is never freed
+            self._invalidate_after(method)
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        if breaker is not None:
+            breaker.record_success(time.monotonic() - started)
+        if cache_key is not None:
+            # Stored with the time the request started, so a response that
+            # raced with a write is never treated as newer than that write
+            if self.response_cache is not None:
+                self.response_cache.set(cache_key, response.content, requested_at)
+            if self.last_good is not None and self.last_good is not self.response_cache:
+                self.last_good.set(cache_key, response.content, requested_at)
+        self._invalidate_after(method)
+        return data
+
+    @property
+    def _invalidated_key(self) -> str:
+        return f"{self._cache_scope}:invalidated"
+
+    def _invalidate_after(self, method: str) -> None:
+        """Mark cached GET responses outdated after a request that may have changed data"""
+        if self.response_cache is not None and method.upper() != "GET":
+            self.response_cache.set(self._invalidated_key, b"")
+
+    def _cached_response(self, key: str, raw: bool = False) -> Any:
+        entry = self.response_cache.get(key)
+        if entry is None or entry.age > self._config.response_cache_ttl:
+            return None
+        invalidated = self.response_cache.get(self._invalidated_key)
+        if invalidated is not None and invalidated.stored_at >= entry.stored_at:
+            return None
+        return entry.value if raw else json.loads(entry.value)
+
+    def _send(
+        self, method: str, endpoint: str, raw: bool = False, **kwargs: Any
+    ) -> Tuple[Any, httpx.Response]:
         if "json" in kwargs:
             kwargs["content"] = json.dumps(
                 kwargs.pop("json"), default=self._datetime_encoder
@@ -69,27 +448,63 @@ class ReclaimClient:
                 and response.status_code in (204, 200)
                 and not response.content
             ):
-                return {}
-            return response.json()
+                return {}, response
+            if raw:
+                return response.content, response
+            return response.json(), response
         except httpx.HTTPStatusError as e:
             error_data = (
                 e.response.json() if e.response.content else {"message": str(e)}
             )
-            if e.response.status_code == 401:
+            status_code = e.response.status_code
+            if status_code == 401:
                 raise AuthenticationError(
-                    f"Authentication failed: {error_data.get('message')}"
+                    f"Authentication failed: {error_data.get('message')}",
+                    status_code=status_code,
+                )
+            elif status_code == 404:
+                raise RecordNotFound(
+                    f"Resource not found: {endpoint}", status_code=status_code
+                )
+            elif status_code in (400, 422):
+                raise InvalidRecord(
+                    f"Invalid data: {error_data.get('message')}",
+                    status_code=status_code,
                 )
-            elif e.response.status_code == 404:
-                raise RecordNotFound(f"Resource not found: {endpoint}")
-            elif e.response.status_code in (400, 422):
-                raise InvalidRecord(f"Invalid data: {error_data.get('message')}")
             else:
-                raise ReclaimAPIError(f"API error: {error_data.get('message')}")
+                raise ReclaimAPIError(
+                    f"API error: {error_data.get('message')}", status_code=status_code
+                )
         except httpx.RequestError as e:
             raise ReclaimAPIError(f"Request failed: {str(e)}")
         except json.JSONDecodeError:
             raise ReclaimAPIError("Invalid JSON response from API")
 
+    @staticmethod
+    def _is_upstream_failure(error: ReclaimAPIError) -> bool:
+        """Whether an error means the API is unhealthy rather than the request wrong"""
+        if isinstance(error, (RecordNotFound, InvalidRecord, AuthenticationError, CassetteMiss)):
+            return False
+        status_code = error.status_code
+        return status_code is None or status_code >= 500 or status_code == 429
+
+    def _cache_key(self, endpoint: str, params: Any) -> str:
+        key = f"{self._cache_scope}:{endpoint}"
+        if not params:
+            return key
+        items = params.items() if isinstance(params, dict) else params
+        return f"{key}?{httpx.QueryParams(sorted(items))}"
+
+    def _fallback(
+        self, key: Optional[str], endpoint: str, error: ReclaimAPIError, raw: bool = False
+    ) -> Any:
+        """Answer from the last good response for ``key``, or re-raise ``error``"""
+        entry = self.last_good.get(key) if key is not None else None
+        if entry is None or entry.age > self._config.stale_max_age:
+            raise error
+        report_stale(endpoint, entry.age)
+        return entry.value if raw else json.loads(entry.value)
+
     @staticmethod
     def _datetime_encoder(obj: Any) -> str:
         if isinstance(obj, datetime):
@@ -101,6 +516,9 @@ class ReclaimClient:
     def get(self, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
         return self.request("GET", endpoint, **kwargs)
 
+    def get_raw(self, endpoint: str, **kwargs: Any) -> bytes:
+        return self.request("GET", endpoint, raw=True, **kwargs)
+
     def post(self, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
         return self.request("POST", endpoint, **kwargs)
 
@@ -0,0 +1,136 @@
+import atexit
+import contextvars
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from reclaim_sdk.tracing import span
+
+if TYPE_CHECKING:
+    from reclaim_sdk.client import ReclaimClient
+
+# Planner actions whose minutes add up when sent as one request
+COALESCED_ACTIONS = ("log-work", "add-time")
+
+# Window timers are daemon threads, so windows still open when the
+# interpreter exits are sent from here instead of being lost
+_live_coalescers: "weakref.WeakSet[PlannerCoalescer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    for coalescer in list(_live_coalescers):
+        coalescer.flush()
+
+
+class _Pending:
+    """Planner calls for one task collected during a window"""
+
+    __slots__ = ("action", "task_id", "params", "minutes", "calls", "future", "context", "timer")
+
+    def __init__(self, action: str, task_id: int, params: Dict, context: contextvars.Context):
+        self.action = action
+        self.task_id = task_id
+        self.params = params
+        self.minutes = 0
+        self.calls = 0
+        self.future: Future = Future()
+        self.context = context
+        self.timer: Optional[threading.Timer] = None
+
+
+class PlannerCoalescer:
+    """
+    Merges ``log-work`` and ``add-time`` calls for the same task made within
+    ``window`` seconds into one planner request.
+
+    The first call for a task opens a window; calls arriving before it
+    closes add their minutes, provided their other parameters (such as the
+    ``end`` of logged work) are the same. All of them get the same future,
+    resolved with the API response of the combined request, or failed with
+    its error. The request runs in the context of the first call, so its
+    rate-limit lane and timings apply.
+
+    Enabled with ``ReclaimClient.configure(planner_coalesce_window=0.2)``,
+    which routes ``Task.log_work`` and ``Task.add_time`` through
+    ``ReclaimClient().planner_coalescer``. Those methods block until the
+    window closes, so calls coalesce when they come from several threads;
+    a single thread can use ``submit()`` directly and wait later:
+
+        coalescer = ReclaimClient().planner_coalescer
+        futures = [coalescer.submit("log-work", task.id, {"minutes": 15}) for _ in range(4)]
+        task = Task.from_api_data(futures[-1].result()["taskOrHabit"])
+
+    Windows still open when the interpreter exits are sent at exit.
+    """
+
+    def __init__(self, client: "ReclaimClient", window: float):
+        self.client = client
+        self.window = window
+        self.requests = 0
+        self.calls = 0
+        self._pending: Dict[Tuple, _Pending] = {}
+        self._lock = threading.Lock()
+        _live_coalescers.add(self)
+
+    @staticmethod
+    def accepts(action: str, params: Optional[Dict]) -> bool:
+        return action in COALESCED_ACTIONS and bool(params) and "minutes" in params
+
+    def submit(self, action: str, task_id: int, params: Dict) -> Future:
+        """Queue a planner call; the future resolves to the API response"""
+        if not self.accepts(action, params):
+            raise ValueError(f"Cannot coalesce {action} with parameters {params}")
+        others = {key: value for key, value in params.items() if key != "minutes"}
+        key = (action, task_id, tuple(sorted(others.items())))
+        with self._lock:
+            self.calls += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = _Pending(action, task_id, others, contextvars.copy_context())
+                pending.timer = threading.Timer(self.window, self._send, (key,))
+                pending.timer.daemon = True
+                self._pending[key] = pending
+                pending.timer.start()
+            pending.minutes += params["minutes"]
+            pending.calls += 1
+            return pending.future
+
+    def flush(self) -> None:
+        """Send every open window now"""
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            self._send(key)
+
+    def _send(self, key: Tuple) -> None:
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                return
+            self.requests += 1
+        if pending.timer is not None:
+            pending.timer.cancel()
+        pending.context.run(self._request, pending)
+
+    def _request(self, pending: _Pending) -> None:
+        params = {**pending.params, "minutes": pending.minutes}
+        try:
+            with span(
+                f"planner.{pending.action}",
+                endpoint="/api/planner",
+                task_id=pending.task_id,
+                coalesced=pending.calls,
+            ):
+                response = self.client.post(
+                    f"/api/planner/{pending.action}/task/{pending.task_id}", params=params
+                )
+        except Exception as e:
+            pending.future.set_exception(e)
+        else:
+            pending.future.set_result(response)
+
+    def stats(self) -> Dict[str, int]:
+        """Calls received and requests sent for them"""
+        with self._lock:
+            return {"calls": self.calls, "requests": self.requests, "open": len(self._pending)}
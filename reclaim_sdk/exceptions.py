@@ -1,6 +1,13 @@
+from typing import Optional
+
+
 class ReclaimAPIError(Exception):
     """Base exception for Reclaim API errors"""
 
+    def __init__(self, *args, status_code: Optional[int] = None):
+        super().__init__(*args)
+        self.status_code = status_code
+
 
 class RecordNotFound(ReclaimAPIError):
     """Raised when a requested resource is not found"""
@@ -12,3 +19,25 @@ class InvalidRecord(ReclaimAPIError):
 
 class AuthenticationError(ReclaimAPIError):
     """Raised when there's an authentication problem"""
+
+
+class CircuitOpenError(ReclaimAPIError):
+    """Raised without calling the API while an endpoint family keeps failing"""
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__(
+            f"Circuit open for '{family}' endpoints, retry in {retry_after:.1f}s"
+        )
+        self.family = family
+        self.retry_after = retry_after
+
+
+class CassetteMiss(ReclaimAPIError):
+    """
+    Raised by a replaying ``reclaim_sdk.testing.Cassette`` for a request it
+    has no recorded response for.
+
+    It always reaches the caller: it does not count as a failure for the
+    circuit breaker and is never answered from the last good response, so
+    one missing request cannot change the results of others.
+    """
@@ -0,0 +1,120 @@
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Reclaim schedules in 15-minute chunks
+CHUNK_MINUTES = 15
+
+# Chunk counts whose texts are computed at import: durations up to 48h and
+# progress up to 4h spent/remaining cover most tasks without a cache miss
+DURATION_TABLE_CHUNKS = 192
+PROGRESS_TABLE_CHUNKS = 16
+
+# Other inputs are cached as they come up, up to this many each
+FORMAT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _duration_text(total_minutes: int) -> str:
+    if total_minutes < 60:
+        return f"{total_minutes} min"
+    elif total_minutes == 60:
+        return "1h"
+    elif total_minutes < 1440:  # Less than 24 hours
+        hours = total_minutes // 60
+        minutes = total_minutes % 60
+        if minutes == 0:
+            return f"{hours}h"
+        else:
+            return f"{hours}h {minutes}min"
+    else:  # 24 hours or more
+        days = total_minutes // 1440
+        remaining_minutes = total_minutes % 1440
+        hours = remaining_minutes // 60
+        minutes = remaining_minutes % 60
+
+        if hours == 0 and minutes == 0:
+            return f"{days}d"
+        elif minutes == 0:
+            return f"{days}d {hours}h"
+        else:
+            return f"{days}d {hours}h {minutes}min"
+
+
+def format_duration_text(duration_hours: Optional[float]) -> Optional[str]:
+    """Convert duration from hours to human-readable text format"""
+    if duration_hours is None:
+        return None
+    total_minutes = int(duration_hours * 60)
+    text = _DURATION_TABLE.get(total_minutes)
+    return text if text is not None else _duration_text(total_minutes)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE, typed=True)
+def _progress_text(time_chunks_spent: int, time_chunks_remaining: int) -> Optional[str]:
+    if time_chunks_spent == 0 and time_chunks_remaining == 0:
+        return None
+
+    total_chunks = time_chunks_spent + time_chunks_remaining
+
+    if time_chunks_spent == 0:
+        # Nothing done yet - show sessions only if > 1
+        total_hours = time_chunks_remaining / 4
+        if total_chunks > 1:
+            return f"{format_duration_text(total_hours)} ⏳ ({total_chunks} Sessions)"
+        else:
+            return f"{format_duration_text(total_hours)} ⏳"
+    elif time_chunks_remaining == 0:
+        # All done - always show sessions
+        return f"✅ ({total_chunks} Sessions)"
+    else:
+        # Partially done - show progress with time breakdown
+        spent_hours = time_chunks_spent / 4
+        remaining_hours = time_chunks_remaining / 4
+        total_hours = total_chunks / 4
+
+        percentage = int((spent_hours / total_hours) * 100)
+
+        return f"{format_duration_text(remaining_hours)} ⏳ {percentage}% ({format_duration_text(spent_hours)}/{format_duration_text(total_hours)})"
+
+
+def format_progress_text(time_chunks_spent: Optional[int], time_chunks_remaining: Optional[int]) -> Optional[str]:
+    """Format progress as clean display without brackets and duplication"""
+    if time_chunks_spent is None or time_chunks_remaining is None:
+        return None
+    # Floats hash like the ints of the table but render differently
+    if type(time_chunks_spent) is int and type(time_chunks_remaining) is int:
+        key = (time_chunks_spent, time_chunks_remaining)
+        if key in _PROGRESS_TABLE:
+            return _PROGRESS_TABLE[key]
+    return _progress_text(time_chunks_spent, time_chunks_remaining)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _snooze_text(day: date, days_diff: int) -> str:
+    if days_diff > 0:
+        return f"Aufgeschoben bis {day.strftime('%d. %B')} (+{days_diff} Tage)"
+    elif days_diff < 0:
+        return f"Aufgeschoben bis {day.strftime('%d. %B')} ({abs(days_diff)} Tage überfällig)"
+    else:
+        return f"Aufgeschoben bis {day.strftime('%d. %B')} (heute)"
+
+
+def format_snooze_days(snooze_until: Optional[datetime]) -> Optional[str]:
+    """Format snooze information with days postponed"""
+    if snooze_until is None:
+        return None
+    days_diff = (snooze_until - datetime.now(timezone.utc)).days
+    return _snooze_text(snooze_until.date(), days_diff)
+
+
+_DURATION_TABLE: Dict[int, str] = {
+    chunks * CHUNK_MINUTES: _duration_text.__wrapped__(chunks * CHUNK_MINUTES)
+    for chunks in range(DURATION_TABLE_CHUNKS + 1)
+}
+
+_PROGRESS_TABLE: Dict[Tuple[int, int], Optional[str]] = {
+    (spent, remaining): _progress_text.__wrapped__(spent, remaining)
+    for spent in range(PROGRESS_TABLE_CHUNKS + 1)
+    for remaining in range(PROGRESS_TABLE_CHUNKS + 1)
+}
@@ -0,0 +1,189 @@
+import atexit
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+from reclaim_sdk.client import ReclaimClient
+from reclaim_sdk.resources.base import list_adapter
+from reclaim_sdk.timing import phase
+from reclaim_sdk.tracing import span
+
+if TYPE_CHECKING:
+    from reclaim_sdk.resources.base import BaseResource
+
+T = TypeVar("T", bound="BaseResource")
+
+# Responses with fewer items are validated in-process: below this, starting
+# the work in other processes and pickling the results back costs more than
+# it saves (measure with benchmarks/hydration.py)
+PROCESS_THRESHOLD = int(os.environ.get("RECLAIM_HYDRATE_THRESHOLD", "20000"))
+
+# Items sent to a worker process at a time
+CHUNK_SIZE = int(os.environ.get("RECLAIM_HYDRATE_CHUNK_SIZE", "2500"))
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _workers(processes: Optional[int], count: int) -> int:
+    """Worker processes for ``count`` items, 0 meaning in-process"""
+    if processes is None:
+        value = os.environ.get("RECLAIM_HYDRATE_PROCESSES")
+        processes = int(value) if value else 1
+    if processes == 0:
+        processes = os.cpu_count() or 1
+    if processes <= 1 or count < PROCESS_THRESHOLD:
+        return 0
+    return processes
+
+
+def _pool(processes: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(processes)
+        if pool is None:
+            # Workers are spawned rather than forked: forking a process that
+            # runs threads (connection pools, timers) can deadlock the child
+            pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+            _pools[processes] = pool
+        return pool
+
+
+def shutdown_pools() -> None:
+    """Stop the worker processes; the next large response starts new ones"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def _chunks(items: Sequence[Dict], processes: int) -> List[Sequence[Dict]]:
+    # At least one chunk per worker, so small-but-eligible lists still spread
+    size = max(1, min(CHUNK_SIZE, -(-len(items) // processes)))
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _validate(cls: Type[T], items: Sequence[Dict]) -> List[T]:
+    # No client in the worker: it would need configuring there, and the
+    # caller attaches its own
+    return list_adapter(cls).validate_python(items, context={"client": None})
+
+
+def _rows(cls: Type[T], items: Sequence[Dict]) -> List[Tuple[tuple, int]]:
+    # Pickled models are about as expensive to load in the parent as to
+    # validate; tuples of field values load several times faster. Which
+    # fields were set travels as a bitmask over ``model_fields``
+    fields = list(cls.model_fields)
+    positions = {name: 1 << position for position, name in enumerate(fields)}
+    rows = []
+    for model in _validate(cls, items):
+        values = model.__dict__
+        mask = 0
+        for name in model.__pydantic_fields_set__:
+            mask |= positions[name]
+        rows.append((tuple(values[name] for name in fields), mask))
+    return rows
+
+
+def _from_rows(cls: Type[T], rows: Iterable[Tuple[tuple, int]], client) -> List[T]:
+    # Sets what model_construct() sets, without applying every field's
+    # default again, which costs ten times as much per model
+    fields = list(cls.model_fields)
+    fields_sets: Dict[int, frozenset] = {}
+    new = object.__new__
+    set_attribute = object.__setattr__
+    models = []
+    for values, mask in rows:
+        fields_set = fields_sets.get(mask)
+        if fields_set is None:
+            fields_set = frozenset(name for position, name in enumerate(fields) if mask >> position & 1)
+            fields_sets[mask] = fields_set
+        model = new(cls)
+        set_attribute(model, "__dict__", dict(zip(fields, values)))
+        set_attribute(model, "__pydantic_fields_set__", set(fields_set))
+        set_attribute(model, "__pydantic_extra__", None)
+        set_attribute(model, "__pydantic_private__", {"_client": client})
+        models.append(model)
+    return models
+
+
+def _columns(cls: Type[T], items: Sequence[Dict], fields: Sequence[str]) -> Dict[str, list]:
+    models = _validate(cls, items)
+    return {name: [getattr(model, name) for model in models] for name in fields}
+
+
+def hydrate(
+    cls: Type[T],
+    items: Sequence[Dict],
+    processes: Optional[int] = None,
+    client: Optional[ReclaimClient] = None,
+) -> List[T]:
+    """
+    ``cls.from_api_data`` for every item, bound to ``client`` (default:
+    ``ReclaimClient()``).
+
+    With ``processes`` greater than 1 (default: ``RECLAIM_HYDRATE_PROCESSES``,
+    0 for one per CPU) and at least ``PROCESS_THRESHOLD`` items, the items
+    are validated in chunks by a pool of worker processes.
+    """
+    if client is None:
+        client = ReclaimClient()
+    workers = _workers(processes, len(items))
+    with phase("hydrate"), span("hydrate", resource=cls.__name__, items=len(items), processes=workers):
+        if not workers:
+            return list_adapter(cls).validate_python(items, context={"client": client})
+        rows = _pool(workers).map(_rows, repeat(cls), _chunks(items, workers))
+        return _from_rows(cls, chain.from_iterable(rows), client)
+
+
+def hydrate_json(
+    cls: Type[T],
+    content: bytes,
+    processes: Optional[int] = None,
+    client: Optional[ReclaimClient] = None,
+) -> List[T]:
+    """
+    ``hydrate()`` for a response body: validated straight from the bytes
+    with ``cls.from_api_json``, unless a process pool may be used, which
+    needs the items decoded to split them up.
+    """
+    if _workers(processes, PROCESS_THRESHOLD):
+        return hydrate(cls, json.loads(content), processes=processes, client=client)
+    with phase("hydrate"), span("hydrate", resource=cls.__name__, processes=0) as current:
+        models = cls.from_api_json(content, client)
+        current.set_attribute("items", len(models))
+        return models
+
+
+def hydrate_columns(
+    cls: Type[T],
+    items: Sequence[Dict],
+    fields: Optional[Sequence[str]] = None,
+    processes: Optional[int] = None,
+) -> Dict[str, list]:
+    """
+    The validated values of ``fields`` (default: all) as one list per field.
+
+    Lists of plain values are much cheaper to send back from a worker
+    process than models, so this gains more from a process pool than
+    ``hydrate()`` when the caller only needs some fields.
+    """
+    if fields is None:
+        fields = [name for name, field in cls.model_fields.items() if not field.exclude]
+    fields = list(fields)
+    workers = _workers(processes, len(items))
+    with phase("hydrate"), span("hydrate", resource=cls.__name__, items=len(items), processes=workers):
+        if not workers:
+            return _columns(cls, items, fields)
+        chunks = _chunks(items, workers)
+        columns: Dict[str, list] = {name: [] for name in fields}
+        for part in _pool(workers).map(_columns, repeat(cls), chunks, repeat(fields)):
+            for name in fields:
+                columns[name].extend(part[name])
+        return columns
@@ -0,0 +1,98 @@
+from bisect import bisect_right
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+from reclaim_sdk.resources.task import Task, TaskPriority, TaskStatus
+
+# Bucket order of ``TaskIndex.by_priority``; tasks without a priority go last
+PRIORITIES = (TaskPriority.P1, TaskPriority.P2, TaskPriority.P3, TaskPriority.P4, None)
+
+INACTIVE_STATUSES = (TaskStatus.ARCHIVED, TaskStatus.CANCELLED)
+
+
+class TaskIndex:
+    """
+    Tasks grouped by due date and priority in a single pass.
+
+    ``tasks`` keeps all tasks; archived and cancelled ones are left out of
+    every bucket. Buckets keep the order of ``tasks`` except ``upcoming``,
+    which is sorted by due date:
+
+    - ``overdue``: due before ``now``
+    - ``at_risk``: flagged at risk, overdue or not
+    - ``at_risk_upcoming``: flagged at risk and due at or after ``now``
+    - ``upcoming``: due at or after ``now``, earliest first
+    - ``today``, ``tomorrow``, ``this_week``: the upcoming tasks due within
+      0, 1 and at most 7 whole days, each a prefix or slice of ``upcoming``
+
+    ``ranked()`` returns a bucket ordered by priority without sorting it.
+    """
+
+    BUCKETS = ("overdue", "at_risk", "at_risk_upcoming")
+
+    def __init__(self, tasks: Iterable[Task], now: Optional[datetime] = None):
+        self.now = now or datetime.now(timezone.utc)
+        self.tasks: List[Task] = list(tasks)
+        self.active: List[Task] = []
+        self.overdue: List[Task] = []
+        self.at_risk: List[Task] = []
+        self.at_risk_upcoming: List[Task] = []
+        self._groups: Dict[str, Dict[Optional[TaskPriority], List[Task]]] = {
+            name: {priority: [] for priority in PRIORITIES} for name in ("active",) + self.BUCKETS
+        }
+        groups = [self._groups[name] for name in ("active",) + self.BUCKETS]
+        # Due dates are compared as POSIX timestamps: comparing aware
+        # datetimes calls utcoffset() on both sides every time
+        now = self.now.timestamp()
+        upcoming = []
+        for task in self.tasks:
+            if task.status in INACTIVE_STATUSES:
+                continue
+            priority = task.priority if task.priority in PRIORITIES else None
+            active, overdue, at_risk, at_risk_upcoming = (group[priority] for group in groups)
+            self.active.append(task)
+            active.append(task)
+            if task.due is not None:
+                due = task.due.timestamp()
+                if due < now:
+                    self.overdue.append(task)
+                    overdue.append(task)
+                else:
+                    upcoming.append((due, len(upcoming), task))
+                    if task.at_risk:
+                        self.at_risk_upcoming.append(task)
+                        at_risk_upcoming.append(task)
+            if task.at_risk:
+                self.at_risk.append(task)
+                at_risk.append(task)
+
+        upcoming.sort()
+        self.upcoming: List[Task] = [task for _, _, task in upcoming]
+        # Whole days until due, aligned with ``upcoming`` and non-decreasing,
+        # so every day bucket is a contiguous run of it
+        self.days_until: List[int] = [int((due - now) // 86400) for due, _, _ in upcoming]
+        today = bisect_right(self.days_until, 0)
+        tomorrow = bisect_right(self.days_until, 1)
+        this_week = bisect_right(self.days_until, 7)
+        self.today = self.upcoming[:today]
+        self.tomorrow = self.upcoming[today:tomorrow]
+        self.this_week = self.upcoming[:this_week]
+
+    def by_priority(self, bucket: str = "active") -> Dict[Optional[TaskPriority], List[Task]]:
+        """The tasks of ``bucket`` (``active`` or one of ``BUCKETS``) per priority, P1 first"""
+        return self._groups[bucket]
+
+    def ranked(self, bucket: str) -> List[Task]:
+        """The tasks of ``bucket`` ordered by priority, ties in snapshot order"""
+        return list(chain.from_iterable(self._groups[bucket].values()))
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "active": len(self.active),
+            "overdue": len(self.overdue),
+            "at_risk": len(self.at_risk),
+            "upcoming": len(self.upcoming),
+            "today": len(self.today),
+            "tomorrow": len(self.tomorrow),
+            "this_week": len(self.this_week),
+        }
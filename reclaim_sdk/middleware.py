@@ -0,0 +1,296 @@
+import hashlib
+import json
+import logging
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from reclaim_sdk.timing import record_timings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag over a response body"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+# Headers that describe the omitted body and must not be sent with a 304
+_ENTITY_HEADERS = (b"content-length", b"content-type", b"content-encoding")
+
+
+class ETagMiddleware:
+    """
+    Adds ETags to buffered GET responses and answers matching conditional requests with 304.
+
+    Responses that already carry an ETag keep it, so endpoints can derive it
+    from the data they were built from. Streaming responses pass through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if start_message["status"] != 200 or message.get("more_body", False):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            etag = headers.get("etag")
+            if etag is None:
+                etag = body_etag(body)
+                headers["ETag"] = etag
+
+            if etag_matches(if_none_match, etag):
+                raw = [
+                    (name, value)
+                    for name, value in start_message["headers"]
+                    if name.lower() not in _ENTITY_HEADERS
+                ]
+                await send({"type": "http.response.start", "status": 304, "headers": raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli (when installed) or gzip.
+
+    Only bodies of at least ``minimum_size`` bytes are compressed. Server-Sent
+    Events and responses that are already encoded pass through untouched, and
+    strong ETags are weakened because the encoded bytes differ from the
+    representation they were computed over.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    @staticmethod
+    def _negotiate(accept_encoding: str) -> Optional[str]:
+        accepted = set()
+        for part in accept_encoding.split(","):
+            token, _, params = part.partition(";")
+            params = params.replace(" ", "")
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) == 0:
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(token.strip().lower())
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.stream = None
+        self.passthrough = False
+
+    def _new_stream(self):
+        if self.encoding == "br":
+            return _BrotliStream(self.middleware.brotli_quality)
+        return _GzipStream(self.middleware.gzip_level)
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            self.start_message["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and not content_type.startswith("text/event-stream")
+        )
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not self._eligible(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.stream = self._new_stream()
+            self._mark_encoded(headers)
+            if not more_body:
+                compressed = self.stream.compress(body) + self.stream.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            del headers["Content-Length"]
+            await self._send(self.start_message)
+
+        chunk = self.stream.compress(body)
+        if not more_body:
+            chunk += self.stream.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+
+class ServerTimingMiddleware:
+    """
+    Reports where each request spent its time in a ``Server-Timing`` header.
+
+    Phases timed with ``reclaim_sdk.timing.phase()`` while the request is
+    handled, in its task or in threadpool work started from it, are listed
+    with their duration and count, followed by the total so far. With
+    ``log`` set, one JSON line per request with the final totals is logged
+    to the ``reclaim_sdk.timing`` logger.
+    """
+
+    def __init__(self, app: ASGIApp, log: bool = False) -> None:
+        self.app = app
+        self.logger = logging.getLogger("reclaim_sdk.timing") if log else None
+        if self.logger is not None and not self.logger.handlers:
+            self.logger.addHandler(logging.StreamHandler())
+            self.logger.setLevel(logging.INFO)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+        with record_timings() as timings:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    MutableHeaders(scope=message).append("Server-Timing", timings.header())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if self.logger is not None:
+                    record = {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "query": scope.get("query_string", b"").decode("latin-1"),
+                        "status": status,
+                        **timings.as_dict(),
+                    }
+                    self.logger.info(json.dumps(record))
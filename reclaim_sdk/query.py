@@ -0,0 +1,237 @@
+import heapq
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from reclaim_sdk.index import INACTIVE_STATUSES, TaskIndex
+from reclaim_sdk.resources.task import Task, TaskPriority, TaskStatus
+from reclaim_sdk.timing import phase
+
+
+class _Descending:
+    """Inverts the ordering of one sort key component"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _sort_component(value, descending: bool) -> tuple:
+    # Tasks without a value sort last in either direction. Datetimes compare
+    # as timestamps, which skips a utcoffset() call per comparison
+    if value is None:
+        return (True,)
+    if isinstance(value, datetime):
+        value = value.timestamp()
+    return (False, _Descending(value) if descending else value)
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+class TaskQuery:
+    """
+    Chainable filters, ordering and limit over tasks.
+
+    Every method returns a new query, so a base query can be refined in
+    several directions:
+
+        open_tasks = TaskQuery(tasks).active()
+        next_up = open_tasks.due_after(now).order_by("due").limit(20).all()
+        urgent = open_tasks.priority(TaskPriority.P1).at_risk().count()
+
+    Results are the matching tasks stably sorted by ``order_by`` keys, ties
+    in source order. With a limit only the first tasks are selected with a
+    heap instead of sorting all matches.
+
+    Built on a ``TaskIndex`` instead of a list, active-only queries start
+    from the smallest index bucket their filters allow, and skip ordering
+    entirely when the bucket already is in the requested order.
+    """
+
+    def __init__(self, source: Union[Iterable[Task], TaskIndex]):
+        self._source = source if isinstance(source, TaskIndex) else list(source)
+        self._statuses: Optional[frozenset] = None
+        self._priorities: Optional[frozenset] = None
+        self._due_after: Optional[datetime] = None
+        self._due_before: Optional[datetime] = None
+        self._at_risk: Optional[bool] = None
+        self._snoozed: Optional[Tuple[bool, datetime]] = None
+        self._active = False
+        self._predicates: Tuple[Callable[[Task], bool], ...] = ()
+        self._order: Tuple[Tuple[str, bool], ...] = ()
+        self._limit: Optional[int] = None
+        self._after: Optional[tuple] = None
+
+    def _copy(self, **changes) -> "TaskQuery":
+        query = object.__new__(TaskQuery)
+        query.__dict__.update(self.__dict__)
+        for name, value in changes.items():
+            setattr(query, f"_{name}", value)
+        return query
+
+    # Filters
+
+    def status(self, *statuses: TaskStatus) -> "TaskQuery":
+        return self._copy(statuses=frozenset(statuses))
+
+    def priority(self, *priorities: Optional[TaskPriority]) -> "TaskQuery":
+        """Tasks with any of ``priorities``; ``None`` matches tasks without one"""
+        return self._copy(priorities=frozenset(priorities))
+
+    def due_after(self, moment: datetime) -> "TaskQuery":
+        """Tasks due at or after ``moment``"""
+        return self._copy(due_after=moment)
+
+    def due_before(self, moment: datetime) -> "TaskQuery":
+        """Tasks due strictly before ``moment``"""
+        return self._copy(due_before=moment)
+
+    def due_between(self, start: datetime, end: datetime) -> "TaskQuery":
+        return self._copy(due_after=start, due_before=end)
+
+    def at_risk(self, value: bool = True) -> "TaskQuery":
+        return self._copy(at_risk=value)
+
+    def snoozed(self, value: bool = True, now: Optional[datetime] = None) -> "TaskQuery":
+        """Tasks snoozed until after ``now`` (default: the index time or the current time)"""
+        if now is None:
+            now = self._source.now if isinstance(self._source, TaskIndex) else datetime.now().astimezone()
+        return self._copy(snoozed=(value, now))
+
+    def active(self) -> "TaskQuery":
+        """Leave out archived and cancelled tasks"""
+        return self._copy(active=True)
+
+    def where(self, predicate: Callable[[Task], bool]) -> "TaskQuery":
+        return self._copy(predicates=self._predicates + (predicate,))
+
+    # Ordering and selection
+
+    def order_by(self, *keys: str) -> "TaskQuery":
+        """Order by task attributes, e.g. ``order_by("priority", "-due")``.
+
+        A leading ``-`` sorts descending. Tasks without a value sort last in
+        either direction.
+        """
+        order = tuple((key.lstrip("+-"), key.startswith("-")) for key in keys)
+        return self._copy(order=order)
+
+    def limit(self, count: Optional[int]) -> "TaskQuery":
+        return self._copy(limit=count)
+
+    def after(self, values: Sequence) -> "TaskQuery":
+        """Only tasks ordered strictly after a task with these ``order_by`` values"""
+        return self._copy(after=self.key_for(values))
+
+    def sort_values(self, task: Task) -> list:
+        """The ``order_by`` attribute values of ``task``, e.g. for a cursor"""
+        return [getattr(task, name) for name, _ in self._order]
+
+    def key_for(self, values: Sequence) -> tuple:
+        return tuple(
+            _sort_component(value, descending)
+            for value, (_, descending) in zip(values, self._order)
+        )
+
+    def sort_key(self, task: Task) -> tuple:
+        return tuple(
+            _sort_component(getattr(task, name), descending)
+            for name, descending in self._order
+        )
+
+    # Execution
+
+    def _plan(self) -> Tuple[Sequence[Task], bool]:
+        """Candidate tasks and whether they already are in result order"""
+        source = self._source
+        if not isinstance(source, TaskIndex):
+            return source, not self._order
+        if not self._active:
+            return source.tasks, not self._order
+
+        now = source.now
+        due_after_now = self._due_after is not None and self._due_after >= now
+        buckets = ["active"]
+        if self._at_risk:
+            buckets.append("at_risk_upcoming" if due_after_now else "at_risk")
+        if self._due_before is not None and self._due_before <= now:
+            buckets.append("overdue")
+        bucket = min(buckets, key=lambda name: len(getattr(source, name)))
+
+        if not self._order:
+            return getattr(source, bucket), True
+        if self._order == (("priority", False),):
+            return source.ranked(bucket), True
+        # upcoming is sorted by due date, ties in snapshot order
+        if self._order == (("due", False),) and due_after_now and not self._at_risk:
+            return source.upcoming, True
+        return getattr(source, bucket), False
+
+    def _filter(self, tasks: Iterable[Task]) -> Iterator[Task]:
+        statuses = self._statuses
+        priorities = self._priorities
+        at_risk = self._at_risk
+        due_after = _timestamp(self._due_after)
+        due_before = _timestamp(self._due_before)
+        snoozed, snoozed_now = self._snoozed or (None, None)
+        for task in tasks:
+            if self._active and task.status in INACTIVE_STATUSES:
+                continue
+            if statuses is not None and task.status not in statuses:
+                continue
+            if priorities is not None and task.priority not in priorities:
+                continue
+            if at_risk is not None and task.at_risk != at_risk:
+                continue
+            if due_after is not None or due_before is not None:
+                if task.due is None:
+                    continue
+                due = task.due.timestamp()
+                if due_after is not None and due < due_after:
+                    continue
+                if due_before is not None and due >= due_before:
+                    continue
+            if snoozed is not None:
+                is_snoozed = task.snooze_until is not None and task.snooze_until > snoozed_now
+                if is_snoozed != snoozed:
+                    continue
+            if self._predicates and not all(predicate(task) for predicate in self._predicates):
+                continue
+            yield task
+
+    def __iter__(self) -> Iterator[Task]:
+        candidates, ordered = self._plan()
+        matches = self._filter(candidates)
+        if self._after is not None:
+            after = self._after
+            matches = (task for task in matches if after < self.sort_key(task))
+        if ordered:
+            return islice(matches, self._limit)
+        if self._limit is None:
+            return iter(sorted(matches, key=self.sort_key))
+        # heapq.nsmallest is stable, like sorted(...)[:limit]
+        return iter(heapq.nsmallest(self._limit, matches, key=self.sort_key))
+
+    def all(self) -> List[Task]:
+        with phase("filter"):
+            return list(self)
+
+    def first(self) -> Optional[Task]:
+        return next(iter(self.limit(1)), None)
+
+    def count(self) -> int:
+        """Number of matching tasks, ignoring ``limit``"""
+        with phase("filter"):
+            candidates, _ = self.limit(None)._plan()
+            matches = self._filter(candidates)
+            if self._after is not None:
+                return sum(1 for task in matches if self._after < self.sort_key(task))
+            return sum(1 for _ in matches)
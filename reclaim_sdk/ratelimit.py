@@ -0,0 +1,142 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Iterator, Optional
+
+
+class Priority(IntEnum):
+    """Request lanes, most urgent first"""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    BULK = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "reclaim_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    """The lane requests made from the current context are queued in"""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority(lane: Priority) -> Iterator[None]:
+    """Queue all requests made inside the block in ``lane``.
+
+    The lane is stored in a context variable, so it follows the code into
+    asyncio tasks and threadpool calls started from the block.
+
+    Example:
+        with priority(Priority.BULK):
+            for task in tasks:
+                task.log_work(30)
+    """
+    token = _current_priority.set(lane)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class LaneStats:
+    """Request count and time spent waiting for tokens in one lane"""
+
+    __slots__ = ("requests", "wait_seconds", "max_wait_seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited: float) -> None:
+        self.requests += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+        }
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread of a process, with priority lanes.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Waiting callers are
+    served strictly by lane and then in arrival order, so an interactive
+    request queued behind a thousand bulk ones gets the next free token.
+
+    Args:
+        rate: Requests per second
+        burst: Tokens that can accumulate while idle (defaults to ``rate``)
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._stats = {lane: LaneStats() for lane in Priority}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, lane: Optional[Priority] = None) -> float:
+        """Block until a token is available and return the seconds waited"""
+        if lane is None:
+            lane = current_priority()
+        started = time.monotonic()
+        ticket = (lane, next(self._sequence))
+
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    head = self._waiters[0] == ticket
+                    if head and self._tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1
+                        break
+                    # Only the head of the queue waits for the next token;
+                    # everyone else waits to be woken when the head changes
+                    self._condition.wait((1 - self._tokens) / self.rate if head else None)
+            except BaseException:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                raise
+            finally:
+                self._condition.notify_all()
+
+            waited = time.monotonic() - started
+            self._stats[lane].record(waited)
+        return waited
+
+    async def acquire_async(self, lane: Optional[Priority] = None) -> float:
+        """Like ``acquire`` without blocking the event loop"""
+        if lane is None:
+            lane = current_priority()
+        return await asyncio.to_thread(self.acquire, lane)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-lane request counts and token wait times since creation"""
+        with self._condition:
+            return {lane.name.lower(): stats.as_dict() for lane, stats in self._stats.items()}
@@ -0,0 +1,763 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from reclaim_sdk.client import ReclaimClient
+from reclaim_sdk.exceptions import (
+    AuthenticationError,
+    InvalidRecord,
+    RecordNotFound,
+    ReclaimAPIError,
+)
+from reclaim_sdk.ratelimit import Priority, priority
+from reclaim_sdk.resources.task import Task
+from reclaim_sdk.tracing import span
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Planner actions and the task status the API leaves behind
+PLANNER_STATUS = {
+    "done": "COMPLETE",
+    "start": "IN_PROGRESS",
+    "stop": "SCHEDULED",
+}
+
+# Fields a local save never sends; the API maintains them
+READ_ONLY_FIELDS = ("id", "created", "updated")
+
+# Failed sends are retried after 1, 2, 4, ... seconds, at most 5 minutes
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 300.0
+
+
+class Mutation:
+    """
+    One local change waiting to be sent to the API.
+
+    ``action`` is ``create``, ``save`` or a planner action (``done``,
+    ``start``, ``stop``, ``log-work``, ``add-time``). Tasks created locally
+    have negative ids until the API assigns one. ``base_updated`` is the
+    ``updated`` value of the task the change was made on, and save payloads
+    keep the values they replaced, both for conflict detection.
+    """
+
+    __slots__ = ("seq", "task_id", "action", "payload", "base_updated", "attempts", "not_before", "seqs")
+
+    def __init__(
+        self,
+        task_id: int,
+        action: str,
+        payload: Dict,
+        base_updated: Optional[str] = None,
+        seq: Optional[int] = None,
+        attempts: int = 0,
+        not_before: float = 0.0,
+    ):
+        self.seq = seq
+        self.task_id = task_id
+        self.action = action
+        self.payload = payload
+        self.base_updated = base_updated
+        self.attempts = attempts
+        self.not_before = not_before
+        # Queue entries this one stands for after merging
+        self.seqs: Tuple[int, ...] = (seq,) if seq is not None else ()
+
+    def merge(self, other: "Mutation") -> Optional["Mutation"]:
+        """This change followed by ``other`` as one request, or ``None`` if they cannot be sent as one"""
+        if other.task_id != self.task_id or other.action != self.action:
+            return None
+        if self.action == "save":
+            payload = {
+                "changes": {**self.payload["changes"], **other.payload["changes"]},
+                "base": {**other.payload["base"], **self.payload["base"]},
+            }
+        elif self.action == "add-time":
+            payload = {"minutes": self.payload["minutes"] + other.payload["minutes"]}
+        elif self.action == "log-work" and not self.payload.get("end") and not other.payload.get("end"):
+            payload = {"minutes": self.payload["minutes"] + other.payload["minutes"]}
+        else:
+            return None
+        merged = Mutation(
+            self.task_id,
+            self.action,
+            payload,
+            self.base_updated,
+            self.seq,
+            max(self.attempts, other.attempts),
+            max(self.not_before, other.not_before),
+        )
+        merged.seqs = self.seqs + other.seqs
+        return merged
+
+    def apply(self, data: Dict) -> None:
+        """Apply the change to the camelCase API data of its task, as the API would"""
+        if self.action == "create":
+            data.update(self.payload["data"])
+            data["id"] = self.task_id
+        elif self.action == "save":
+            data.update(self.payload["changes"])
+        elif self.action in PLANNER_STATUS:
+            data["status"] = PLANNER_STATUS[self.action]
+        elif self.action == "log-work":
+            chunks = self.payload["minutes"] // 15
+            data["timeChunksSpent"] = (data.get("timeChunksSpent") or 0) + chunks
+            data["timeChunksRemaining"] = max(0, (data.get("timeChunksRemaining") or 0) - chunks)
+        elif self.action == "add-time":
+            chunks = self.payload["minutes"] // 15
+            data["timeChunksRequired"] = (data.get("timeChunksRequired") or 0) + chunks
+            data["timeChunksRemaining"] = (data.get("timeChunksRemaining") or 0) + chunks
+
+    def __repr__(self) -> str:
+        return f"Mutation({self.action!r}, task_id={self.task_id}, seq={self.seq})"
+
+
+class Conflict:
+    """Fields of a local save that were changed differently on the server"""
+
+    __slots__ = ("mutation", "fields", "server")
+
+    def __init__(self, mutation: Mutation, fields: List[str], server: Dict):
+        self.mutation = mutation
+        self.fields = fields
+        self.server = server
+
+    def __repr__(self) -> str:
+        return f"Conflict(task_id={self.mutation.task_id}, fields={self.fields})"
+
+
+class FlushResult:
+    """What one ``TaskReplica.flush()`` did"""
+
+    def __init__(self):
+        self.sent = 0
+        self.merged = 0
+        self.created: Dict[int, int] = {}
+        self.conflicts: List[Conflict] = []
+        self.rejected: List[Tuple[Mutation, ReclaimAPIError]] = []
+        self.retrying = 0
+        self.remaining = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"FlushResult(sent={self.sent}, merged={self.merged}, conflicts={len(self.conflicts)}, "
+            f"rejected={len(self.rejected)}, retrying={self.retrying}, remaining={self.remaining})"
+        )
+
+
+class ReplicaStore(ABC):
+    """
+    Storage for a ``TaskReplica``: the last known server copy of each task
+    and the queue of local changes, in the order they were made.
+
+    Task data is kept as the camelCase dicts the API returns.
+    """
+
+    _flush_lock = threading.Lock()
+
+    @abstractmethod
+    def load_tasks(self) -> Dict[int, Dict]:
+        ...
+
+    @abstractmethod
+    def save_tasks(self, tasks: Dict[int, Dict], replace: bool = False) -> None:
+        """Store server copies; ``replace`` drops all others"""
+
+    @abstractmethod
+    def append(self, mutation: Mutation) -> Mutation:
+        """Queue ``mutation``, assigning its ``seq``"""
+
+    @abstractmethod
+    def pending(self) -> List[Mutation]:
+        ...
+
+    @abstractmethod
+    def remove(self, seqs: Iterable[int]) -> None:
+        ...
+
+    @abstractmethod
+    def retry_later(self, seqs: Iterable[int], attempts: int, not_before: float) -> None:
+        ...
+
+    @abstractmethod
+    def remap(self, old_id: int, new_id: int) -> None:
+        """Point queued changes of a locally created task at the id the API assigned"""
+
+    @abstractmethod
+    def commit_sent(
+        self, seqs: Iterable[int], tasks: Dict[int, Dict], remap: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """
+        Record changes the API accepted, all or nothing: point queued changes
+        from ``remap``'s old id to its new one, drop ``seqs`` from the queue
+        and store the server copies the API returned.
+
+        Applied one by one, a crash in between would leave the change queued
+        next to the server copy that already contains it, and send it twice.
+        """
+
+    @contextmanager
+    def flush_lock(self) -> Iterator[None]:
+        """Let only one flush send the queued changes at a time"""
+        with self._flush_lock:
+            yield
+
+
+class MemoryReplicaStore(ReplicaStore):
+    """Keeps the replica in process memory; queued changes are lost on exit"""
+
+    def __init__(self):
+        self._tasks: Dict[int, Dict] = {}
+        self._mutations: List[Mutation] = []
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def load_tasks(self) -> Dict[int, Dict]:
+        with self._lock:
+            return {task_id: dict(data) for task_id, data in self._tasks.items()}
+
+    def save_tasks(self, tasks: Dict[int, Dict], replace: bool = False) -> None:
+        with self._lock:
+            if replace:
+                self._tasks = {}
+            self._tasks.update((task_id, dict(data)) for task_id, data in tasks.items())
+
+    def append(self, mutation: Mutation) -> Mutation:
+        with self._lock:
+            mutation.seq = self._next_seq
+            mutation.seqs = (mutation.seq,)
+            self._next_seq += 1
+            self._mutations.append(self._copy(mutation))
+        return mutation
+
+    def pending(self) -> List[Mutation]:
+        with self._lock:
+            return [self._copy(mutation) for mutation in self._mutations]
+
+    def remove(self, seqs: Iterable[int]) -> None:
+        seqs = set(seqs)
+        with self._lock:
+            self._mutations = [m for m in self._mutations if m.seq not in seqs]
+
+    def retry_later(self, seqs: Iterable[int], attempts: int, not_before: float) -> None:
+        seqs = set(seqs)
+        with self._lock:
+            for mutation in self._mutations:
+                if mutation.seq in seqs:
+                    mutation.attempts = attempts
+                    mutation.not_before = not_before
+
+    def remap(self, old_id: int, new_id: int) -> None:
+        with self._lock:
+            self._remap(old_id, new_id)
+
+    def commit_sent(
+        self, seqs: Iterable[int], tasks: Dict[int, Dict], remap: Optional[Tuple[int, int]] = None
+    ) -> None:
+        seqs = set(seqs)
+        tasks = {task_id: dict(data) for task_id, data in tasks.items()}
+        with self._lock:
+            if remap is not None:
+                self._remap(*remap)
+            self._mutations = [m for m in self._mutations if m.seq not in seqs]
+            self._tasks.update(tasks)
+
+    def _remap(self, old_id: int, new_id: int) -> None:
+        for mutation in self._mutations:
+            if mutation.task_id == old_id:
+                mutation.task_id = new_id
+
+    @staticmethod
+    def _copy(mutation: Mutation) -> Mutation:
+        return Mutation(
+            mutation.task_id,
+            mutation.action,
+            json.loads(json.dumps(mutation.payload)),
+            mutation.base_updated,
+            mutation.seq,
+            mutation.attempts,
+            mutation.not_before,
+        )
+
+
+class SQLiteReplicaStore(ReplicaStore):
+    """
+    Keeps the replica in a SQLite file, so queued changes survive restarts.
+
+    Every local change is committed to the queue before it is applied, with
+    ``synchronous=FULL``, so a change the caller saw succeed is not lost if
+    the process or machine dies before it is sent. Processes sharing the
+    file share the queue; ``flush_lock()`` takes a file lock so only one of
+    them sends it at a time.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS mutations ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, task_id INTEGER NOT NULL, "
+            "action TEXT NOT NULL, payload TEXT NOT NULL, base_updated TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, not_before REAL NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not cross threads or survive a fork
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def load_tasks(self) -> Dict[int, Dict]:
+        rows = self._connection().execute("SELECT id, data FROM tasks").fetchall()
+        return {task_id: json.loads(data) for task_id, data in rows}
+
+    def save_tasks(self, tasks: Dict[int, Dict], replace: bool = False) -> None:
+        with self._transaction() as connection:
+            if replace:
+                connection.execute("DELETE FROM tasks")
+            connection.executemany(
+                "INSERT OR REPLACE INTO tasks (id, data) VALUES (?, ?)",
+                ((task_id, json.dumps(data)) for task_id, data in tasks.items()),
+            )
+
+    def append(self, mutation: Mutation) -> Mutation:
+        cursor = self._connection().execute(
+            "INSERT INTO mutations (task_id, action, payload, base_updated, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (mutation.task_id, mutation.action, json.dumps(mutation.payload), mutation.base_updated, time.time()),
+        )
+        mutation.seq = cursor.lastrowid
+        mutation.seqs = (mutation.seq,)
+        return mutation
+
+    def pending(self) -> List[Mutation]:
+        rows = self._connection().execute(
+            "SELECT seq, task_id, action, payload, base_updated, attempts, not_before "
+            "FROM mutations ORDER BY seq"
+        ).fetchall()
+        return [
+            Mutation(task_id, action, json.loads(payload), base_updated, seq, attempts, not_before)
+            for seq, task_id, action, payload, base_updated, attempts, not_before in rows
+        ]
+
+    def remove(self, seqs: Iterable[int]) -> None:
+        with self._transaction() as connection:
+            connection.executemany("DELETE FROM mutations WHERE seq = ?", ((seq,) for seq in seqs))
+
+    def retry_later(self, seqs: Iterable[int], attempts: int, not_before: float) -> None:
+        with self._transaction() as connection:
+            connection.executemany(
+                "UPDATE mutations SET attempts = ?, not_before = ? WHERE seq = ?",
+                ((attempts, not_before, seq) for seq in seqs),
+            )
+
+    def remap(self, old_id: int, new_id: int) -> None:
+        self._connection().execute(
+            "UPDATE mutations SET task_id = ? WHERE task_id = ?", (new_id, old_id)
+        )
+
+    def commit_sent(
+        self, seqs: Iterable[int], tasks: Dict[int, Dict], remap: Optional[Tuple[int, int]] = None
+    ) -> None:
+        with self._transaction() as connection:
+            if remap is not None:
+                old_id, new_id = remap
+                connection.execute(
+                    "UPDATE mutations SET task_id = ? WHERE task_id = ?", (new_id, old_id)
+                )
+            connection.executemany("DELETE FROM mutations WHERE seq = ?", ((seq,) for seq in seqs))
+            connection.executemany(
+                "INSERT OR REPLACE INTO tasks (id, data) VALUES (?, ?)",
+                ((task_id, json.dumps(data)) for task_id, data in tasks.items()),
+            )
+
+    @contextmanager
+    def flush_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            with super().flush_lock():
+                yield
+            return
+        # flock locks belong to the open file, so they exclude other threads
+        # of this process as well as other processes
+        with open(self.path + ".flush.lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _field_values(data: Dict) -> Dict:
+    """Task data as the JSON values a save would send, for comparisons"""
+    return Task.from_api_data(data).model_dump(by_alias=True, mode="json")
+
+
+class TaskReplica:
+    """
+    Local copy of the task list that takes changes without waiting for the API.
+
+    ``save``, ``mark_complete``, ``log_work``, ``add_time``, ``start`` and
+    ``stop`` update the replica and the task passed in immediately and queue
+    the change in ``store``. ``flush()`` sends the queue later:
+
+        replica = TaskReplica(SQLiteReplicaStore("~/.reclaim/replica.db"))
+        replica.load()  # needs the API; afterwards works offline
+        task = replica.get(42)
+        task.title = "Renamed"
+        replica.save(task)
+        replica.log_work(task, 30)
+        replica.flush()
+
+    Flushing merges consecutive changes of one task that the API can take
+    as one request (saves, time logged without an end, time added) and
+    sends them in the bulk rate-limit lane. A change that fails because the
+    API is unavailable stays queued and is retried with exponential backoff;
+    later changes of the same task wait for it. Changes the API rejects
+    (unknown task, invalid data) are dropped and reported.
+
+    Saves send only the fields that changed. If the task was updated on the
+    server since the change was made, fields the server changed to a
+    different value are conflicts: with ``on_conflict="server"`` they are
+    left out of the request, with ``"local"`` they are overwritten.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ReplicaStore] = None,
+        client: Optional[ReclaimClient] = None,
+        on_conflict: str = "server",
+    ):
+        if on_conflict not in ("server", "local"):
+            raise ValueError("on_conflict must be 'server' or 'local'")
+        self.store = store if store is not None else MemoryReplicaStore()
+        self.client = client
+        self.on_conflict = on_conflict
+        self._lock = threading.RLock()
+        self._server = self.store.load_tasks()
+        self._pending = self.store.pending()
+        self._local: Dict[int, Dict] = {}
+        # Ids of locally created tasks that have been sent, to the API ids
+        self._aliases: Dict[int, int] = {}
+        self._rebuild()
+
+    def _api(self) -> ReclaimClient:
+        return self.client if self.client is not None else ReclaimClient()
+
+    def _rebuild(self, task_id: Optional[int] = None) -> None:
+        """Derive the local state of ``task_id`` (default: all tasks) from its server copy and queued changes"""
+        if task_id is None:
+            server, pending = self._server, self._pending
+        else:
+            server = {task_id: self._server[task_id]} if task_id in self._server else {}
+            pending = [mutation for mutation in self._pending if mutation.task_id == task_id]
+        local = {key: dict(data) for key, data in server.items()}
+        for mutation in pending:
+            if mutation.action == "create":
+                local[mutation.task_id] = {}
+            data = local.get(mutation.task_id)
+            # Changes of tasks deleted on the server are dropped when sent
+            if data is not None:
+                mutation.apply(data)
+        if task_id is None:
+            self._local = local
+        elif task_id in local:
+            self._local[task_id] = local[task_id]
+        else:
+            self._local.pop(task_id, None)
+
+    def _resolve(self, task_id: int) -> int:
+        return self._aliases.get(task_id, task_id)
+
+    # Reading
+
+    def load(self) -> None:
+        """Replace the server copies with the current task list; queued changes stay applied"""
+        with span("TaskReplica.load", endpoint=Task.ENDPOINT) as current:
+            data = self._api().get(Task.ENDPOINT)
+            current.set_attribute("items", len(data))
+        tasks = {item["id"]: item for item in data}
+        with self._lock:
+            self.store.save_tasks(tasks, replace=True)
+            self._server = tasks
+            self._pending = self.store.pending()
+            self._rebuild()
+
+    def tasks(self) -> List[Task]:
+        """All tasks with local changes applied; each call returns new objects"""
+        with self._lock:
+            data = list(self._local.values())
+        return [Task.from_api_data(dict(item)) for item in data]
+
+    def get(self, task_id: int) -> Task:
+        with self._lock:
+            data = self._local.get(self._resolve(task_id))
+        if data is None:
+            raise RecordNotFound(f"Task {task_id} is not in the replica")
+        return Task.from_api_data(dict(data))
+
+    def pending(self) -> List[Mutation]:
+        """Changes not sent yet, oldest first"""
+        with self._lock:
+            return list(self._pending)
+
+    # Local changes
+
+    def _record(self, task: Task, action: str, payload: Dict) -> Mutation:
+        with self._lock:
+            task_id = self._resolve(task.id)
+            data = self._local.get(task_id)
+            if data is None:
+                raise RecordNotFound(f"Task {task.id} is not in the replica")
+            mutation = self.store.append(Mutation(task_id, action, payload, data.get("updated")))
+            self._pending.append(mutation)
+            mutation.apply(data)
+            task.__dict__.update(Task.from_api_data(dict(data)).__dict__)
+            return mutation
+
+    def save(self, task: Task) -> None:
+        """Queue the fields changed on ``task``, or its creation if it has no id yet"""
+        if task.id is None:
+            self._create(task)
+            return
+        with self._lock:
+            data = self._local.get(self._resolve(task.id))
+            if data is None:
+                raise RecordNotFound(f"Task {task.id} is not in the replica")
+            before = _field_values(data)
+        after = task.model_dump(by_alias=True, mode="json")
+        changes = {
+            key: value
+            for key, value in after.items()
+            if key not in READ_ONLY_FIELDS and before.get(key) != value
+        }
+        if changes:
+            base = {key: before.get(key) for key in changes}
+            self._record(task, "save", {"changes": changes, "base": base})
+
+    def _create(self, task: Task) -> None:
+        data = {
+            key: value
+            for key, value in task.model_dump(by_alias=True, mode="json", exclude_none=True).items()
+            if key not in READ_ONLY_FIELDS
+        }
+        with self._lock:
+            # Negative ids stand in until the API assigns one
+            task_id = min([0, *self._local]) - 1
+            mutation = self.store.append(Mutation(task_id, "create", {"data": data}))
+            self._pending.append(mutation)
+            self._local[task_id] = {}
+            mutation.apply(self._local[task_id])
+            task.__dict__.update(Task.from_api_data(dict(self._local[task_id])).__dict__)
+
+    def mark_complete(self, task: Task) -> None:
+        self._record(task, "done", {})
+
+    def start(self, task: Task) -> None:
+        self._record(task, "start", {})
+
+    def stop(self, task: Task) -> None:
+        self._record(task, "stop", {})
+
+    def add_time(self, task: Task, hours: float) -> None:
+        minutes = int(hours * 60)
+        self._record(task, "add-time", {"minutes": round(minutes / 15) * 15})
+
+    def log_work(self, task: Task, minutes: int, end: Optional[datetime] = None) -> None:
+        payload = {"minutes": minutes, "end": None}
+        if end:
+            # Same format as Task.log_work
+            payload["end"] = end.astimezone(timezone.utc).isoformat()[:-9] + "Z"
+        self._record(task, "log-work", payload)
+
+    # Sending
+
+    def _batches(self, now: float) -> Tuple[List[Tuple[int, List[Mutation]]], int]:
+        """Due changes per task in queue order, merged where possible, and the number merged away"""
+        by_task: Dict[int, List[Mutation]] = {}
+        for mutation in self._pending:
+            by_task.setdefault(mutation.task_id, []).append(mutation)
+        batches = []
+        merged_away = 0
+        for task_id, mutations in by_task.items():
+            # Changes of one task are sent in order, so a change waiting
+            # for a retry holds back the ones after it
+            if mutations[0].not_before > now:
+                continue
+            units = [mutations[0]]
+            for mutation in mutations[1:]:
+                merged = units[-1].merge(mutation)
+                if merged is None:
+                    units.append(mutation)
+                else:
+                    units[-1] = merged
+                    merged_away += 1
+            batches.append((task_id, units))
+        return batches, merged_away
+
+    def _conflicting_fields(self, mutation: Mutation, server: Optional[Dict]) -> List[str]:
+        if server is None or server.get("updated") == mutation.base_updated:
+            return []
+        current = _field_values(server)
+        base = mutation.payload["base"]
+        return [
+            key
+            for key, value in mutation.payload["changes"].items()
+            if current.get(key) != base.get(key) and current.get(key) != value
+        ]
+
+    def _send(self, client: ReclaimClient, task_id: int, mutation: Mutation) -> Dict:
+        if mutation.action == "create":
+            return client.post(Task.ENDPOINT, json=mutation.payload["data"])
+        if mutation.action == "save":
+            return client.patch(f"{Task.ENDPOINT}/{task_id}", json=mutation.payload["changes"])
+        params = {}
+        if "minutes" in mutation.payload:
+            params["minutes"] = mutation.payload["minutes"]
+        if mutation.payload.get("end"):
+            params["end"] = mutation.payload["end"]
+        with span(f"planner.{mutation.action}", endpoint="/api/planner", task_id=task_id):
+            response = client.post(
+                f"/api/planner/{mutation.action}/task/{task_id}", params=params or None
+            )
+        return response["taskOrHabit"]
+
+    def _sent(self, task_id: int, mutation: Mutation, data: Dict) -> int:
+        """Record a sent change and the task the API returned; returns the task's id"""
+        with self._lock:
+            remap = None
+            stored_id = task_id
+            if mutation.action == "create":
+                remap = (task_id, data["id"])
+                stored_id = data["id"]
+            # One store transaction, so a crash cannot leave a sent change queued
+            self.store.commit_sent(mutation.seqs, {stored_id: data}, remap)
+            if remap is not None:
+                for pending in self._pending:
+                    if pending.task_id == task_id:
+                        pending.task_id = data["id"]
+                self._aliases[task_id] = data["id"]
+                self._local.pop(task_id, None)
+                task_id = data["id"]
+            sent = set(mutation.seqs)
+            self._pending = [pending for pending in self._pending if pending.seq not in sent]
+            self._server[task_id] = data
+            self._rebuild(task_id)
+        return task_id
+
+    def _drop(self, mutation: Mutation) -> None:
+        with self._lock:
+            self.store.remove(mutation.seqs)
+            dropped = set(mutation.seqs)
+            self._pending = [pending for pending in self._pending if pending.seq not in dropped]
+            self._rebuild(mutation.task_id)
+
+    def flush(self, limit: Optional[int] = None) -> FlushResult:
+        """
+        Send queued changes to the API, at most ``limit`` requests.
+
+        Raises ``AuthenticationError`` without dropping anything if the
+        token is rejected.
+        """
+        result = FlushResult()
+        client = self._api()
+        with self.store.flush_lock(), span("TaskReplica.flush") as current, priority(Priority.BULK):
+            with self._lock:
+                # Other processes sharing the store may have queued changes
+                self._pending = self.store.pending()
+                self._rebuild()
+                batches, result.merged = self._batches(time.time())
+            current.set_attribute("tasks", len(batches))
+            for task_id, units in batches:
+                if limit is not None and result.sent >= limit:
+                    break
+                self._flush_task(client, task_id, units, result, limit)
+            with self._lock:
+                result.remaining = len(self._pending)
+            current.set_attribute("sent", result.sent)
+            current.set_attribute("remaining", result.remaining)
+        return result
+
+    def _flush_task(
+        self,
+        client: ReclaimClient,
+        task_id: int,
+        units: List[Mutation],
+        result: FlushResult,
+        limit: Optional[int],
+    ) -> None:
+        server = None
+        for mutation in units:
+            if limit is not None and result.sent >= limit:
+                return
+            try:
+                if mutation.action == "save" and server is None:
+                    # Saves are checked against the current server copy,
+                    # fetched once per task and flush
+                    server = client.get(f"{Task.ENDPOINT}/{task_id}")
+                if mutation.action == "save":
+                    conflicts = self._conflicting_fields(mutation, server)
+                    if conflicts:
+                        result.conflicts.append(Conflict(mutation, conflicts, server))
+                        if self.on_conflict == "server":
+                            changes = {
+                                key: value
+                                for key, value in mutation.payload["changes"].items()
+                                if key not in conflicts
+                            }
+                            if not changes:
+                                self._drop(mutation)
+                                continue
+                            mutation.payload = {**mutation.payload, "changes": changes}
+                data = self._send(client, task_id, mutation)
+            except AuthenticationError:
+                raise
+            except (RecordNotFound, InvalidRecord) as e:
+                result.rejected.append((mutation, e))
+                self._drop(mutation)
+                continue
+            except ReclaimAPIError:
+                attempts = mutation.attempts + 1
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+                with self._lock:
+                    self.store.retry_later(mutation.seqs, attempts, time.time() + delay)
+                    self._pending = self.store.pending()
+                result.retrying += len(mutation.seqs)
+                return
+            result.sent += 1
+            if mutation.action == "create":
+                result.created[task_id] = data["id"]
+            task_id = self._sent(task_id, mutation, data)
+            server = data
@@ -1,5 +1,13 @@
-from .task import Task
-from .hours import Hours
-from .event import Event
+from importlib import import_module
 
 __all__ = ["Task", "Hours", "Event"]
+
+# Resources are imported on first access, so importing one of them does not
+# pay for building the others (Event alone has about 70 fields)
+_MODULES = {"Task": ".task", "Hours": ".hours", "Event": ".event"}
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(import_module(_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,29 +1,68 @@
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 from datetime import datetime
-from typing import ClassVar, Dict, List, Type, TypeVar
+from typing import Any, ClassVar, Dict, List, Optional, Type, TypeVar
 from reclaim_sdk.client import ReclaimClient
+from reclaim_sdk.exceptions import ReclaimAPIError
+from reclaim_sdk.timing import phase
+from reclaim_sdk.tracing import span
 
 T = TypeVar("T", bound="BaseResource")
 
 
+@lru_cache(maxsize=None)
+def list_adapter(cls: Type[T]) -> TypeAdapter:
+    """``TypeAdapter(List[cls])``, built once per resource on first use"""
+    return TypeAdapter(List[cls])
+
+
 class BaseResource(BaseModel):
+    # Build validators on first use instead of at import, which keeps cold
+    # starts cheap for resources a process never touches
+    model_config = ConfigDict(defer_build=True)
+
     id: int | None = Field(None, description="Unique identifier of the resource")
     created: datetime | None = Field(None, description="Creation timestamp")
     updated: datetime | None = Field(None, description="Last update timestamp")
 
+    # Task(token=...) configures the client for that token and binds it
+    token: str | None = Field(
+        None, exclude=True, repr=False, description="API token to configure the client with"
+    )
+
     ENDPOINT: ClassVar[str] = ""
     _client: ReclaimClient
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        if data.get("token"):
-            self._client = ReclaimClient.configure(token=data["token"])
+    # No custom __init__: pydantic would call it for every item validated
+    # through a TypeAdapter, as keyword arguments validated a second time
+    def model_post_init(self, context: Any) -> None:
+        # Validation with context={"client": ...} binds that client instead
+        # of looking one up per model
+        if self.token:
+            self._client = ReclaimClient.configure(token=self.token)
+        elif context is not None and "client" in context:
+            self._client = context["client"]
         else:
             self._client = ReclaimClient()
 
     @classmethod
     def from_api_data(cls: Type[T], data: Dict) -> T:
-        return cls(**data)
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_api_json(cls: Type[T], content: bytes, client: Optional[ReclaimClient] = None) -> List[T]:
+        """
+        Validate a JSON array of API objects straight from the response body,
+        without decoding it into dicts first.
+        """
+        if client is None:
+            client = ReclaimClient()
+        try:
+            return list_adapter(cls).validate_json(content, context={"client": client})
+        except ValidationError as e:
+            if e.errors(include_url=False)[0]["type"] == "json_invalid":
+                raise ReclaimAPIError("Invalid JSON response from API") from e
+            raise
 
     def to_api_data(self) -> Dict:
         return self.model_dump(exclude_unset=False, by_alias=True)
@@ -32,8 +71,10 @@ class BaseResource(BaseModel):
     def get(cls: Type[T], id: int, client: ReclaimClient = None) -> T:
         if client is None:
             client = ReclaimClient()
-        data = client.get(f"{cls.ENDPOINT}/{id}")
-        return cls.from_api_data(data)
+        with span(f"{cls.__name__}.get", endpoint=cls.ENDPOINT, id=id):
+            data = client.get(f"{cls.ENDPOINT}/{id}")
+            with phase("hydrate"):
+                return cls.from_api_data(data)
 
     def refresh(self) -> None:
         if not self.id:
@@ -44,12 +85,13 @@ class BaseResource(BaseModel):
 
     def save(self) -> None:
         client = self._client
-        data = self.to_api_data()
-        if self.id:
-            response = client.patch(f"{self.ENDPOINT}/{self.id}", json=data)
-        else:
-            response = client.post(self.ENDPOINT, json=data)
-        self.__dict__.update(self.from_api_data(response).__dict__)
+        with span(f"{type(self).__name__}.save", endpoint=self.ENDPOINT, id=self.id, created=not self.id):
+            data = self.to_api_data()
+            if self.id:
+                response = client.patch(f"{self.ENDPOINT}/{self.id}", json=data)
+            else:
+                response = client.post(self.ENDPOINT, json=data)
+            self.__dict__.update(self.from_api_data(response).__dict__)
 
     def delete(self) -> None:
         if not self.id:
@@ -61,5 +103,9 @@ class BaseResource(BaseModel):
     def list(cls: Type[T], client: ReclaimClient = None, **params) -> List[T]:
         if client is None:
             client = ReclaimClient()
-        data = client.get(cls.ENDPOINT, params=params)
-        return [cls.from_api_data(item) for item in data]
+        with span(f"{cls.__name__}.list", endpoint=cls.ENDPOINT, params=len(params)) as current:
+            content = client.get_raw(cls.ENDPOINT, params=params)
+            with phase("hydrate"):
+                resources = cls.from_api_json(content, client)
+            current.set_attribute("items", len(resources))
+            return resources
@@ -1,8 +1,45 @@
-from pydantic import Field, field_validator
+import json
+from pydantic import AliasChoices, AliasPath, Field, field_validator
 from datetime import datetime, timezone, timedelta
-from typing import ClassVar, Optional, List
+from typing import Callable, ClassVar, Dict, Optional, List, Sequence, Tuple, Union
 from enum import Enum
 from reclaim_sdk.resources.base import BaseResource
+from reclaim_sdk.hydrate import hydrate, hydrate_columns, hydrate_json
+from reclaim_sdk.tracing import span
+
+
+def _nested(parent: str, key: str, alias: Optional[str] = None) -> AliasChoices:
+    """Read a field from the API's ``parent`` object, falling back to the top-level alias"""
+    return AliasChoices(AliasPath(parent, key), alias or key)
+
+
+def _merge_value(item: Dict, key: str, alias: str):
+    # Same precedence as the schema: mergeDetails first, then the top level
+    merge = item.get("mergeDetails")
+    if isinstance(merge, dict) and key in merge:
+        return merge[key]
+    return item.get(alias)
+
+
+def _merge_identity(item: Dict) -> Optional[Tuple]:
+    merge_key = _merge_value(item, "key", "mergeKey")
+    if merge_key is None:
+        return None
+    return merge_key, _merge_value(item, "sourceCalendarId", "sourceCalendarId")
+
+
+def _merge_rank(prefer: Union[str, Sequence[int]]) -> Optional[Callable[[Dict], int]]:
+    """Rank of a copy under ``prefer``, lowest kept; None keeps the first copy"""
+    if prefer == "first":
+        return None
+    if prefer == "source":
+        return lambda item: 0 if item.get("calendarId") == _merge_value(
+            item, "sourceReclaimCalendarId", "sourceReclaimCalendarId"
+        ) else 1
+    if isinstance(prefer, str):
+        raise ValueError(f"Unknown merge preference: {prefer!r}")
+    order = {calendar_id: position for position, calendar_id in enumerate(prefer)}
+    return lambda item: order.get(item.get("calendarId"), len(order))
 
 
 class EventColor(str, Enum):
@@ -72,7 +109,7 @@ class Event(BaseResource):
     under_assist_control: Optional[bool] = Field(None, alias="underAssistControl", description="Under assist control")
     
     # Task-related fields (from assist object)
-    task_id: Optional[int] = Field(None, alias="taskId", description="Associated task ID")
+    task_id: Optional[int] = Field(None, alias="taskId", validation_alias=_nested("assist", "taskId"), description="Associated task ID")
     
     # Additional fields
     requires_travel: Optional[bool] = Field(None, alias="requiresTravel", description="Requires travel")
@@ -89,32 +126,32 @@ class Event(BaseResource):
     # Version and metadata
     version: Optional[str] = Field(None, description="Event version")
     etag: Optional[str] = Field(None, description="Event ETag")
-    manually_started: Optional[bool] = Field(None, alias="manuallyStarted", description="Manually started")
+    manually_started: Optional[bool] = Field(None, alias="manuallyStarted", validation_alias=_nested("assist", "manuallyStarted"), description="Manually started")
     conference_call: Optional[bool] = Field(None, alias="conferenceCall", description="Is conference call")
     source_event_type: Optional[str] = Field(None, alias="sourceEventType", description="Source event type")
     
     # Assist object fields (extracted from assist)
-    assist_type: Optional[str] = Field(None, alias="assistType", description="Assist type")
-    assist_status: Optional[str] = Field(None, alias="assistStatus", description="Assist status")
-    last_controlled_hash: Optional[int] = Field(None, alias="lastControlledHash", description="Last controlled hash")
-    defended: Optional[bool] = Field(None, description="Is defended")
-    task_index: Optional[int] = Field(None, alias="taskIndex", description="Task index")
-    pinned: Optional[bool] = Field(None, description="Is pinned")
-    lock_state: Optional[str] = Field(None, alias="lockState", description="Lock state")
-    event_type: Optional[str] = Field(None, alias="eventType", description="Event type")
-    smart_series: Optional[bool] = Field(None, alias="smartSeries", description="Is smart series")
-    assist_reference_valid: Optional[bool] = Field(None, alias="assistReferenceValid", description="Assist reference valid")
-    habit_or_task: Optional[bool] = Field(None, alias="habitOrTask", description="Is habit or task")
-    conference_buffer: Optional[bool] = Field(None, alias="conferenceBuffer", description="Is conference buffer")
-    focus: Optional[bool] = Field(None, description="Is focus")
-    custom_habit: Optional[bool] = Field(None, alias="customHabit", description="Is custom habit")
-    travel_buffer: Optional[bool] = Field(None, alias="travelBuffer", description="Is travel buffer")
+    assist_type: Optional[str] = Field(None, alias="assistType", validation_alias=_nested("assist", "type", "assistType"), description="Assist type")
+    assist_status: Optional[str] = Field(None, alias="assistStatus", validation_alias=_nested("assist", "status", "assistStatus"), description="Assist status")
+    last_controlled_hash: Optional[int] = Field(None, alias="lastControlledHash", validation_alias=_nested("assist", "lastControlledHash"), description="Last controlled hash")
+    defended: Optional[bool] = Field(None, alias="defended", validation_alias=_nested("assist", "defended"), description="Is defended")
+    task_index: Optional[int] = Field(None, alias="taskIndex", validation_alias=_nested("assist", "taskIndex"), description="Task index")
+    pinned: Optional[bool] = Field(None, alias="pinned", validation_alias=_nested("assist", "pinned"), description="Is pinned")
+    lock_state: Optional[str] = Field(None, alias="lockState", validation_alias=_nested("assist", "lockState"), description="Lock state")
+    event_type: Optional[str] = Field(None, alias="eventType", validation_alias=_nested("assist", "eventType"), description="Event type")
+    smart_series: Optional[bool] = Field(None, alias="smartSeries", validation_alias=_nested("assist", "smartSeries"), description="Is smart series")
+    assist_reference_valid: Optional[bool] = Field(None, alias="assistReferenceValid", validation_alias=_nested("assist", "assistReferenceValid"), description="Assist reference valid")
+    habit_or_task: Optional[bool] = Field(None, alias="habitOrTask", validation_alias=_nested("assist", "habitOrTask"), description="Is habit or task")
+    conference_buffer: Optional[bool] = Field(None, alias="conferenceBuffer", validation_alias=_nested("assist", "conferenceBuffer"), description="Is conference buffer")
+    focus: Optional[bool] = Field(None, alias="focus", validation_alias=_nested("assist", "focus"), description="Is focus")
+    custom_habit: Optional[bool] = Field(None, alias="customHabit", validation_alias=_nested("assist", "customHabit"), description="Is custom habit")
+    travel_buffer: Optional[bool] = Field(None, alias="travelBuffer", validation_alias=_nested("assist", "travelBuffer"), description="Is travel buffer")
     
     # Merge details
-    merge_key: Optional[str] = Field(None, alias="mergeKey", description="Merge key")
-    merge_type: Optional[str] = Field(None, alias="mergeType", description="Merge type")
-    source_calendar_id: Optional[str] = Field(None, alias="sourceCalendarId", description="Source calendar ID")
-    source_reclaim_calendar_id: Optional[int] = Field(None, alias="sourceReclaimCalendarId", description="Source reclaim calendar ID")
+    merge_key: Optional[str] = Field(None, alias="mergeKey", validation_alias=_nested("mergeDetails", "key", "mergeKey"), description="Merge key")
+    merge_type: Optional[str] = Field(None, alias="mergeType", validation_alias=_nested("mergeDetails", "type", "mergeType"), description="Merge type")
+    source_calendar_id: Optional[str] = Field(None, alias="sourceCalendarId", validation_alias=_nested("mergeDetails", "sourceCalendarId"), description="Source calendar ID")
+    source_reclaim_calendar_id: Optional[int] = Field(None, alias="sourceReclaimCalendarId", validation_alias=_nested("mergeDetails", "sourceReclaimCalendarId"), description="Source reclaim calendar ID")
     
     # Additional flags
     personal_sync: Optional[bool] = Field(None, alias="personalSync", description="Personal sync")
@@ -135,26 +172,56 @@ class Event(BaseResource):
         return v
 
     @classmethod
-    def list_by_date_range(
-        cls, 
-        start_date: datetime, 
-        end_date: datetime, 
-        client=None, 
-        all_connected: bool = True,
-        task_ids: Optional[List[int]] = None,
-        **params
-    ) -> List["Event"]:
+    def dedupe_merged(
+        cls, items: List[Dict], prefer: Union[str, Sequence[int]] = "first"
+    ) -> List[Dict]:
         """
-        List events within a date range with optional task filtering
-        
-        Args:
-            start_date: Start date for the range
-            end_date: End date for the range
-            client: ReclaimClient instance
-            all_connected: Include all connected events
-            task_ids: Filter by specific task IDs
-            **params: Additional query parameters
+        Keep one copy of every event mirrored onto several connected calendars.
+
+        Works on API data, before validation. Copies share a merge key and
+        source calendar; events without a merge key are all kept. ``prefer``
+        picks the copy: ``"first"`` as returned, ``"source"`` the one on the
+        calendar the event was mirrored from, or a sequence of calendar IDs,
+        most preferred first. The kept copy takes the place of the first one.
         """
+        rank = _merge_rank(prefer)
+        kept: List[Dict] = []
+        positions: Dict[Tuple, Tuple[int, int]] = {}
+        for item in items:
+            identity = _merge_identity(item)
+            if identity is None:
+                kept.append(item)
+                continue
+            seen = positions.get(identity)
+            if seen is None:
+                positions[identity] = (len(kept), rank(item) if rank else 0)
+                kept.append(item)
+            elif rank is not None:
+                position, kept_rank = seen
+                item_rank = rank(item)
+                if item_rank < kept_rank:
+                    kept[position] = item
+                    positions[identity] = (position, item_rank)
+        return kept
+
+    @classmethod
+    def _dedupe(cls, content: bytes, dedupe: Union[bool, str, Sequence[int]]) -> List[Dict]:
+        items = json.loads(content)
+        with span("Event.dedupe_merged", items=len(items)) as current:
+            kept = cls.dedupe_merged(items, "first" if dedupe is True else dedupe)
+            current.set_attribute("duplicates", len(items) - len(kept))
+        return kept
+
+    @classmethod
+    def _fetch_date_range(
+        cls,
+        start_date: datetime,
+        end_date: datetime,
+        client,
+        all_connected: bool,
+        task_ids: Optional[List[int]],
+        params: Dict,
+    ) -> bytes:
         if client is None:
             from reclaim_sdk.client import ReclaimClient
             client = ReclaimClient()
@@ -175,57 +242,76 @@ class Event(BaseResource):
         if task_ids:
             query_params["taskIds"] = ",".join(map(str, task_ids))
         
-        data = client.get(cls.ENDPOINT, params=query_params)
-        
-        # Process events and extract fields from assist object
-        events = []
-        for item in data:
-            # Extract fields from assist object if present
-            if "assist" in item and isinstance(item["assist"], dict):
-                assist = item["assist"]
-                # Map assist fields to top-level fields
-                assist_mapping = {
-                    "type": "assistType",
-                    "status": "assistStatus", 
-                    "lastControlledHash": "lastControlledHash",
-                    "defended": "defended",
-                    "taskId": "taskId",
-                    "taskIndex": "taskIndex",
-                    "pinned": "pinned",
-                    "lockState": "lockState",
-                    "eventType": "eventType",
-                    "manuallyStarted": "manuallyStarted",
-                    "smartSeries": "smartSeries",
-                    "task": "task",
-                    "assistReferenceValid": "assistReferenceValid",
-                    "habitOrTask": "habitOrTask",
-                    "conferenceBuffer": "conferenceBuffer",
-                    "focus": "focus",
-                    "customHabit": "customHabit",
-                    "travelBuffer": "travelBuffer"
-                }
-                
-                for assist_key, field_name in assist_mapping.items():
-                    if assist_key in assist:
-                        item[field_name] = assist[assist_key]
-            
-            # Extract fields from mergeDetails if present
-            if "mergeDetails" in item and isinstance(item["mergeDetails"], dict):
-                merge = item["mergeDetails"]
-                merge_mapping = {
-                    "key": "mergeKey",
-                    "type": "mergeType",
-                    "sourceCalendarId": "sourceCalendarId",
-                    "sourceReclaimCalendarId": "sourceReclaimCalendarId"
-                }
-                
-                for merge_key, field_name in merge_mapping.items():
-                    if merge_key in merge:
-                        item[field_name] = merge[merge_key]
-            
-            events.append(cls.from_api_data(item))
+        with span(
+            "Event.list_by_date_range",
+            endpoint=cls.ENDPOINT,
+            start=start_str,
+            end=end_str,
+            params=len(query_params),
+            task_ids=len(task_ids) if task_ids else 0,
+        ) as current:
+            content = client.get_raw(cls.ENDPOINT, params=query_params)
+            current.set_attribute("bytes", len(content))
+        return content
+
+    @classmethod
+    def list_by_date_range(
+        cls, 
+        start_date: datetime, 
+        end_date: datetime, 
+        client=None, 
+        all_connected: bool = True,
+        task_ids: Optional[List[int]] = None,
+        processes: Optional[int] = None,
+        dedupe: Union[bool, str, Sequence[int]] = False,
+        **params
+    ) -> List["Event"]:
+        """
+        List events within a date range with optional task filtering
         
-        return events
+        Args:
+            start_date: Start date for the range
+            end_date: End date for the range
+            client: ReclaimClient instance
+            all_connected: Include all connected events
+            task_ids: Filter by specific task IDs
+            processes: Validate large responses in this many worker
+                processes (default: ``RECLAIM_HYDRATE_PROCESSES``), see
+                ``reclaim_sdk.hydrate``
+            dedupe: Return one copy of events mirrored onto several
+                connected calendars: True keeps the first, or give the
+                preference as for ``dedupe_merged``
+            **params: Additional query parameters
+        """
+        content = cls._fetch_date_range(start_date, end_date, client, all_connected, task_ids, params)
+        if dedupe:
+            return hydrate(cls, cls._dedupe(content, dedupe), processes=processes, client=client)
+        return hydrate_json(cls, content, processes=processes, client=client)
+
+    @classmethod
+    def columns_by_date_range(
+        cls,
+        start_date: datetime,
+        end_date: datetime,
+        client=None,
+        all_connected: bool = True,
+        task_ids: Optional[List[int]] = None,
+        fields: Optional[List[str]] = None,
+        processes: Optional[int] = None,
+        dedupe: Union[bool, str, Sequence[int]] = False,
+        **params
+    ) -> Dict[str, list]:
+        """
+        Like ``list_by_date_range``, but returns one list per field instead
+        of ``Event`` objects, e.g. ``{"event_start": [...], "task_id": [...]}``.
+
+        Much cheaper to pass back from worker processes for large ranges.
+        ``fields`` limits the columns (default: all fields), ``dedupe`` works
+        as for ``list_by_date_range``.
+        """
+        content = cls._fetch_date_range(start_date, end_date, client, all_connected, task_ids, params)
+        items = cls._dedupe(content, dedupe) if dedupe else json.loads(content)
+        return hydrate_columns(cls, items, fields=fields, processes=processes)
 
     @classmethod
     def list_future_events(
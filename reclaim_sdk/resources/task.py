@@ -1,8 +1,9 @@
 from pydantic import Field, field_validator
 from datetime import datetime, timezone
-from typing import ClassVar, Optional
+from typing import ClassVar, Dict, Optional
 from enum import Enum
 from reclaim_sdk.resources.base import BaseResource
+from reclaim_sdk.tracing import span
 
 
 class TaskPriority(str, Enum):
@@ -131,12 +132,19 @@ class Task(BaseResource):
     def up_next(self, value: bool) -> None:
         self.on_deck = value
 
+    def _planner_action(self, action: str, **kwargs) -> Dict:
+        coalescer = self._client.planner_coalescer
+        if coalescer is not None and coalescer.accepts(action, kwargs.get("params")):
+            return coalescer.submit(action, self.id, kwargs["params"]).result()
+        with span(f"planner.{action}", endpoint="/api/planner", task_id=self.id):
+            return self._client.post(f"/api/planner/{action}/task/{self.id}", **kwargs)
+
     def mark_complete(self) -> None:
-        response = self._client.post(f"/api/planner/done/task/{self.id}")
+        response = self._planner_action("done")
         self.from_api_data(response["taskOrHabit"])
 
     def mark_incomplete(self) -> None:
-        response = self._client.post(f"/api/planner/unarchive/task/{self.id}")
+        response = self._planner_action("unarchive")
         self.from_api_data(response["taskOrHabit"])
 
     @classmethod
@@ -144,19 +152,17 @@ class Task(BaseResource):
         cls._client.patch("/api/tasks/reindex-by-due")
 
     def prioritize(self) -> None:
-        self._client.post(f"/api/planner/prioritize/task/{self.id}")
+        self._planner_action("prioritize")
         self.refresh()
 
     def add_time(self, hours: float) -> None:
         minutes = int(hours * 60)
         rounded_minutes = round(minutes / 15) * 15
-        response = self._client.post(
-            f"/api/planner/add-time/task/{self.id}", params={"minutes": rounded_minutes}
-        )
+        response = self._planner_action("add-time", params={"minutes": rounded_minutes})
         self.from_api_data(response["taskOrHabit"])
 
     def clear_exceptions(self) -> None:
-        response = self._client.post(f"/api/planner/clear-exceptions/task/{self.id}")
+        response = self._planner_action("clear-exceptions")
         self.from_api_data(response["taskOrHabit"])
 
     def log_work(self, minutes: int, end: Optional[datetime] = None) -> None:
@@ -167,15 +173,13 @@ class Task(BaseResource):
             # Truncate timestamp to match required format
             params["end"] = end.isoformat()[:-9] + "Z"
 
-        response = self._client.post(
-            f"/api/planner/log-work/task/{self.id}", params=params
-        )
+        response = self._planner_action("log-work", params=params)
         self.from_api_data(response["taskOrHabit"])
 
     def start(self) -> None:
-        response = self._client.post(f"/api/planner/start/task/{self.id}")
+        response = self._planner_action("start")
         self.from_api_data(response["taskOrHabit"])
 
     def stop(self) -> None:
-        response = self._client.post(f"/api/planner/stop/task/{self.id}")
+        response = self._planner_action("stop")
         self.from_api_data(response["taskOrHabit"])
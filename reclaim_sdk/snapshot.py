@@ -0,0 +1,154 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+from pydantic import BaseModel
+from reclaim_sdk.ratelimit import Priority, priority
+from reclaim_sdk.timing import phase
+
+T = TypeVar("T")
+
+
+class Snapshot(Generic[T]):
+    """A value produced by a loader together with the time it was taken"""
+
+    __slots__ = ("value", "taken_at", "created", "digest")
+
+    def __init__(
+        self, value: T, taken_at: Optional[float] = None, digest: Optional[str] = None
+    ):
+        self.value = value
+        self.taken_at = time.monotonic() if taken_at is None else taken_at
+        self.created = datetime.now(timezone.utc)
+        self.digest = digest
+
+    @property
+    def age(self) -> float:
+        """Seconds since the loader that produced this snapshot was started"""
+        return time.monotonic() - self.taken_at
+
+
+def model_digest(models: Iterable[BaseModel]) -> str:
+    """Content hash of a sequence of models, e.g. the tasks of a snapshot"""
+    digest = hashlib.sha256()
+    for model in models:
+        digest.update(model.model_dump_json().encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.snapshot: Optional[Snapshot] = None
+        self.error: Optional[BaseException] = None
+
+
+class SnapshotStore(Generic[T]):
+    """
+    Caches the result of a loader with single-flight semantics.
+
+    Callers within ``max_age`` seconds of the last load share its snapshot.
+    When the snapshot is missing or too old, the first caller runs the loader
+    and every concurrent caller waits for that same load instead of starting
+    its own.
+
+    With ``stale_while_revalidate`` set, a snapshot that is older than
+    ``max_age`` but still within the extra staleness bound is returned
+    immediately while a single background load refreshes it. Callers only
+    block when there is no snapshot or it is past that bound. A failed
+    refresh keeps the last good snapshot. Background loads run in the
+    ``BACKGROUND`` rate limit lane, behind interactive requests.
+
+    Args:
+        loader: Callable producing a fresh value, e.g. ``lambda: Task.list()``
+        max_age: Seconds a snapshot is served before it is reloaded
+        stale_while_revalidate: Extra seconds a snapshot may be served stale
+            while it is refreshed in the background
+        digest: Optional callable computing a content hash of each loaded
+            value, exposed as ``Snapshot.digest``
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], T],
+        max_age: float = 10.0,
+        stale_while_revalidate: float = 0.0,
+        digest: Optional[Callable[[T], str]] = None,
+    ):
+        self.loader = loader
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.digest = digest
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Snapshot[T]] = None
+        self._flight: Optional[_Flight] = None
+
+    def get(self, max_age: Optional[float] = None) -> Snapshot[T]:
+        """Return a snapshot no older than ``max_age``, loading it if needed"""
+        if max_age is None:
+            max_age = self.max_age
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                age = snapshot.age
+                if age <= max_age:
+                    return snapshot
+                if age <= max_age + self.stale_while_revalidate:
+                    if self._flight is None:
+                        self._flight = _Flight()
+                        threading.Thread(
+                            target=self._refresh, args=(self._flight,), daemon=True
+                        ).start()
+                    return snapshot
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+
+        if leader:
+            self._load(flight)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.snapshot
+
+    def is_stale(self, snapshot: Snapshot[T]) -> bool:
+        """Whether ``snapshot`` is being served past ``max_age``"""
+        return snapshot.age > self.max_age
+
+    def peek(self) -> Optional[Snapshot[T]]:
+        """Return the current snapshot without loading, regardless of its age"""
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot so the next call reloads"""
+        with self._lock:
+            self._snapshot = None
+
+    def _refresh(self, flight: _Flight) -> None:
+        with priority(Priority.BACKGROUND):
+            self._load(flight)
+
+    def _load(self, flight: _Flight) -> None:
+        taken_at = time.monotonic()
+        try:
+            value = self.loader()
+            digest = None
+            if self.digest is not None:
+                # Hashing the loaded models is reported as part of hydrating them
+                with phase("hydrate"):
+                    digest = self.digest(value)
+            flight.snapshot = Snapshot(value, taken_at, digest)
+        except BaseException as e:
+            flight.error = e
+
+        with self._lock:
+            if flight.snapshot is not None:
+                self._snapshot = flight.snapshot
+            self._flight = None
+        flight.done.set()
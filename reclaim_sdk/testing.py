@@ -0,0 +1,526 @@
+import atexit
+import bisect
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import httpx
+from reclaim_sdk.exceptions import CassetteMiss
+
+_TASK_PATH = re.compile(r"^/api/tasks/(\d+)$")
+_PLANNER_PATH = re.compile(r"^/api/planner/([a-z-]+)/task/(\d+)$")
+
+# Planner actions and the task status they leave behind
+_PLANNER_STATUS = {
+    "done": "COMPLETE",
+    "unarchive": "NEW",
+    "start": "IN_PROGRESS",
+    "stop": "SCHEDULED",
+}
+
+
+def _route(method: str, path: str) -> str:
+    """``calls`` key of a request, with IDs in the path replaced by ``{id}``"""
+    route = _TASK_PATH.sub("/api/tasks/{id}", path)
+    route = _PLANNER_PATH.sub(lambda m: f"/api/planner/{m.group(1)}/task/{{id}}", route)
+    return f"{method} {route}"
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class FakeReclaim:
+    """
+    In-process fake of the Reclaim API endpoints the SDK uses.
+
+    Serves ``/api/tasks``, ``/api/events``, ``/api/timeschemes`` and
+    ``/api/planner/*`` from generated data through an httpx transport, so
+    the SDK and ``api.py`` can be exercised without a live account:
+
+        fake = FakeReclaim(tasks=10_000, events=200_000, latency=0.05)
+        ReclaimClient.configure(token="fake", transport=fake.transport)
+
+    Args:
+        tasks: Number of generated tasks
+        events: Number of generated calendar events, spread over the tasks
+        calendars: Number of connected calendars; with more than one, events
+            are mirrored onto up to ``calendars - 1`` others with the same
+            ``mergeDetails``, and the copies are served for ``allConnected``
+            queries only
+        latency: Seconds every response is delayed by
+        jitter: Extra random delay of up to this many seconds
+        error_rate: Fraction of requests answered with a 503
+        seed: Seed for the generated data, latencies and errors
+    """
+
+    def __init__(
+        self,
+        tasks: int = 100,
+        events: int = 1000,
+        calendars: int = 1,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calendars = calendars
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self.tasks: Dict[int, dict] = {}
+        self._tasks_body: Optional[bytes] = None
+        self._next_id = 1
+        for _ in range(tasks):
+            self._add_task(self._generate_task())
+        self._generate_events(events)
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+    # Data generation
+
+    def _generate_task(self) -> dict:
+        rng = self._random
+        required = rng.randint(1, 16)
+        spent = rng.randint(0, required)
+        due = self._now + timedelta(days=rng.randint(-10, 30), hours=rng.randint(0, 23))
+        return {
+            "title": f"Task {self._next_id}",
+            "notes": rng.choice([None, "", "Some notes"]),
+            "eventCategory": rng.choice(["WORK", "PERSONAL"]),
+            "timeChunksRequired": required,
+            "timeChunksSpent": spent,
+            "timeChunksRemaining": required - spent,
+            "minChunkSize": 1,
+            "maxChunkSize": 8,
+            "priority": rng.choice(["P1", "P2", "P3", "P4"]),
+            "status": rng.choice(["NEW", "SCHEDULED", "SCHEDULED", "IN_PROGRESS", "COMPLETE", "ARCHIVED"]),
+            "atRisk": rng.random() < 0.2,
+            "onDeck": rng.random() < 0.05,
+            "due": _iso(due) if rng.random() < 0.8 else None,
+            "snoozeUntil": _iso(self._now + timedelta(days=rng.randint(1, 5))) if rng.random() < 0.1 else None,
+            "created": _iso(self._now - timedelta(days=rng.randint(1, 90))),
+            "index": float(self._next_id),
+        }
+
+    def _add_task(self, data: dict) -> dict:
+        task = {**data, "id": self._next_id, "updated": _iso(datetime.now(timezone.utc))}
+        self.tasks[task["id"]] = task
+        self._next_id += 1
+        self._tasks_body = None
+        return task
+
+    def _generate_events(self, count: int) -> None:
+        rng = self._random
+        task_ids = list(self.tasks) or [None]
+        self.events: List[dict] = []
+        for i in range(count):
+            start = self._now + timedelta(minutes=15 * rng.randint(-30 * 96, 60 * 96))
+            chunks = rng.randint(1, 8)
+            task_id = rng.choice(task_ids)
+            self.events.append({
+                "eventId": f"evt{i}",
+                "title": f"Task {task_id}" if task_id else f"Meeting {i}",
+                "type": "WORK",
+                "eventStart": _iso(start),
+                "eventEnd": _iso(start + timedelta(minutes=15 * chunks)),
+                "timeChunks": chunks,
+                "calendarId": 1,
+                "key": f"key{i}",
+                "status": "PUBLISHED",
+                "reclaimManaged": task_id is not None,
+                "assist": {
+                    "type": "TASK",
+                    "taskId": task_id,
+                    "lockState": rng.choice(["ADJUSTABLE", "LOCKED"]),
+                    "defended": rng.random() < 0.3,
+                    "pinned": False,
+                } if task_id is not None else None,
+            })
+        if self.calendars > 1:
+            self._mirror_events()
+        self.events.sort(key=lambda event: event["eventStart"])
+        self._event_starts = [event["eventStart"] for event in self.events]
+        self._events_by_task: Dict[int, List[dict]] = {}
+        for event in self.events:
+            if event["assist"]:
+                self._events_by_task.setdefault(event["assist"]["taskId"], []).append(event)
+
+    def _mirror_events(self) -> None:
+        rng = self._random
+        mirrors = []
+        for i, event in enumerate(self.events):
+            copies = rng.randint(0, self.calendars - 1)
+            if not copies:
+                continue
+            event["mergeDetails"] = {
+                "key": f"merge{i}",
+                "type": "SYNC",
+                "sourceCalendarId": "primary@example.com",
+                "sourceReclaimCalendarId": event["calendarId"],
+            }
+            for calendar_id in rng.sample(range(2, self.calendars + 1), copies):
+                mirrors.append({
+                    **event,
+                    "eventId": f"{event['eventId']}-{calendar_id}",
+                    "calendarId": calendar_id,
+                    "reclaimManaged": False,
+                })
+        self.events.extend(mirrors)
+
+    # Request handling
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        method, path = request.method, request.url.path
+        with self._lock:
+            self.calls[_route(method, path)] += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+            failed = self.error_rate and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return httpx.Response(503, json={"message": "Service unavailable (fake)"})
+
+        if path == "/api/tasks":
+            if method == "GET":
+                return self._list_tasks()
+            if method == "POST":
+                with self._lock:
+                    return httpx.Response(200, json=self._add_task(json.loads(request.content)))
+        if path == "/api/tasks/reindex-by-due" and method == "PATCH":
+            return httpx.Response(200, json={})
+        match = _TASK_PATH.match(path)
+        if match:
+            return self._task(method, int(match.group(1)), request)
+        match = _PLANNER_PATH.match(path)
+        if match and method == "POST":
+            return self._planner(match.group(1), int(match.group(2)), request)
+        if path == "/api/events" and method == "GET":
+            return self._list_events(request.url.params)
+        if path == "/api/timeschemes" and method == "GET":
+            return httpx.Response(200, json=self._timeschemes())
+        return httpx.Response(404, json={"message": f"No fake for {method} {path}"})
+
+    def _list_tasks(self) -> httpx.Response:
+        with self._lock:
+            if self._tasks_body is None:
+                self._tasks_body = json.dumps(list(self.tasks.values())).encode("utf-8")
+            body = self._tasks_body
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    def _task(self, method: str, task_id: int, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return httpx.Response(404, json={"message": "Task not found"})
+            if method == "GET":
+                return httpx.Response(200, json=task)
+            if method in ("PATCH", "PUT"):
+                task.update(json.loads(request.content))
+                task["id"] = task_id
+                task["updated"] = _iso(datetime.now(timezone.utc))
+                self._tasks_body = None
+                return httpx.Response(200, json=task)
+            if method == "DELETE":
+                del self.tasks[task_id]
+                self._tasks_body = None
+                return httpx.Response(204)
+        return httpx.Response(405, json={"message": "Method not allowed"})
+
+    def _planner(self, action: str, task_id: int, request: httpx.Request) -> httpx.Response:
+        minutes = int(request.url.params.get("minutes", 0))
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return httpx.Response(404, json={"message": "Task not found"})
+            if action in _PLANNER_STATUS:
+                task["status"] = _PLANNER_STATUS[action]
+            elif action == "log-work":
+                task["timeChunksSpent"] = (task.get("timeChunksSpent") or 0) + minutes // 15
+                task["timeChunksRemaining"] = max(0, (task.get("timeChunksRemaining") or 0) - minutes // 15)
+            elif action == "add-time":
+                task["timeChunksRequired"] = (task.get("timeChunksRequired") or 0) + minutes // 15
+                task["timeChunksRemaining"] = (task.get("timeChunksRemaining") or 0) + minutes // 15
+            task["updated"] = _iso(datetime.now(timezone.utc))
+            self._tasks_body = None
+            return httpx.Response(200, json={"taskOrHabit": task})
+
+    def _list_events(self, params: httpx.QueryParams) -> httpx.Response:
+        # The API treats start and end as whole days, end inclusive
+        start = params.get("start", "0000")
+        end = (
+            datetime.strptime(params["end"], "%Y-%m-%d") + timedelta(days=1)
+        ).strftime("%Y-%m-%d") if "end" in params else "9999"
+        task_ids = params.get("taskIds")
+        if task_ids:
+            candidates = []
+            for task_id in task_ids.split(","):
+                candidates.extend(self._events_by_task.get(int(task_id), ()))
+            events = [event for event in candidates if start <= event["eventStart"] < end]
+        else:
+            low = bisect.bisect_left(self._event_starts, start)
+            high = bisect.bisect_left(self._event_starts, end)
+            events = self.events[low:high]
+        if self.calendars > 1 and params.get("allConnected") == "false":
+            events = [event for event in events if event["calendarId"] == 1]
+        return httpx.Response(200, json=events)
+
+    def _timeschemes(self) -> List[dict]:
+        return [
+            {
+                "id": f"scheme-{name.lower()}",
+                "status": "ACTIVE",
+                "taskCategory": category,
+                "title": name,
+                "description": f"{name} hours",
+                "features": ["TASK_ASSIGNMENT"],
+            }
+            for name, category in (("Working", "WORK"), ("Personal", "PERSONAL"))
+        ]
+
+
+# JSON keys whose string values a cassette masks by default: event and task
+# content and people, not the IDs, times and flags that shape the workload
+SCRUB_FIELDS = frozenset({
+    "title",
+    "titleSeenByOthers",
+    "notes",
+    "description",
+    "location",
+    "organizer",
+    "attendees",
+    "onlineMeetingUrl",
+    "email",
+    "name",
+})
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)+")
+_MASKED = re.compile(r"[^\W_]")
+
+
+def _mask(value: str) -> str:
+    # Keeps the length and punctuation, so payload sizes stay realistic
+    return _MASKED.sub("x", value)
+
+
+def _scrub(value, fields: frozenset, masked: bool = False):
+    if isinstance(value, dict):
+        return {key: _scrub(item, fields, masked or key in fields) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_scrub(item, fields, masked) for item in value]
+    if isinstance(value, str):
+        if masked:
+            return _mask(value)
+        return _EMAIL.sub(lambda m: _mask(m.group(0)), value)
+    return value
+
+
+class Cassette:
+    """
+    Records API responses to a JSON file once and replays them offline.
+
+    Pass its transport to the client. With ``mode="auto"`` the first run
+    records (and needs a real token), later runs replay the file:
+
+        cassette = Cassette("cassettes/events.json", latency=0.05)
+        ReclaimClient.configure(token=token, transport=cassette.transport)
+        ...
+        cassette.save()
+
+    Or set ``RECLAIM_CASSETTE=cassettes/events.json`` to have clients
+    configured without a transport use ``Cassette.shared(path)``, which is
+    saved at exit.
+
+    Requests match by method, path and query parameters, except those in
+    ``ignore_params``; repeated requests replay their recorded responses in
+    order, then the last one again. Request headers, and with them the
+    token, are never recorded. Response bodies are scrubbed before saving:
+    strings under ``scrub_fields`` and e-mail addresses anywhere are masked
+    with their length kept, and ``scrub``, if given, gets each decoded body
+    to change further. Relative date ranges (``list_future_events``) need
+    ``ignore_params=("start", "end")`` to replay on later days. A request
+    that was not recorded raises ``CassetteMiss``, a ``ReclaimAPIError``.
+
+    Args:
+        path: Cassette file
+        mode: ``"auto"`` (replay if the file exists, else record),
+            ``"record"`` or ``"replay"``
+        latency: Seconds every replayed response is delayed by
+        jitter: Extra random delay of up to this many seconds
+        recorded_latency: Also wait as long as the recorded request took
+        ignore_params: Query parameters left out when matching requests
+        scrub_fields: JSON keys whose values are masked when recording
+        scrub: Function applied to each decoded body when recording
+        upstream: Transport recorded requests are sent through
+        seed: Seed for the jitter
+    """
+
+    _instances: Dict[str, "Cassette"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "auto",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        recorded_latency: bool = False,
+        ignore_params: Sequence[str] = (),
+        scrub_fields: Iterable[str] = SCRUB_FIELDS,
+        scrub: Optional[Callable] = None,
+        upstream: Optional[httpx.BaseTransport] = None,
+        seed: int = 0,
+    ):
+        if mode not in ("auto", "record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = os.path.abspath(path)
+        self.recording = mode == "record" or (mode == "auto" and not os.path.exists(self.path))
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_latency = recorded_latency
+        self.ignore_params = frozenset(ignore_params)
+        self.scrub_fields = frozenset(scrub_fields)
+        self.scrub = scrub
+        self.upstream = upstream
+        self.calls: Counter = Counter()
+        self.interactions: List[dict] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replay: Dict[Tuple, List[Tuple[httpx.Headers, int, bytes, float]]] = {}
+        self._played: Counter = Counter()
+        self._transport = httpx.MockTransport(self.handle)
+        if not self.recording:
+            self._load()
+
+    @classmethod
+    def shared(cls, path: str, **options) -> "Cassette":
+        """The process-wide cassette for ``path``, saved at exit if it recorded"""
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            cassette = cls._instances.get(path)
+            if cassette is None:
+                cassette = cls(path, **options)
+                cls._instances[path] = cassette
+                atexit.register(cassette.save)
+            return cassette
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return self._transport
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.save()
+
+    def _key(self, method: str, url: httpx.URL) -> Tuple:
+        params = tuple(sorted(
+            (name, value) for name, value in url.params.multi_items() if name not in self.ignore_params
+        ))
+        return method, url.path, params
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            self.interactions = json.load(f)["interactions"]
+        for interaction in self.interactions:
+            request, response = interaction["request"], interaction["response"]
+            url = httpx.URL(request["path"], params=request["query"])
+            if "json" in response:
+                content = json.dumps(response["json"], separators=(",", ":")).encode("utf-8")
+            else:
+                content = response["text"].encode("utf-8")
+            self._replay.setdefault(self._key(request["method"], url), []).append(
+                (httpx.Headers(response["headers"]), response["status"], content, response["elapsed"])
+            )
+
+    def save(self) -> None:
+        """Write the recorded interactions to ``path``"""
+        if not self.recording:
+            return
+        with self._lock:
+            data = {"version": 1, "interactions": list(self.interactions)}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(temporary, self.path)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.calls[_route(request.method, request.url.path)] += 1
+        if self.recording:
+            return self._record(request)
+        return self._play(request)
+
+    def _play(self, request: httpx.Request) -> httpx.Response:
+        key = self._key(request.method, request.url)
+        with self._lock:
+            responses = self._replay.get(key)
+            if not responses:
+                raise CassetteMiss(f"No recorded response for {request.method} {request.url} in {self.path}")
+            played = self._played[key]
+            self._played[key] += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+        headers, status, content, elapsed = responses[min(played, len(responses) - 1)]
+        if self.recorded_latency:
+            delay += elapsed
+        if delay:
+            time.sleep(delay)
+        return httpx.Response(status, headers=headers, content=content)
+
+    def _record(self, request: httpx.Request) -> httpx.Response:
+        if self.upstream is None:
+            self.upstream = httpx.HTTPTransport()
+        started = time.monotonic()
+        upstream = self.upstream.handle_request(request)
+        try:
+            content = upstream.read()
+        finally:
+            upstream.close()
+        elapsed = time.monotonic() - started
+
+        headers = {"content-type": upstream.headers.get("content-type", "application/json")}
+        recorded = {"status": upstream.status_code, "headers": headers, "elapsed": round(elapsed, 4)}
+        try:
+            body = json.loads(content)
+        except ValueError:
+            recorded["text"] = _EMAIL.sub(lambda m: _mask(m.group(0)), content.decode("utf-8", "replace"))
+        else:
+            body = _scrub(body, self.scrub_fields)
+            recorded["json"] = self.scrub(body) if self.scrub is not None else body
+        with self._lock:
+            self.interactions.append({
+                "request": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "query": request.url.params.multi_items(),
+                },
+                "response": recorded,
+            })
+        # The caller gets the real body, already decoded, so without the
+        # upstream's encoding headers; only the cassette is scrubbed
+        return httpx.Response(upstream.status_code, headers=headers, content=content)
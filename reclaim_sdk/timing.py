@@ -0,0 +1,108 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Phases the SDK and api.py report, in Server-Timing header order; throttle
+# is time spent waiting for the client-side rate limiter
+PHASES = ("throttle", "upstream", "hydrate", "filter", "enrich", "render")
+
+
+class RequestTimings:
+    """
+    Time spent per phase while serving one request.
+
+    Phases record exclusive time: a phase nested in another is subtracted
+    from the outer one, so an enrichment that calls the API shows up as
+    ``upstream`` and only its own overhead as ``enrich``. Phases running in
+    worker threads add to the same totals. Nested phases that run in
+    parallel (``client.map``, an executor) each subtract their full time,
+    so together they can exceed the outer phase's wall time; the outer
+    phase then reports 0 rather than a negative duration.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """The ``Server-Timing`` header value, durations in milliseconds"""
+        names = [name for name in PHASES if name in self.durations]
+        names += sorted(name for name in self.durations if name not in PHASES)
+        entries = [
+            f'{name};dur={self.durations[name] * 1000:.1f};desc="{self.counts[name]}x"'
+            for name in names
+        ]
+        entries.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(entries)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "total_ms": round(self.total * 1000, 1),
+            "phases": {
+                name: {"ms": round(seconds * 1000, 1), "count": self.counts[name]}
+                for name, seconds in self.durations.items()
+            },
+        }
+
+
+class _Frame:
+    __slots__ = ("nested",)
+
+    def __init__(self):
+        self.nested = 0.0
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("reclaim_request_timings", default=None)
+_frame: ContextVar[Optional[_Frame]] = ContextVar("reclaim_timing_frame", default=None)
+
+
+@contextmanager
+def record_timings() -> Iterator[RequestTimings]:
+    """Collect the phases timed inside the block, including threadpool work it starts"""
+    timings = RequestTimings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as ``name``; a no-op outside ``record_timings()``"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    parent = _frame.get()
+    frame = _Frame()
+    token = _frame.set(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _frame.reset(token)
+        # Children running in worker threads update the same parent frame
+        with timings._lock:
+            if parent is not None:
+                parent.nested += elapsed
+            nested = frame.nested
+        timings.add(name, max(0.0, elapsed - nested))
@@ -0,0 +1,227 @@
+import itertools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, List, Mapping, Optional
+
+
+class Span:
+    """
+    The span handed to instrumented code, which may add attributes to it.
+
+    This base class records nothing and is what ``span()`` returns while no
+    tracer is set, so instrumentation costs one global lookup.
+    """
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NOOP_SPAN = Span()
+
+
+class Tracer:
+    """Creates spans; subclasses send them somewhere, this one drops them"""
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> ContextManager[Span]:
+        return _NOOP_SPAN
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Send the SDK's spans to ``tracer`` (``None`` turns tracing off); returns the previous one"""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Use ``tracer`` inside the block, e.g. an ``InMemoryTracer`` in a test"""
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Span]:
+    """A span named ``name`` of the current tracer, or a shared no-op span"""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.start_span(name, attributes)
+
+
+_current_span: ContextVar[Optional["RecordedSpan"]] = ContextVar("reclaim_current_span", default=None)
+
+
+class RecordedSpan(Span):
+    """A span kept by ``InMemoryTracer``, linked to the span it was started in"""
+
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "start", "end", "error", "_tracer", "_token")
+
+    def __init__(self, tracer: "InMemoryTracer", name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(tracer._ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end - self.start if self.end is not None else None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.error = type(exception).__name__
+
+    def __enter__(self) -> "RecordedSpan":
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.record_exception(exc)
+        self._tracer._finish(self)
+        return False
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan({self.name!r}, {self.attributes!r})"
+
+
+class InMemoryTracer(Tracer):
+    """
+    Keeps finished spans in memory, for tests and ad-hoc profiling.
+
+    Spans started inside another span, including in threads started from
+    it, are its children. ``fan_out()`` counts what one operation expands
+    into, e.g. how many event lookups a single summary request makes:
+
+        tracer = InMemoryTracer()
+        with tracing(tracer), span("summary"):
+            render_summary(...)
+        tracer.fan_out("summary")  # Counter({"reclaim.request": 584, ...})
+    """
+
+    def __init__(self):
+        self.spans: List[RecordedSpan] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> RecordedSpan:
+        return RecordedSpan(self, name, dict(attributes))
+
+    def _finish(self, span: RecordedSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+    def find(self, name: str) -> List[RecordedSpan]:
+        """Finished spans named ``name``, in the order they ended"""
+        return [span for span in self.spans if span.name == name]
+
+    def children(self, parent: RecordedSpan) -> List[RecordedSpan]:
+        return [span for span in self.spans if span.parent_id == parent.span_id]
+
+    def counts(self) -> Counter:
+        """Number of finished spans per name"""
+        return Counter(span.name for span in self.spans)
+
+    def fan_out(self, name: str) -> Counter:
+        """Number of spans per name started anywhere below spans named ``name``"""
+        spans = list(self.spans)
+        parents = {span.span_id: span.parent_id for span in spans}
+        roots = {span.span_id for span in spans if span.name == name}
+        result: Counter = Counter()
+        for span in spans:
+            ancestor = span.parent_id
+            while ancestor is not None and ancestor not in roots:
+                ancestor = parents.get(ancestor)
+            if ancestor is not None:
+                result[span.name] += 1
+        return result
+
+
+class _OpenTelemetrySpan(Span):
+    __slots__ = ("_span",)
+
+    def __init__(self, otel_span):
+        self._span = otel_span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self._span.set_attribute(f"reclaim.{key}", _otel_value(value))
+
+    def record_exception(self, exception: BaseException) -> None:
+        self._span.record_exception(exception)
+
+
+def _otel_value(value: Any) -> Any:
+    # OpenTelemetry only takes primitives and sequences of them as attributes
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def _otel_attributes(attributes: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
+        f"reclaim.{key}": _otel_value(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Sends spans to OpenTelemetry as children of the current OpenTelemetry span.
+
+    Needs the ``opentelemetry-api`` package; exporting is configured as usual
+    through the OpenTelemetry SDK. Attributes are prefixed with ``reclaim.``.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryTracer requires the opentelemetry-api package"
+            ) from e
+        self._tracer = tracer or trace.get_tracer("reclaim_sdk")
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        with self._tracer.start_as_current_span(name, attributes=_otel_attributes(attributes)) as otel_span:
+            yield _OpenTelemetrySpan(otel_span)
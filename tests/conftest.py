@@ -0,0 +1,24 @@
+import pytest
+
+from reclaim_sdk.client import ReclaimClient
+from reclaim_sdk.testing import FakeReclaim
+
+
+@pytest.fixture(autouse=True)
+def unconfigured(monkeypatch):
+    """Every test starts without a configured client or token"""
+    monkeypatch.delenv("RECLAIM_TOKEN", raising=False)
+    monkeypatch.delenv("RECLAIM_CASSETTE", raising=False)
+    monkeypatch.setattr(ReclaimClient, "_instance", None)
+    monkeypatch.setattr(ReclaimClient, "_config", None)
+    monkeypatch.setattr(ReclaimClient, "_clients", {})
+
+
+@pytest.fixture
+def fake():
+    return FakeReclaim(tasks=20, events=200)
+
+
+@pytest.fixture
+def client(fake):
+    return ReclaimClient.configure(token="test", transport=fake.transport, circuit_breaker=False)
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from reclaim_sdk.cache import CacheBackend, SQLiteCache
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_sqlite_cache_counts_writes_from_all_threads(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=10)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache.set(f"key-{i}", b"x", stored_at=i), range(640)))
+
+    assert cache._writes == 640
+    # The 640th write pruned everything but the newest entries
+    assert cache.get("key-639") is not None
+    assert cache.get("key-0") is None
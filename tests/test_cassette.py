@@ -0,0 +1,75 @@
+import pytest
+
+from reclaim_sdk.cache import MemoryCache
+from reclaim_sdk.client import ReclaimClient
+from reclaim_sdk.exceptions import ReclaimAPIError
+from reclaim_sdk.resources.task import Task
+from reclaim_sdk.testing import Cassette, CassetteMiss
+
+
+def test_record_then_replay_scrubbed(fake, tmp_path):
+    path = str(tmp_path / "tasks.json")
+    fake.tasks[1].update(title="Call Alice", notes="Ask about the offer")
+    fake.tasks[2]["snoozeReason"] = "Waiting for alice@example.com"
+
+    with Cassette(path, mode="record", upstream=fake.transport) as cassette:
+        client = ReclaimClient.configure(token="secret-token", transport=cassette.transport)
+        recorded = client.get("/api/tasks")
+        client.get("/api/tasks/1")
+    assert cassette.total_calls == 2
+
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    for secret in ("secret-token", "Call Alice", "Ask about the offer", "alice@example.com"):
+        assert secret not in content
+
+    fake.reset_calls()
+    cassette = Cassette(path, mode="replay")
+    client = ReclaimClient.configure(token="other-token", transport=cassette.transport)
+    replayed = client.get("/api/tasks")
+
+    assert len(replayed) == len(recorded)
+    first = next(task for task in replayed if task["id"] == 1)
+    # Masked with the length and punctuation kept; everything else as recorded
+    assert first["title"] == "xxxx xxxxx"
+    assert first["notes"] == "xxx xxxxx xxx xxxxx"
+    assert first["priority"] == fake.tasks[1]["priority"]
+    snoozed = next(task for task in replayed if task["id"] == 2)
+    assert snoozed["snoozeReason"] == "Waiting for xxxxx@xxxxxxx.xxx"
+    assert Task.get(1, client=client).title == "xxxx xxxxx"
+    assert fake.total_calls == 0
+
+
+def test_replay_miss_is_an_api_error(fake, tmp_path):
+    path = str(tmp_path / "tasks.json")
+    with Cassette(path, mode="record", upstream=fake.transport) as cassette:
+        ReclaimClient.configure(token="test", transport=cassette.transport).get("/api/tasks")
+
+    cassette = Cassette(path, mode="replay")
+    client = ReclaimClient.configure(token="test", transport=cassette.transport)
+    for i in range(5):
+        with pytest.raises(CassetteMiss) as raised:
+            client.get("/api/tasks", params={"x": i})
+        assert isinstance(raised.value, ReclaimAPIError)
+
+    # Misses do not open the circuit for the recorded requests
+    assert client.circuit_breakers.for_endpoint("/api/tasks").state == "closed"
+    assert len(client.get("/api/tasks")) == len(fake.tasks)
+
+
+def test_replay_miss_is_not_served_stale(fake, tmp_path):
+    path = str(tmp_path / "tasks.json")
+    with Cassette(path, mode="record", upstream=fake.transport) as cassette:
+        ReclaimClient.configure(token="test", transport=cassette.transport).get("/api/tasks")
+    last_good = MemoryCache()
+    live = ReclaimClient.configure(
+        token="test", transport=fake.transport, stale_fallback=True, last_good_cache=last_good
+    )
+    live.get("/api/timeschemes")
+
+    cassette = Cassette(path, mode="replay")
+    client = ReclaimClient.configure(
+        token="test", transport=cassette.transport, stale_fallback=True, last_good_cache=last_good
+    )
+    with pytest.raises(CassetteMiss):
+        client.get("/api/timeschemes")
@@ -0,0 +1,40 @@
+import time
+
+import httpx
+import pytest
+
+from reclaim_sdk.client import ReclaimClient
+from reclaim_sdk.exceptions import CircuitOpenError, ReclaimAPIError
+
+
+def test_unexpected_error_in_probe_frees_the_breaker():
+    outcomes = ["503", "boom", "ok"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = outcomes.pop(0)
+        if outcome == "boom":
+            raise RuntimeError("transport bug")
+        if outcome == "503":
+            return httpx.Response(503, json={"message": "down"})
+        return httpx.Response(200, json=[])
+
+    client = ReclaimClient.configure(
+        token="test",
+        transport=httpx.MockTransport(handler),
+        circuit_failure_threshold=1,
+        circuit_recovery_timeout=0.01,
+    )
+    with pytest.raises(ReclaimAPIError):
+        client.get("/api/tasks")
+    with pytest.raises(CircuitOpenError):
+        client.get("/api/tasks")
+
+    time.sleep(0.02)
+    with pytest.raises(RuntimeError):
+        client.get("/api/tasks")
+    breaker = client.circuit_breakers.for_endpoint("/api/tasks")
+    assert breaker.state == "open"
+
+    time.sleep(0.02)
+    assert client.get("/api/tasks") == []
+    assert breaker.state == "closed"
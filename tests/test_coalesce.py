@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from reclaim_sdk.client import ReclaimClient
+
+
+def test_reconfiguring_sends_open_windows(fake):
+    client = ReclaimClient.configure(token="test", transport=fake.transport, planner_coalesce_window=60)
+    spent = fake.tasks[1]["timeChunksSpent"]
+    futures = [client.planner_coalescer.submit("log-work", 1, {"minutes": 15}) for _ in range(2)]
+
+    ReclaimClient.configure(token="test", transport=fake.transport)
+
+    assert all(future.done() for future in futures)
+    assert fake.calls["POST /api/planner/log-work/task/{id}"] == 1
+    assert fake.tasks[1]["timeChunksSpent"] == spent + 2
+
+
+def test_open_windows_are_sent_at_exit():
+    script = textwrap.dedent("""
+        import httpx
+        from reclaim_sdk.client import ReclaimClient
+        from reclaim_sdk.testing import FakeReclaim
+
+        fake = FakeReclaim(tasks=5, events=0)
+
+        def handle(request):
+            print(request.method, request.url.path, request.url.params, flush=True)
+            return fake.handle(request)
+
+        client = ReclaimClient.configure(
+            token="test", transport=httpx.MockTransport(handle), planner_coalesce_window=60
+        )
+        client.planner_coalescer.submit("log-work", 1, {"minutes": 15})
+        client.planner_coalescer.submit("log-work", 1, {"minutes": 15})
+    """)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=root, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["POST /api/planner/log-work/task/1 minutes=30"]
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api import TaskListQuery
+from reclaim_sdk.index import TaskIndex
+from reclaim_sdk.query import TaskQuery
+from reclaim_sdk.resources.task import Task, TaskPriority, TaskStatus
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+PRIORITIES = [TaskPriority.P1, TaskPriority.P2, TaskPriority.P3, TaskPriority.P4, None]
+STATUSES = list(TaskStatus)
+
+# Mixed directions, ties and tasks without a value in every key
+SORTS = [
+    "due",
+    "-due",
+    "priority,-due",
+    "-priority,title",
+    "status,-snooze_until",
+    "duration",
+    "-duration,due",
+    "snooze_until,-title",
+]
+
+
+def make_task(i: int) -> Task:
+    data = {
+        "id": i,
+        "title": f"Task {i % 7}",
+        "status": STATUSES[i % len(STATUSES)],
+        "atRisk": i % 3 == 0,
+        "due": NOW + timedelta(days=i % 11 - 5, hours=i % 4) if i % 6 else None,
+        "snoozeUntil": NOW + timedelta(days=i % 4) if i % 5 == 1 else None,
+        "timeChunksRequired": i % 9,
+    }
+    if PRIORITIES[i % 5] is not None:
+        data["priority"] = PRIORITIES[i % 5]
+    return Task.from_api_data(data)
+
+
+@pytest.fixture
+def tasks(client):
+    return [make_task(i) for i in range(1, 81)]
+
+
+def reference_sort(tasks, keys):
+    """Stable sort by ``keys``, tasks without a value last in either direction"""
+    result = list(tasks)
+    for key in reversed(keys):
+        name, descending = key.lstrip("-"), key.startswith("-")
+        present = [task for task in result if getattr(task, name) is not None]
+        missing = [task for task in result if getattr(task, name) is None]
+        result = sorted(present, key=lambda task: getattr(task, name), reverse=descending) + missing
+    return result
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_order_and_top_k_match_a_full_sort(tasks, sort):
+    keys = sort.split(",")
+    expected = ids(reference_sort(tasks, keys))
+    query = TaskQuery(tasks).order_by(*keys)
+
+    assert ids(query.all()) == expected
+    for limit in (1, 7, len(tasks)):
+        assert ids(query.limit(limit).all()) == expected[:limit]
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_after_pages_through_the_full_order(tasks, sort):
+    query = TaskQuery(tasks).order_by(*sort.split(","), "id")
+    pages = []
+    page = query.limit(7).all()
+    while page:
+        pages.extend(page)
+        page = query.after(query.sort_values(page[-1])).limit(7).all()
+
+    assert ids(pages) == ids(query.all())
+
+
+@pytest.mark.parametrize("sort", SORTS)
+@pytest.mark.parametrize("statuses", [None, {TaskStatus.SCHEDULED, TaskStatus.NEW}])
+def test_cursor_pages_reproduce_the_full_sort(tasks, sort, statuses):
+    index = TaskIndex(tasks, now=NOW)
+    expected, next_cursor, total = TaskListQuery(statuses=statuses, sort=sort).apply(index)
+    assert next_cursor is None
+
+    pages = []
+    cursor = None
+    while True:
+        # The cursor goes through JSON and back, as between two requests
+        query = TaskListQuery(statuses=statuses, sort=sort, limit=7, cursor=cursor)
+        page, cursor, page_total = query.apply(index)
+        assert page_total == total
+        assert len(page) <= 7
+        pages.extend(page)
+        if cursor is None:
+            break
+        assert len(page) == 7
+
+    assert ids(pages) == ids(expected)
+    assert len(pages) == total
+
+
+def test_exact_page_has_no_next_cursor(tasks):
+    count = len(TaskListQuery(sort="due").apply(tasks)[0])
+
+    page, next_cursor, _ = TaskListQuery(sort="due", limit=count).apply(tasks)
+
+    assert len(page) == count
+    assert next_cursor is None
+
+
+def test_index_buckets_match_the_list_filters(tasks):
+    index = TaskIndex(tasks, now=NOW)
+    active = [task for task in tasks if task.status not in (TaskStatus.ARCHIVED, TaskStatus.CANCELLED)]
+    rank = {TaskPriority.P1: 1, TaskPriority.P2: 2, TaskPriority.P3: 3, TaskPriority.P4: 4}
+
+    overdue = [task for task in active if task.due and task.due < NOW]
+    at_risk = [task for task in active if task.at_risk]
+    upcoming = sorted((task for task in active if task.due and task.due >= NOW), key=lambda task: task.due)
+    assert ids(index.active) == ids(active)
+    assert ids(index.overdue) == ids(overdue)
+    assert ids(index.at_risk) == ids(at_risk)
+    # Every bucket but upcoming keeps snapshot order
+    assert ids(index.at_risk_upcoming) == ids(task for task in at_risk if task.due and task.due >= NOW)
+    assert ids(index.upcoming) == ids(upcoming)
+    assert ids(index.today) == ids(task for task in upcoming if (task.due - NOW).days <= 0)
+    assert ids(index.tomorrow) == ids(task for task in upcoming if (task.due - NOW).days == 1)
+    assert ids(index.this_week) == ids(task for task in upcoming if (task.due - NOW).days <= 7)
+    for name, bucket in (("overdue", overdue), ("at_risk", at_risk)):
+        assert ids(index.ranked(name)) == ids(sorted(bucket, key=lambda task: rank.get(task.priority, 5)))
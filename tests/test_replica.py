@@ -0,0 +1,152 @@
+import pytest
+
+from reclaim_sdk import replica as replica_module
+from reclaim_sdk.replica import (
+    MemoryReplicaStore,
+    ReplicaStore,
+    SQLiteReplicaStore,
+    TaskReplica,
+)
+from reclaim_sdk.resources.task import Task
+
+
+@pytest.fixture
+def loaded(fake, client):
+    replica = TaskReplica(client=client)
+    replica.load()
+    fake.reset_calls()
+    return replica
+
+
+def test_replica_store_is_abstract():
+    with pytest.raises(TypeError):
+        ReplicaStore()
+
+
+def test_changes_are_queued_without_requests(fake, loaded):
+    task = loaded.get(1)
+    task.title = "Renamed offline"
+    loaded.save(task)
+    loaded.log_work(task, 30)
+
+    assert fake.total_calls == 0
+    assert [mutation.action for mutation in loaded.pending()] == ["save", "log-work"]
+    assert loaded.get(1).title == "Renamed offline"
+    assert fake.tasks[1]["title"] == "Task 1"
+
+
+def test_flush_merges_consecutive_changes(fake, loaded):
+    task = loaded.get(1)
+    spent = fake.tasks[1]["timeChunksSpent"]
+    for _ in range(4):
+        loaded.log_work(task, 15)
+    task.title = "First"
+    loaded.save(task)
+    task.notes = "Second"
+    loaded.save(task)
+
+    result = loaded.flush()
+
+    assert result.sent == 2
+    assert result.merged == 4
+    assert result.remaining == 0
+    assert fake.calls["POST /api/planner/log-work/task/{id}"] == 1
+    assert fake.calls["PATCH /api/tasks/{id}"] == 1
+    assert fake.tasks[1]["timeChunksSpent"] == spent + 4
+    assert (fake.tasks[1]["title"], fake.tasks[1]["notes"]) == ("First", "Second")
+    assert loaded.pending() == []
+
+
+def test_failed_flush_is_retried_with_backoff(fake, loaded, monkeypatch):
+    task = loaded.get(1)
+    loaded.mark_complete(task)
+    fake.error_rate = 1.0
+
+    result = loaded.flush()
+    assert (result.sent, result.retrying, result.remaining) == (0, 1, 1)
+    mutation = loaded.pending()[0]
+    assert mutation.attempts == 1
+    assert mutation.not_before > 0
+
+    # Still backing off: nothing is sent
+    fake.error_rate = 0.0
+    fake.reset_calls()
+    assert loaded.flush().sent == 0
+    assert fake.total_calls == 0
+
+    monkeypatch.setattr(replica_module.time, "time", lambda: mutation.not_before + 1)
+    result = loaded.flush()
+    assert (result.sent, result.remaining) == (1, 0)
+    assert fake.tasks[1]["status"] == "COMPLETE"
+
+
+@pytest.mark.parametrize("on_conflict, expected", [("server", "Server title"), ("local", "Local title")])
+def test_conflicting_server_change(fake, client, on_conflict, expected):
+    replica = TaskReplica(client=client, on_conflict=on_conflict)
+    replica.load()
+    task = replica.get(1)
+    task.title = "Local title"
+    task.notes = "Local notes"
+    replica.save(task)
+    fake.tasks[1].update(title="Server title", updated="2099-01-01T00:00:00.000Z")
+
+    result = replica.flush()
+
+    assert [conflict.fields for conflict in result.conflicts] == [["title"]]
+    assert fake.tasks[1]["title"] == expected
+    assert fake.tasks[1]["notes"] == "Local notes"
+    assert replica.get(1).title == expected
+
+
+def test_created_task_gets_the_api_id(fake, loaded):
+    task = Task(title="Created offline")
+    loaded.save(task)
+    assert task.id < 0
+    loaded.add_time(task, 1)
+
+    result = loaded.flush()
+
+    new_id = result.created[task.id]
+    assert fake.tasks[new_id]["title"] == "Created offline"
+    assert fake.tasks[new_id]["timeChunksRequired"] == 4
+    # The temporary id keeps working
+    assert loaded.get(task.id).id == new_id
+    assert loaded.pending() == []
+
+
+def test_sqlite_queue_survives_reopening(fake, client, tmp_path):
+    path = str(tmp_path / "replica.db")
+    replica = TaskReplica(SQLiteReplicaStore(path), client=client)
+    replica.load()
+    task = replica.get(2)
+    task.title = "Queued"
+    replica.save(task)
+    replica.save(Task(title="New"))
+    fake.reset_calls()
+
+    reopened = TaskReplica(SQLiteReplicaStore(path), client=client)
+    assert [mutation.action for mutation in reopened.pending()] == ["save", "create"]
+    assert reopened.get(2).title == "Queued"
+
+    result = reopened.flush()
+    assert (result.sent, result.remaining) == (2, 0)
+    assert fake.tasks[2]["title"] == "Queued"
+    assert TaskReplica(SQLiteReplicaStore(path), client=client).pending() == []
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_commit_sent_is_all_or_nothing(tmp_path, store_type):
+    store = MemoryReplicaStore() if store_type == "memory" else SQLiteReplicaStore(str(tmp_path / "r.db"))
+    store.save_tasks({1: {"id": 1, "title": "Before"}})
+    create = store.append(replica_module.Mutation(-1, "create", {"data": {"title": "New"}}))
+    store.append(replica_module.Mutation(-1, "done", {}))
+
+    if store_type == "sqlite":
+        # A server copy that cannot be stored fails the whole commit
+        with pytest.raises(TypeError):
+            store.commit_sent(create.seqs, {7: {"id": 7, "bad": object()}}, remap=(-1, 7))
+        assert [(m.task_id, m.action) for m in store.pending()] == [(-1, "create"), (-1, "done")]
+
+    store.commit_sent(create.seqs, {7: {"id": 7, "title": "New"}}, remap=(-1, 7))
+    assert [(m.task_id, m.action) for m in store.pending()] == [(7, "done")]
+    assert store.load_tasks()[7]["title"] == "New"
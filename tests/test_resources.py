@@ -0,0 +1,39 @@
+import json
+
+from reclaim_sdk.resources.event import Event
+from reclaim_sdk.resources.task import Task
+
+
+def test_token_configures_client_before_any_other():
+    task = Task(token="abc", title="x")
+
+    assert task._client._config.token == "abc"
+    assert "token" not in task.to_api_data()
+    assert "abc" not in repr(task)
+
+
+def test_list_binds_fetching_client(client, fake):
+    tasks = Task.list(client=client)
+
+    assert [task.id for task in tasks] == sorted(fake.tasks)
+    assert all(task._client is client for task in tasks)
+
+
+def test_from_api_json_flattens_nested_objects(client):
+    content = json.dumps([
+        {
+            "eventId": "a",
+            "taskId": 1,
+            "assist": {"taskId": 2, "type": "TASK", "pinned": True},
+            "mergeDetails": {"key": "k", "sourceCalendarId": "cal"},
+        },
+        {"eventId": "b", "taskId": 3, "assist": None, "mergeKey": "top"},
+    ]).encode()
+
+    first, second = Event.from_api_json(content, client)
+
+    assert (first.task_id, first.assist_type, first.pinned) == (2, "TASK", True)
+    assert (first.merge_key, first.source_calendar_id) == ("k", "cal")
+    assert (second.task_id, second.merge_key) == (3, "top")
+    assert first._client is client
+    assert Event.from_api_data(json.loads(content)[0]).model_dump() == first.model_dump()
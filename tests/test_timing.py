@@ -0,0 +1,52 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pytest
+
+from reclaim_sdk import timing
+from reclaim_sdk.timing import phase, record_timings
+
+
+def run_parallel(fn, count, workers=4):
+    context = copy_context()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(context.copy().run, fn) for _ in range(count)]:
+            future.result()
+
+
+def test_parallel_children_clamp_the_parent_to_zero():
+    def enrich():
+        with phase("enrich"):
+            time.sleep(0.05)
+
+    with record_timings() as timings, phase("render"):
+        run_parallel(enrich, 4)
+
+    assert timings.counts == {"enrich": 4, "render": 1}
+    assert timings.durations["enrich"] >= 0.2
+    assert timings.durations["render"] == 0.0
+
+
+@pytest.fixture
+def fast_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_parent_gets_every_child_update(fast_switching):
+    def filter_many():
+        for _ in range(500):
+            with phase("filter"):
+                pass
+
+    with record_timings() as timings, phase("render"):
+        parent = timing._frame.get()
+        run_parallel(filter_many, 8, workers=8)
+
+    assert timings.counts["filter"] == 4000
+    # Children have no phases of their own, so their exclusive time is all of it
+    assert parent.nested == pytest.approx(timings.durations["filter"], rel=1e-9, abs=1e-12)
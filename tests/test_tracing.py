@@ -0,0 +1,50 @@
+import pytest
+
+from reclaim_sdk.exceptions import ReclaimAPIError
+from reclaim_sdk.resources.task import Task
+from reclaim_sdk.tracing import InMemoryTracer, span, tracing
+
+
+def test_request_spans(fake, client):
+    tracer = InMemoryTracer()
+    with tracing(tracer):
+        tasks = Task.list()
+
+    (listed,) = tracer.find("Task.list")
+    (request,) = tracer.find("reclaim.request")
+    assert request.parent_id == listed.span_id
+    assert listed.attributes == {"endpoint": "/api/tasks", "params": 0, "items": len(tasks)}
+    # The body is validated by the caller, which counts the items
+    assert request.attributes == {"method": "GET", "endpoint": "/api/tasks", "params": 0}
+    assert request.error is None
+
+    tracer.clear()
+    with tracing(tracer):
+        data = client.get("/api/tasks", params={"status": "NEW"})
+    (request,) = tracer.find("reclaim.request")
+    assert request.attributes == {"method": "GET", "endpoint": "/api/tasks", "params": 1, "items": len(data)}
+
+
+def test_planner_action_spans(fake, client):
+    task = Task.get(1)
+    tracer = InMemoryTracer()
+    with tracing(tracer), span("work"):
+        task.log_work(30)
+
+    (action,) = tracer.find("planner.log-work")
+    assert action.attributes == {"endpoint": "/api/planner", "task_id": 1}
+    (request,) = tracer.children(action)
+    assert request.name == "reclaim.request"
+    assert request.attributes == {"method": "POST", "endpoint": "/api/planner/log-work/task/1", "params": 1}
+    assert tracer.fan_out("work") == {"planner.log-work": 1, "reclaim.request": 1}
+
+
+def test_failed_request_span(fake, client):
+    fake.error_rate = 1.0
+    tracer = InMemoryTracer()
+    with tracing(tracer), pytest.raises(ReclaimAPIError):
+        client.get("/api/tasks")
+
+    (request,) = tracer.find("reclaim.request")
+    assert request.error == "ReclaimAPIError"
+    assert "items" not in request.attributes